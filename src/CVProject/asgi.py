@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CVProject.settings')
+# The server's event loop lives as long as the worker, so DeepL calls can keep an async client on it.
+os.environ.setdefault('DEEPL_ASYNC_HTTP', '1')
 
 application = get_asgi_application()
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # internal apps
     'base',
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'base.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,6 +77,15 @@ WSGI_APPLICATION = 'CVProject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections are kept for DB_CONN_MAX_AGE seconds (0 closes them after every request) and
+# checked before reuse. Under ASGI the entrypoint defaults DB_CONN_MAX_AGE to 0, as Django's
+# persistent connections are per thread; use pgbouncer there instead.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+# Set when POSTGRES_HOST is a pgbouncer in transaction pooling mode: a server-side cursor
+# cannot outlive its transaction there, so QuerySet.iterator() reads client-side.
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -83,9 +94,37 @@ DATABASES = {
         'NAME': config('POSTGRES_DB'),
         'USER': config('POSTGRES_USER', default='postgres'),
         'PASSWORD': config('POSTGRES_PASSWORD'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
     },
 }
 
+# Hot standbys of the primary, by host. Safe requests read CV data from one of them, except for
+# clients that wrote in the last DB_REPLICA_PIN_SECONDS (base.middleware.ReplicaRoutingMiddleware).
+# Tests always run against the primary alone.
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv()) if CONFIGURATION != 'testing' else []
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+DB_REPLICAS = [f'replica_{index}' for index in range(len(DB_REPLICA_HOSTS))]
+DATABASES.update({
+    alias: {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    for alias, host in zip(DB_REPLICAS, DB_REPLICA_HOSTS)
+})
+
+# Request logs go to their own database when AUDIT_DB_NAME is set, migrated with
+# "manage.py migrate --database audit"; otherwise they share the primary.
+AUDIT_DB_NAME = config('AUDIT_DB_NAME', default='') if CONFIGURATION != 'testing' else ''
+AUDIT_DATABASE = 'audit' if AUDIT_DB_NAME else 'default'
+if AUDIT_DB_NAME:
+    DATABASES['audit'] = {
+        **DATABASES['default'],
+        'HOST': config('AUDIT_DB_HOST', default=DATABASES['default']['HOST']),
+        'PORT': config('AUDIT_DB_PORT', default=DATABASES['default']['PORT']),
+        'NAME': AUDIT_DB_NAME,
+    }
+
+DATABASE_ROUTERS = ['base.db_router.PrimaryReplicaRouter']
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -133,9 +172,191 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default="")
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default="")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Messages per second sent by bulk CV email batches; 0 disables the limit.
+PDF_EMAIL_RATE_LIMIT = config('PDF_EMAIL_RATE_LIMIT', default=5.0, cast=float)
+# Batches are retried PDF_EMAIL_MAX_RETRIES times while the SMTP server cannot be reached, first after
+# PDF_EMAIL_RETRY_DELAY seconds and then twice as long each time; the last attempt marks the rest failed.
+PDF_EMAIL_MAX_RETRIES = config('PDF_EMAIL_MAX_RETRIES', default=3, cast=int)
+PDF_EMAIL_RETRY_DELAY = config('PDF_EMAIL_RETRY_DELAY', default=60, cast=int)
+
 REDIS_URL = config('REDIS_URL')
+# One bounded redis-py pool per process (base.redis_pool.SharedConnectionPool) serves every
+# Redis cache alias, the Redis PDF cache and the request log queue. Callers wait up to
+# REDIS_POOL_TIMEOUT seconds for a free connection.
+REDIS_MAX_CONNECTIONS = config('REDIS_MAX_CONNECTIONS', default=50, cast=int)
+REDIS_POOL_TIMEOUT = config('REDIS_POOL_TIMEOUT', default=5.0, cast=float)
+REDIS_SOCKET_TIMEOUT = config('REDIS_SOCKET_TIMEOUT', default=2.0, cast=float)
+REDIS_HEALTH_CHECK_INTERVAL = config('REDIS_HEALTH_CHECK_INTERVAL', default=30, cast=int)
+REDIS_POOL_OPTIONS = {
+    'max_connections': REDIS_MAX_CONNECTIONS,
+    'timeout': REDIS_POOL_TIMEOUT,
+    'socket_timeout': REDIS_SOCKET_TIMEOUT,
+    'socket_connect_timeout': REDIS_SOCKET_TIMEOUT,
+    'health_check_interval': REDIS_HEALTH_CHECK_INTERVAL,
+}
+
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
+# Kombu and the result backend manage their own connections; they get the same limits and timeouts.
+CELERY_BROKER_POOL_LIMIT = config('CELERY_BROKER_POOL_LIMIT', default=10, cast=int)
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'max_connections': REDIS_MAX_CONNECTIONS,
+    'socket_timeout': REDIS_SOCKET_TIMEOUT,
+    'socket_connect_timeout': REDIS_SOCKET_TIMEOUT,
+    'health_check_interval': REDIS_HEALTH_CHECK_INTERVAL,
+}
+CELERY_REDIS_MAX_CONNECTIONS = REDIS_MAX_CONNECTIONS
+CELERY_REDIS_SOCKET_TIMEOUT = REDIS_SOCKET_TIMEOUT
+CELERY_REDIS_SOCKET_CONNECT_TIMEOUT = REDIS_SOCKET_TIMEOUT
 CELERY_BEAT_SCHEDULE = {}
 
+# Rendered CV PDFs, keyed by a fingerprint of the CV content and template.
+# PDF_CACHE_BACKEND is one of "filesystem", "redis", "dummy" or a dotted path to a backend class.
+PDF_CACHE_BACKEND = config('PDF_CACHE_BACKEND', default='dummy' if CONFIGURATION == 'testing' else 'filesystem')
+PDF_CACHE_LOCATION = config(
+    'PDF_CACHE_LOCATION',
+    default=REDIS_URL if PDF_CACHE_BACKEND == 'redis' else '/data/pdf_cache'
+)
+PDF_CACHE_MAX_SIZE = config('PDF_CACHE_MAX_SIZE', default=256 * 1024 * 1024, cast=int)
+# "sync" renders PDFs in the request, "async" answers 202 and renders them in a Celery worker.
+# The async mode needs a PDF cache backend shared by the web and worker containers.
+PDF_RENDER_MODE = config('PDF_RENDER_MODE', default='sync')
+# Seconds before a failed async render job is retried; until then requests for that CV version get the error.
+PDF_RENDER_RETRY_AFTER = config('PDF_RENDER_RETRY_AFTER', default=300, cast=int)
+
+# PDF engine: PDF_ENGINE_WORKERS warm processes render PDFs off the web/Celery process; 0 renders inline.
+# Jobs running longer than PDF_ENGINE_TIMEOUT seconds are aborted, workers restart after MAX_TASKS_PER_CHILD jobs.
+PDF_ENGINE_WORKERS = config('PDF_ENGINE_WORKERS', default=0 if CONFIGURATION == 'testing' else 2, cast=int)
+PDF_ENGINE_TIMEOUT = config('PDF_ENGINE_TIMEOUT', default=30.0, cast=float)
+PDF_ENGINE_MAX_TASKS_PER_CHILD = config('PDF_ENGINE_MAX_TASKS_PER_CHILD', default=100, cast=int)
+
+# Threads rendering PDFs for the async PDF view, bounding concurrent renders per worker process.
+PDF_RENDER_THREADS = config('PDF_RENDER_THREADS', default=4, cast=int)
+
+# Seconds anonymous CV pages and PDFs may be served by browsers and shared caches without
+# revalidating; 0 makes them revalidate every time, answered by a 304 while unchanged.
+HTTP_CACHE_MAX_AGE = config('HTTP_CACHE_MAX_AGE', default=0, cast=int)
+
 DEEPL_API_KEY = config('DEEPL_API_KEY', default='')
+
+# DeepL HTTP client. An empty DEEPL_API_URL picks the free or pro endpoint from the key suffix.
+DEEPL_API_URL = config('DEEPL_API_URL', default='')
+DEEPL_CONNECT_TIMEOUT = config('DEEPL_CONNECT_TIMEOUT', default=3.05, cast=float)
+DEEPL_READ_TIMEOUT = config('DEEPL_READ_TIMEOUT', default=10.0, cast=float)
+DEEPL_MAX_RETRIES = config('DEEPL_MAX_RETRIES', default=2, cast=int)
+DEEPL_BACKOFF_BASE = config('DEEPL_BACKOFF_BASE', default=0.5, cast=float)
+DEEPL_BACKOFF_MAX = config('DEEPL_BACKOFF_MAX', default=8.0, cast=float)
+DEEPL_POOL_MAXSIZE = config('DEEPL_POOL_MAXSIZE', default=10, cast=int)
+# Async views call DeepL through an httpx client per event loop. That only pays off under ASGI, where
+# CVProject.asgi turns it on: under WSGI every async view gets a new loop, so they run the pooled
+# sync client in a thread instead.
+DEEPL_ASYNC_HTTP = config('DEEPL_ASYNC_HTTP', default=False, cast=bool)
+DEEPL_CIRCUIT_FAILURE_THRESHOLD = config('DEEPL_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+DEEPL_CIRCUIT_RESET_TIMEOUT = config('DEEPL_CIRCUIT_RESET_TIMEOUT', default=30.0, cast=float)
+
+# Stored CV translations served by ?lang=xx. CV_TRANSLATION_LANGUAGES lists DeepL target
+# codes to pre-translate into; empty means every target of core.constants.LANG_CODES.
+CV_TRANSLATION_LANGUAGES = config('CV_TRANSLATION_LANGUAGES', default='', cast=Csv())
+CV_PRETRANSLATE = config('CV_PRETRANSLATE', default=bool(DEEPL_API_KEY) and CONFIGURATION != 'testing', cast=bool)
+
+# DeepL results keyed by target language and a hash of the normalized source text.
+TRANSLATION_CACHE_ALIAS = 'translations'
+TRANSLATION_CACHE_TIMEOUT = config('TRANSLATION_CACHE_TIMEOUT', default=30 * 24 * 60 * 60, cast=int)
+TRANSLATION_CACHE_MAX_ENTRIES = config('TRANSLATION_CACHE_MAX_ENTRIES', default=10000, cast=int)
+
+# Rendered HTML of CV list cards and detail page sections, keyed by CV version and language.
+FRAGMENT_CACHE_ALIAS = 'fragments'
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=24 * 60 * 60, cast=int)
+
+# "redis" shares every cache alias across gunicorn workers and nodes, "locmem" keeps one per process.
+# CACHE_KEY_PREFIX keeps environments sharing a Redis server apart.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem' if CONFIGURATION == 'testing' else 'redis')
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default=CONFIGURATION)
+
+if CACHE_BACKEND == 'redis':
+    REDIS_CACHE_OPTIONS = {'pool_class': 'base.redis_pool.SharedConnectionPool', **REDIS_POOL_OPTIONS}
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'OPTIONS': REDIS_CACHE_OPTIONS,
+        },
+        TRANSLATION_CACHE_ALIAS: {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'TIMEOUT': TRANSLATION_CACHE_TIMEOUT,
+            'OPTIONS': REDIS_CACHE_OPTIONS,
+        },
+        FRAGMENT_CACHE_ALIAS: {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'TIMEOUT': FRAGMENT_CACHE_TIMEOUT,
+            'OPTIONS': REDIS_CACHE_OPTIONS,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        TRANSLATION_CACHE_ALIAS: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'translations',
+            'TIMEOUT': TRANSLATION_CACHE_TIMEOUT,
+            'OPTIONS': {
+                'MAX_ENTRIES': TRANSLATION_CACHE_MAX_ENTRIES,
+            },
+        },
+        FRAGMENT_CACHE_ALIAS: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'fragments',
+            'TIMEOUT': FRAGMENT_CACHE_TIMEOUT,
+        },
+    }
+
+# Sessions are read from the default cache and written through to the database.
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+SESSION_CACHE_ALIAS = 'default'
+
+# Request logging: "sync" inserts each row in the request, "buffered" batches rows in
+# worker memory, "queued" pushes them to a Redis list drained by a Celery beat task.
+AUDIT_LOG_MODE = config('AUDIT_LOG_MODE', default='sync')
+AUDIT_LOG_BATCH_SIZE = config('AUDIT_LOG_BATCH_SIZE', default=100, cast=int)
+AUDIT_LOG_FLUSH_INTERVAL = config('AUDIT_LOG_FLUSH_INTERVAL', default=5.0, cast=float)
+AUDIT_LOG_MAX_BUFFER = config('AUDIT_LOG_MAX_BUFFER', default=10000, cast=int)
+AUDIT_LOG_QUEUE_KEY = config('AUDIT_LOG_QUEUE_KEY', default='audit:request_logs')
+# Which requests get logged. Paths are regular expressions matched from the start of the path,
+# sample rates are "pattern:rate" items (first match wins), an empty method list logs all methods.
+# Both regex lists are separated by ";" since patterns may contain commas, e.g. "^/api/v{1,2}/:0.1;^/static/:0".
+AUDIT_LOG_EXCLUDE_PATHS = config('AUDIT_LOG_EXCLUDE_PATHS', default='^/admin/;^/logs/', cast=Csv(delimiter=';'))
+AUDIT_LOG_METHODS = config('AUDIT_LOG_METHODS', default='', cast=Csv())
+AUDIT_LOG_SAMPLE_RATES = config('AUDIT_LOG_SAMPLE_RATES', default='', cast=Csv(delimiter=';'))
+AUDIT_LOG_DEFAULT_SAMPLE_RATE = config('AUDIT_LOG_DEFAULT_SAMPLE_RATE', default=1.0, cast=float)
+# Responses with at least this status code are always logged, 0 disables the rule.
+AUDIT_LOG_ALWAYS_LOG_STATUS = config('AUDIT_LOG_ALWAYS_LOG_STATUS', default=500, cast=int)
+AUDIT_LOG_ALWAYS_LOG_AUTHENTICATED = config('AUDIT_LOG_ALWAYS_LOG_AUTHENTICATED', default=True, cast=bool)
+# RequestLog is range-partitioned on timestamp by "day" or "month"; whole partitions past the
+# retention period are dropped. Per-path/per-minute rollups are kept for longer.
+AUDIT_LOG_PARTITION_INTERVAL = config('AUDIT_LOG_PARTITION_INTERVAL', default='month')
+AUDIT_LOG_PARTITIONS_AHEAD = config('AUDIT_LOG_PARTITIONS_AHEAD', default=2, cast=int)
+AUDIT_LOG_RETENTION_DAYS = config('AUDIT_LOG_RETENTION_DAYS', default=90, cast=int)
+AUDIT_LOG_ROLLUP_RETENTION_DAYS = config('AUDIT_LOG_ROLLUP_RETENTION_DAYS', default=730, cast=int)
+AUDIT_LOG_ROLLUP_WINDOW = config('AUDIT_LOG_ROLLUP_WINDOW', default=10, cast=int)
+# Time window of the per-route latency table on /logs/.
+AUDIT_DASHBOARD_WINDOW_HOURS = config('AUDIT_DASHBOARD_WINDOW_HOURS', default=24, cast=int)
+CELERY_BEAT_SCHEDULE['maintain-request-log-partitions'] = {
+    'task': 'audit.tasks.maintain_request_log_partitions',
+    'schedule': 60 * 60,
+}
+CELERY_BEAT_SCHEDULE['rollup-request-logs'] = {
+    'task': 'audit.tasks.rollup_request_logs',
+    'schedule': 60,
+}
+if AUDIT_LOG_MODE == 'queued':
+    CELERY_BEAT_SCHEDULE['drain-request-log-queue'] = {
+        'task': 'audit.tasks.drain_request_log_queue',
+        'schedule': AUDIT_LOG_FLUSH_INTERVAL,
+    }
@@ -1,8 +1,13 @@
 from django.contrib import admin
 
-from audit.models import RequestLog
+from audit.models import RequestLog, RequestLogRollup
 
 
 @admin.register(RequestLog)
 class RequestLogAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(RequestLogRollup)
+class RequestLogRollupAdmin(admin.ModelAdmin):
+    pass
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from audit import partitions
+
+
+class Command(BaseCommand):
+    help = "Creates upcoming RequestLog partitions and removes logs past the retention period."
+
+    def handle(self, *args, **options):
+        for name in partitions.ensure_partitions():
+            self.stdout.write(f"Created partition {name}")
+        removed = partitions.apply_retention()
+        self.stdout.write(self.style.SUCCESS(f"Retention removed {removed} partitions/rows"))
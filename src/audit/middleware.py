@@ -1,17 +1,97 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
 from audit.models import RequestLog
-from django.utils.deprecation import MiddlewareMixin
+from audit.sampling import get_request_log_sampler
+from audit.writers import get_request_log_writer
+from django.db import connections
+from django.utils import timezone
+
+
+class QueryMetrics:
+    """
+    Database execute wrapper counting the queries of a request and their total time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class RequestLoggingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timestamp = timezone.now()
+        started = time.perf_counter()
+        queries = QueryMetrics()
+
+        with ExitStack() as stack:
+            self.wrap_connections(stack, queries)
+            response = self.get_response(request)
+
+        self.log(request, response, timestamp, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        timestamp = timezone.now()
+        started = time.perf_counter()
+        queries = QueryMetrics()
+
+        # Under ASGI the ORM runs on the request's thread-sensitive sync thread,
+        # so the wrappers are installed on that thread's connections.
+        stack = ExitStack()
+        await sync_to_async(self.wrap_connections)(stack, queries)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        await sync_to_async(self.log)(request, response, timestamp, time.perf_counter() - started, queries)
+        return response
+
+    @staticmethod
+    def wrap_connections(stack: ExitStack, queries: QueryMetrics) -> None:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(queries))
 
-class RequestLoggingMiddleware(MiddlewareMixin):
-    def process_request(self, request):
-        if request.path.startswith('/admin/') or request.path.startswith('/logs/'):
+    def log(self, request, response, timestamp, duration: float, queries: QueryMetrics) -> None:
+        if not get_request_log_sampler().should_log(request, response):
             return
 
         ip = request.META.get('REMOTE_ADDR')
+        resolver_match = getattr(request, 'resolver_match', None)
 
-        RequestLog.objects.create(
+        get_request_log_writer().write(RequestLog(
+            timestamp=timestamp,
             method=request.method,
             path=request.path,
             query_string=request.META.get('QUERY_STRING', ''),
             remote_ip=ip,
-            user=request.user if request.user.is_authenticated else None
-        )
+            user=request.user if request.user.is_authenticated else None,
+            route=f'/{resolver_match.route}' if resolver_match else '',
+            status_code=response.status_code,
+            duration_ms=duration * 1000,
+            db_query_count=queries.count,
+            db_time_ms=queries.duration * 1000,
+            response_size=None if response.streaming else len(response.content),
+        ))
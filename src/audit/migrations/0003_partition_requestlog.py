@@ -0,0 +1,75 @@
+# Hand-written: rebuilds audit_requestlog as a partitioned table with raw SQL, on PostgreSQL only.
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def partition_request_log(apps, schema_editor):
+    """
+    Rebuilds audit_requestlog as a table range-partitioned on timestamp.
+
+    Existing rows go to a DEFAULT partition; audit.partitions.ensure_partitions
+    later moves them into their time-range partitions.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    user_table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    schema_editor.execute('ALTER TABLE audit_requestlog RENAME TO audit_requestlog_old')
+    schema_editor.execute(
+        'CREATE TABLE audit_requestlog (LIKE audit_requestlog_old INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    schema_editor.execute('CREATE TABLE audit_requestlog_default PARTITION OF audit_requestlog DEFAULT')
+    schema_editor.execute('INSERT INTO audit_requestlog SELECT * FROM audit_requestlog_old')
+    schema_editor.execute('DROP TABLE audit_requestlog_old')
+
+    # The partition key has to be part of the primary key.
+    schema_editor.execute('ALTER TABLE audit_requestlog ADD PRIMARY KEY (id, "timestamp")')
+    schema_editor.execute('CREATE SEQUENCE audit_requestlog_id_seq OWNED BY audit_requestlog.id')
+    schema_editor.execute(
+        "SELECT setval('audit_requestlog_id_seq', COALESCE((SELECT MAX(id) FROM audit_requestlog), 0) + 1, false)"
+    )
+    schema_editor.execute(
+        "ALTER TABLE audit_requestlog ALTER COLUMN id SET DEFAULT nextval('audit_requestlog_id_seq')"
+    )
+    schema_editor.execute(
+        f'ALTER TABLE audit_requestlog ADD CONSTRAINT audit_requestlog_user_id_fk '
+        f'FOREIGN KEY (user_id) REFERENCES "{user_table}" (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    schema_editor.execute('CREATE INDEX audit_requestlog_user_id_idx ON audit_requestlog (user_id)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_alter_requestlog_timestamp'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_request_log, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='RequestLogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('minute', models.DateTimeField()),
+                ('path', models.CharField(max_length=2048)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-minute'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['-timestamp'], name='audit_requestlog_ts_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='requestlogrollup',
+            constraint=models.UniqueConstraint(fields=('minute', 'path'), name='audit_requestlog_rollup_unique'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 from base.models import BaseModel
 
@@ -7,12 +8,43 @@ User = settings.AUTH_USER_MODEL
 
 
 class RequestLog(BaseModel):
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
     method = models.CharField(max_length=10)
     path = models.CharField(max_length=2048)
     query_string = models.TextField(blank=True, null=True)
     remote_ip = models.GenericIPAddressField(blank=True, null=True)
-    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    # No database constraint: with AUDIT_DB_NAME set the users live in another database.
+    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, db_constraint=False)
+    route = models.CharField(max_length=255, blank=True, default='')
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    duration_ms = models.FloatField(blank=True, null=True)
+    db_query_count = models.PositiveIntegerField(blank=True, null=True)
+    db_time_ms = models.FloatField(blank=True, null=True)
+    response_size = models.PositiveBigIntegerField(blank=True, null=True)
+
+    class Meta(BaseModel.Meta):
+        # The table is range-partitioned on timestamp in PostgreSQL, see audit.partitions.
+        indexes = [
+            models.Index(fields=['-timestamp'], name='audit_requestlog_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.timestamp} {self.method} {self.path}"
+
+
+class RequestLogRollup(BaseModel):
+    """
+    Number of logged requests per path and minute, kept after raw logs expire.
+    """
+    minute = models.DateTimeField()
+    path = models.CharField(max_length=2048)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta(BaseModel.Meta):
+        ordering = ['-minute']
+        constraints = [
+            models.UniqueConstraint(fields=['minute', 'path'], name='audit_requestlog_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.minute} {self.path} {self.count}"
@@ -0,0 +1,168 @@
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMinute
+from django.utils import timezone
+
+from audit.models import RequestLog, RequestLogRollup
+
+PARENT_TABLE = RequestLog._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def get_connection():
+    """
+    Returns the connection to the database holding RequestLog, see AUDIT_DATABASE.
+    """
+    return connections[router.db_for_write(RequestLog)]
+
+
+def is_partitioned() -> bool:
+    connection = get_connection()
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_range(moment: datetime, interval: str) -> tuple[datetime, datetime]:
+    """
+    Returns the [start, end) range of the "day" or "month" partition holding moment.
+    """
+    moment = moment.astimezone(dt_timezone.utc)
+    if interval == "day":
+        start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start, start + timedelta(days=1)
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def list_partitions() -> list[tuple[str, datetime, datetime]]:
+    """
+    Returns (name, start, end) of every range partition, oldest first.
+    """
+    with get_connection().cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound)
+        if match:
+            start, end = (datetime.fromisoformat(value) for value in match.groups())
+            partitions.append((name, start, end))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(start: datetime, end: datetime) -> str:
+    """
+    Creates the partition for [start, end), moving matching rows out of the default partition.
+    """
+    name = f"{PARENT_TABLE}_p{start:%Y%m%d}"
+    connection = get_connection()
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{PARENT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE "timestamp" >= %s AND "timestamp" < %s '
+            f'RETURNING *) INSERT INTO "{name}" SELECT * FROM moved',
+            [start, end],
+        )
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', [start, end])
+    return name
+
+
+def ensure_partitions(now: datetime = None) -> list[str]:
+    """
+    Creates the partition for the current interval and AUDIT_LOG_PARTITIONS_AHEAD following ones.
+    """
+    if not is_partitioned():
+        return []
+
+    now = now or timezone.now()
+    interval = settings.AUDIT_LOG_PARTITION_INTERVAL
+    existing = [(start, end) for _, start, end in list_partitions()]
+    created = []
+    moment = now
+    for _ in range(settings.AUDIT_LOG_PARTITIONS_AHEAD + 1):
+        start, end = partition_range(moment, interval)
+        # Ranges left over from a different interval setting are kept as they are.
+        if not any(start < existing_end and existing_start < end for existing_start, existing_end in existing):
+            created.append(create_partition(start, end))
+            existing.append((start, end))
+        moment = end
+    return created
+
+
+def apply_retention(now: datetime = None) -> int:
+    """
+    Removes request logs older than AUDIT_LOG_RETENTION_DAYS.
+
+    Partitions that lie entirely before the cutoff are dropped, which costs the
+    same regardless of how many rows they hold. Returns the number of dropped
+    partitions, or of deleted rows on unpartitioned tables.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.AUDIT_LOG_RETENTION_DAYS)
+    RequestLogRollup.objects.filter(
+        minute__lt=now - timedelta(days=settings.AUDIT_LOG_ROLLUP_RETENTION_DAYS)
+    ).delete()
+
+    if not is_partitioned():
+        deleted, _ = RequestLog.objects.filter(timestamp__lt=cutoff).delete()
+        return deleted
+
+    dropped = 0
+    with get_connection().cursor() as cursor:
+        for name, _, end in list_partitions():
+            if end <= cutoff:
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped += 1
+        cursor.execute(f'DELETE FROM "{DEFAULT_PARTITION}" WHERE "timestamp" < %s', [cutoff])
+    return dropped
+
+
+def rollup_request_logs(now: datetime = None) -> int:
+    """
+    Recomputes per-path counts for the complete minutes of the last AUDIT_LOG_ROLLUP_WINDOW minutes.
+
+    Each run overwrites the counts of its window, so late-arriving buffered
+    rows are picked up by the following runs.
+    """
+    now = now or timezone.now()
+    until = now.replace(second=0, microsecond=0)
+    since = until - timedelta(minutes=settings.AUDIT_LOG_ROLLUP_WINDOW)
+
+    counts = RequestLog.objects.filter(
+        timestamp__gte=since,
+        timestamp__lt=until
+    ).annotate(
+        minute=TruncMinute("timestamp")
+    ).order_by().values("minute", "path").annotate(count=Count("id"))
+
+    rollups = [RequestLogRollup(minute=row["minute"], path=row["path"], count=row["count"]) for row in counts]
+    RequestLogRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=["minute", "path"],
+        update_fields=["count", "updated_at"],
+    )
+    return len(rollups)
@@ -0,0 +1,82 @@
+import random
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class RequestLogSampler:
+    """
+    Decides which requests get a RequestLog row.
+
+    Rules are evaluated in order: excluded paths and methods are never logged,
+    error responses and authenticated users are always logged (when enabled),
+    everything else is logged with the rate of the first matching path pattern.
+    """
+
+    def __init__(
+        self,
+        exclude_paths=(),
+        methods=(),
+        sample_rates=(),
+        default_rate: float = 1.0,
+        always_log_status: int = 0,
+        always_log_authenticated: bool = False,
+    ):
+        self.exclude = re.compile("|".join(f"(?:{pattern})" for pattern in exclude_paths)) if exclude_paths else None
+        self.methods = frozenset(method.upper() for method in methods)
+        self.sample_rates = [(re.compile(pattern), rate) for pattern, rate in sample_rates]
+        self.default_rate = default_rate
+        self.always_log_status = always_log_status
+        self.always_log_authenticated = always_log_authenticated
+
+    def should_log(self, request, response) -> bool:
+        path = request.path
+        if self.exclude is not None and self.exclude.match(path):
+            return False
+        if self.methods and request.method not in self.methods:
+            return False
+        if self.always_log_status and response.status_code >= self.always_log_status:
+            return True
+        if self.always_log_authenticated and request.user.is_authenticated:
+            return True
+
+        rate = self.rate_for(path)
+        return rate >= 1 or random.random() < rate
+
+    def rate_for(self, path: str) -> float:
+        for pattern, rate in self.sample_rates:
+            if pattern.match(path):
+                return rate
+        return self.default_rate
+
+
+def parse_sample_rates(values) -> list[tuple[str, float]]:
+    """
+    Parses "pattern:rate" items, e.g. "^/api/:0.1".
+    """
+    rates = []
+    for value in values:
+        pattern, rate = value.rsplit(":", 1)
+        rates.append((pattern, float(rate)))
+    return rates
+
+
+@lru_cache(maxsize=None)
+def get_request_log_sampler() -> RequestLogSampler:
+    return RequestLogSampler(
+        exclude_paths=settings.AUDIT_LOG_EXCLUDE_PATHS,
+        methods=settings.AUDIT_LOG_METHODS,
+        sample_rates=parse_sample_rates(settings.AUDIT_LOG_SAMPLE_RATES),
+        default_rate=settings.AUDIT_LOG_DEFAULT_SAMPLE_RATE,
+        always_log_status=settings.AUDIT_LOG_ALWAYS_LOG_STATUS,
+        always_log_authenticated=settings.AUDIT_LOG_ALWAYS_LOG_AUTHENTICATED,
+    )
+
+
+@receiver(setting_changed)
+def _reset_request_log_sampler(setting, **kwargs):
+    if setting.startswith("AUDIT_LOG_"):
+        get_request_log_sampler.cache_clear()
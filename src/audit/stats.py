@@ -0,0 +1,33 @@
+from django.db.models import Aggregate, Avg, Count, FloatField
+
+from audit.models import RequestLog
+
+
+class Percentile(Aggregate):
+    """
+    PostgreSQL continuous percentile, e.g. Percentile('duration_ms', 0.95).
+    """
+    function = 'PERCENTILE_CONT'
+    name = 'Percentile'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def route_latency_stats(since, limit=50):
+    """
+    Returns request count, p50/p95/p99 latency and average DB usage per route, slowest p95 first.
+    """
+    return RequestLog.objects.filter(
+        timestamp__gte=since,
+        duration_ms__isnull=False
+    ).order_by().values('route').annotate(
+        requests=Count('id'),
+        p50=Percentile('duration_ms', 0.5),
+        p95=Percentile('duration_ms', 0.95),
+        p99=Percentile('duration_ms', 0.99),
+        avg_db_queries=Avg('db_query_count'),
+        avg_db_time_ms=Avg('db_time_ms'),
+    ).order_by('-p95')[:limit]
@@ -0,0 +1,23 @@
+from celery import shared_task
+
+from audit import partitions
+from audit.writers import QueuedRequestLogWriter, get_request_log_writer
+
+
+@shared_task
+def drain_request_log_queue():
+    writer = get_request_log_writer()
+    if isinstance(writer, QueuedRequestLogWriter):
+        return writer.drain()
+    return 0
+
+
+@shared_task
+def maintain_request_log_partitions():
+    partitions.ensure_partitions()
+    return partitions.apply_retention()
+
+
+@shared_task
+def rollup_request_logs():
+    return partitions.rollup_request_logs()
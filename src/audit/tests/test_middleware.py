@@ -1,5 +1,14 @@
-from django.test import TestCase, Client
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
 from audit.models import RequestLog
+from audit.writers import BufferedRequestLogWriter, QueuedRequestLogWriter, get_request_log_writer
 from django.contrib.auth.models import User
 
 
@@ -70,3 +79,148 @@ class RequestLoggingTests(TestCase):
         log = RequestLog.objects.last()
         self.assertEqual(log.path, '/non-existent-url/')
         self.assertEqual(log.method, 'GET')
+
+
+@override_settings(AUDIT_LOG_MODE='buffered', AUDIT_LOG_BATCH_SIZE=5, AUDIT_LOG_FLUSH_INTERVAL=60)
+class BufferedRequestLoggingTests(TestCase):
+    def test_logs_written_in_batches(self):
+        for i in range(4):
+            self.client.get(f'/buffered-{i}/')
+        self.assertEqual(RequestLog.objects.count(), 0)
+
+        self.client.get('/buffered-4/')
+        self.assertEqual(RequestLog.objects.count(), 5)
+
+    def test_flush_writes_pending_logs(self):
+        self.client.get('/pending/', REMOTE_ADDR='10.0.0.1')
+        get_request_log_writer().flush()
+
+        log = RequestLog.objects.get()
+        self.assertEqual(log.path, '/pending/')
+        self.assertEqual(log.remote_ip, '10.0.0.1')
+
+    @override_settings(AUDIT_LOG_MAX_BUFFER=3)
+    def test_buffer_is_bounded(self):
+        writer = get_request_log_writer()
+        for i in range(4):
+            self.client.get(f'/bounded-{i}/')
+        self.assertEqual(len(writer.buffer), 3)
+
+        writer.flush()
+        paths = set(RequestLog.objects.values_list('path', flat=True))
+        self.assertEqual(paths, {'/bounded-1/', '/bounded-2/', '/bounded-3/'})
+
+    def test_settings_change_flushes_replaced_writer(self):
+        self.client.get('/replaced/')
+        with override_settings(AUDIT_LOG_BATCH_SIZE=10):
+            self.assertEqual(list(RequestLog.objects.values_list('path', flat=True)), ['/replaced/'])
+
+    def test_idle_writer_flushed_on_interval(self):
+        writer = BufferedRequestLogWriter(batch_size=5, flush_interval=0.01, max_size=10)
+        self.addCleanup(writer.closed.set)
+        flushed = threading.Event()
+        writer.flush = mock.Mock(side_effect=flushed.set)
+
+        writer.buffer.append(RequestLog(method='GET', path='/idle/'))
+
+        self.assertTrue(flushed.wait(5))
+        writer.close()
+        writer.timer.join(1)
+        self.assertFalse(writer.timer.is_alive())
+
+
+class QueuedRequestLogWriterTests(TestCase):
+    def setUp(self):
+        self.writer = QueuedRequestLogWriter(url='redis://localhost:6379/0', key='logs', batch_size=2, max_size=10)
+        self.writer.client = mock.Mock()
+        self.items = [
+            json.dumps({'timestamp': '2026-05-17T12:00:00+00:00', 'method': 'GET', 'path': f'/queued-{i}/'})
+            for i in range(2)
+        ]
+        self.writer.client.pipeline.return_value.execute.side_effect = [(self.items, True), ([], True)]
+
+    def test_drain_inserts_batches(self):
+        self.assertEqual(self.writer.drain(), 2)
+        self.assertEqual(RequestLog.objects.count(), 2)
+
+    def test_failed_insert_requeues_batch(self):
+        with mock.patch.object(RequestLog.objects, 'bulk_create', side_effect=DatabaseError('down')):
+            with self.assertRaises(DatabaseError):
+                self.writer.drain()
+
+        self.writer.client.lpush.assert_called_once_with('logs', *reversed(self.items))
+
+
+@override_settings(AUDIT_LOG_SAMPLE_RATES=['^/api/:0'])
+class SampledRequestLoggingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='sampled', password='testpass')
+
+    def test_sampled_out_path_not_logged(self):
+        self.client.get('/api/unknown/')
+        self.client.get('/other/')
+        self.assertEqual(list(RequestLog.objects.values_list('path', flat=True)), ['/other/'])
+
+    def test_authenticated_requests_always_logged(self):
+        self.client.login(username='sampled', password='testpass')
+        self.client.get('/api/unknown/')
+        self.assertEqual(RequestLog.objects.get().user, self.user)
+
+    @override_settings(AUDIT_LOG_ALWAYS_LOG_STATUS=404)
+    def test_error_responses_always_logged(self):
+        self.client.get('/api/unknown/')
+        self.assertEqual(RequestLog.objects.get().path, '/api/unknown/')
+
+    @override_settings(AUDIT_LOG_METHODS=['POST'])
+    def test_method_filter(self):
+        self.client.get('/get-test/')
+        self.client.post('/post-test/')
+        self.assertEqual(list(RequestLog.objects.values_list('method', flat=True)), ['POST'])
+
+    @override_settings(AUDIT_LOG_EXCLUDE_PATHS=['^/static/'])
+    def test_custom_excluded_paths(self):
+        self.client.get('/static/app.css')
+        self.client.get('/logs/')
+        self.assertEqual(list(RequestLog.objects.values_list('path', flat=True)), ['/logs/'])
+
+
+class RequestTimingTests(TestCase):
+    def test_response_metrics_recorded(self):
+        response = self.client.get(reverse('curriculum_vitae_list'))
+        log = RequestLog.objects.get()
+
+        self.assertEqual(log.route, '/')
+        self.assertEqual(log.status_code, 200)
+        self.assertEqual(log.response_size, len(response.content))
+        self.assertGreater(log.duration_ms, 0)
+        self.assertEqual(log.db_query_count, 2)
+        self.assertGreaterEqual(log.db_time_ms, 0)
+
+    def test_route_pattern_recorded(self):
+        self.client.get(reverse('curriculum_vita_detailed', kwargs={'curriculum_id': 999}))
+        log = RequestLog.objects.get()
+        self.assertEqual(log.route, '/cv/<int:curriculum_id>')
+        self.assertEqual(log.status_code, 404)
+
+    def test_dashboard_shows_latency_percentiles(self):
+        for duration in (10, 20, 30, 40, 1000):
+            RequestLog.objects.create(method='GET', path='/cv/1', route='/cv/<int:curriculum_id>', duration_ms=duration)
+        RequestLog.objects.create(method='GET', path='/old/', route='/old/', duration_ms=5,
+                                  timestamp=timezone.now() - timedelta(days=30))
+
+        response = self.client.get(reverse('logs_view'))
+        route_stats = list(response.context['route_stats'])
+
+        self.assertEqual(len(route_stats), 1)
+        self.assertEqual(route_stats[0]['route'], '/cv/<int:curriculum_id>')
+        self.assertEqual(route_stats[0]['requests'], 5)
+        self.assertEqual(route_stats[0]['p50'], 30)
+        self.assertAlmostEqual(route_stats[0]['p95'], 808)
+
+    async def test_async_request_logged(self):
+        await self.async_client.get(reverse('curriculum_vitae_list'))
+        log = await RequestLog.objects.aget()
+
+        self.assertEqual(log.route, '/')
+        self.assertEqual(log.status_code, 200)
+        self.assertEqual(log.db_query_count, 2)
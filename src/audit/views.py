@@ -1,6 +1,18 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.shortcuts import render
+from django.utils import timezone
+
 from audit.models import RequestLog
+from audit.stats import route_latency_stats
 
 def logs_view(request):
     logs = RequestLog.objects.order_by('-timestamp')[:10]
-    return render(request, 'audit/logs.html', {'logs': logs})
+    window_hours = settings.AUDIT_DASHBOARD_WINDOW_HOURS
+    route_stats = route_latency_stats(timezone.now() - timedelta(hours=window_hours))
+    return render(request, 'audit/logs.html', {
+        'logs': logs,
+        'route_stats': route_stats,
+        'window_hours': window_hours,
+    })
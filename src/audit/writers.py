@@ -0,0 +1,181 @@
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils.dateparse import parse_datetime
+
+from audit.models import RequestLog
+
+logger = logging.getLogger(__name__)
+
+
+class SyncRequestLogWriter:
+    """
+    Inserts every log row as soon as it is recorded.
+    """
+
+    def write(self, log: RequestLog) -> None:
+        log.save()
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class BufferedRequestLogWriter:
+    """
+    Collects log rows in memory and inserts them with bulk_create once the
+    batch is full or the flush interval has passed.
+
+    A daemon thread flushes every flush_interval, so rows of an idle worker
+    still reach the database. The buffer is bounded: when the database cannot
+    keep up, the oldest unflushed rows are dropped instead of growing the
+    worker's memory.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_size: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = deque(maxlen=max_size)
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        # The writer is built on the first logged request, after the server has forked its workers.
+        self.closed = threading.Event()
+        self.timer = threading.Thread(target=self._flush_periodically, name="request-log-flush", daemon=True)
+        self.timer.start()
+
+    def _flush_periodically(self) -> None:
+        while not self.closed.wait(self.flush_interval):
+            if self.buffer:
+                self.flush()
+                close_old_connections()
+
+    def write(self, log: RequestLog) -> None:
+        with self.lock:
+            self.buffer.append(log)
+            due = (
+                len(self.buffer) >= self.batch_size
+                or time.monotonic() - self.last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            batch = list(self.buffer)
+            self.buffer.clear()
+            self.last_flush = time.monotonic()
+        if not batch:
+            return
+        try:
+            RequestLog.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("Could not write %s buffered request logs", len(batch))
+
+    def close(self) -> None:
+        self.closed.set()
+        self.flush()
+
+
+class QueuedRequestLogWriter:
+    """
+    Pushes log rows to a Redis list that a Celery task drains with bulk_create.
+    """
+
+    fields = (
+        "timestamp", "method", "path", "query_string", "remote_ip", "user_id",
+        "route", "status_code", "duration_ms", "db_query_count", "db_time_ms", "response_size",
+    )
+
+    def __init__(self, url: str, key: str, batch_size: int, max_size: int):
+        from base.redis_pool import get_redis
+
+        self.client = get_redis(url)
+        self.key = key
+        self.batch_size = batch_size
+        self.max_size = max_size
+
+    def write(self, log: RequestLog) -> None:
+        payload = {field: getattr(log, field) for field in self.fields}
+        payload["timestamp"] = log.timestamp.isoformat()
+        pipe = self.client.pipeline()
+        pipe.rpush(self.key, json.dumps(payload))
+        # Keep only the newest rows when the drain task falls behind.
+        pipe.ltrim(self.key, -self.max_size, -1)
+        pipe.execute()
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> int:
+        """
+        Moves queued rows into the database, one batch at a time, until the list is empty.
+
+        A batch is taken off the list atomically, so concurrent drains never
+        insert the same rows, and pushed back to its head if the insert fails.
+        """
+        drained = 0
+        while True:
+            pipe = self.client.pipeline()
+            pipe.lrange(self.key, 0, self.batch_size - 1)
+            pipe.ltrim(self.key, self.batch_size, -1)
+            items, _ = pipe.execute()
+            if not items:
+                return drained
+            try:
+                logs = []
+                for item in items:
+                    payload = json.loads(item)
+                    payload["timestamp"] = parse_datetime(payload["timestamp"])
+                    logs.append(RequestLog(**payload))
+                RequestLog.objects.bulk_create(logs)
+            except Exception:
+                self.client.lpush(self.key, *reversed(items))
+                raise
+            drained += len(logs)
+
+
+@lru_cache(maxsize=None)
+def get_request_log_writer():
+    mode = settings.AUDIT_LOG_MODE
+    if mode == "buffered":
+        return BufferedRequestLogWriter(
+            batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+            flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL,
+            max_size=settings.AUDIT_LOG_MAX_BUFFER,
+        )
+    if mode == "queued":
+        return QueuedRequestLogWriter(
+            url=settings.REDIS_URL,
+            key=settings.AUDIT_LOG_QUEUE_KEY,
+            batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+            max_size=settings.AUDIT_LOG_MAX_BUFFER,
+        )
+    return SyncRequestLogWriter()
+
+
+@atexit.register
+def _close_request_log_writer():
+    if get_request_log_writer.cache_info().currsize:
+        get_request_log_writer().close()
+
+
+@receiver(setting_changed)
+def _reset_request_log_writer(setting, **kwargs):
+    if setting.startswith("AUDIT_LOG_"):
+        # Rows buffered by the writer being replaced are written out first.
+        _close_request_log_writer()
+        get_request_log_writer.cache_clear()
@@ -0,0 +1,89 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Apps whose reads may be served by a replica, and apps living in the audit database.
+REPLICATED_APPS = {"core"}
+AUDIT_APPS = {"audit"}
+# The audit migrations depend on these apps; their tables are created, unused, in the audit database.
+AUDIT_MIGRATION_DEPENDENCIES = {"auth", "contenttypes"}
+
+
+class ReadState:
+    """
+    Replica chosen for the reads of one request, dropped once the request writes CV data.
+    """
+
+    def __init__(self, replica: str | None):
+        self.replica = replica
+
+    def pin(self) -> None:
+        self.replica = None
+
+
+_read_state: ContextVar[ReadState | None] = ContextVar("db_read_state", default=None)
+
+
+@contextmanager
+def replica_reads(allowed: bool = True):
+    """
+    Sends reads of replicated apps to one random replica for the duration of the block.
+
+    Outside such a block, in Celery tasks and management commands, every read goes to the primary.
+    """
+    replica = random.choice(settings.DB_REPLICAS) if allowed and settings.DB_REPLICAS else None
+    state = ReadState(replica)
+    token = _read_state.set(state)
+    try:
+        yield state
+    finally:
+        _read_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes CV reads to a replica inside replica_reads(), CV writes to the primary
+    and request logs to AUDIT_DATABASE.
+    """
+
+    def db_for_read(self, model, **hints):
+        app_label = model._meta.app_label
+        if app_label in AUDIT_APPS:
+            return settings.AUDIT_DATABASE
+        state = _read_state.get()
+        if app_label in REPLICATED_APPS and state is not None and state.replica:
+            return state.replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        app_label = model._meta.app_label
+        if app_label in AUDIT_APPS:
+            return settings.AUDIT_DATABASE
+        state = _read_state.get()
+        if app_label in REPLICATED_APPS and state is not None:
+            # Read your own writes for the rest of the request.
+            state.pin()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # RequestLog.user is a plain column once the audit database is separate.
+        if obj1._meta.app_label in AUDIT_APPS or obj2._meta.app_label in AUDIT_APPS:
+            return True
+        primary = {DEFAULT_DB_ALIAS, *settings.DB_REPLICAS}
+        if obj1._state.db in primary and obj2._state.db in primary:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DB_REPLICAS:
+            return False
+        if settings.AUDIT_DATABASE == DEFAULT_DB_ALIAS:
+            return None
+        if db == settings.AUDIT_DATABASE:
+            return app_label in AUDIT_APPS | AUDIT_MIGRATION_DEPENDENCIES
+        if app_label in AUDIT_APPS:
+            return False
+        return None
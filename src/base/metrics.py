@@ -0,0 +1,32 @@
+from django.core.cache import cache
+
+KEY_PREFIX = "metrics:"
+
+
+def incr(name: str, delta: int = 1) -> None:
+    """
+    Increments a named counter in the default cache.
+
+    Counters are only shared across processes when that cache is shared, as with
+    Redis; with the local-memory backend each process keeps its own.
+    """
+    key = KEY_PREFIX + name
+    if cache.add(key, delta, timeout=None):
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The key expired or was evicted between add() and incr().
+        cache.set(key, delta, timeout=None)
+
+
+def get_many(*names: str) -> dict[str, int]:
+    """
+    Returns the current value of each counter, defaulting to 0.
+    """
+    values = cache.get_many([KEY_PREFIX + name for name in names])
+    return {name: values.get(KEY_PREFIX + name, 0) for name in names}
+
+
+def reset(*names: str) -> None:
+    cache.delete_many([KEY_PREFIX + name for name in names])
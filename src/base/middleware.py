@@ -0,0 +1,55 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from base.db_router import replica_reads
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+PIN_COOKIE = "db_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe requests read CV data from a replica.
+
+    A client that wrote gets a cookie pinning its reads to the primary for
+    DB_REPLICA_PIN_SECONDS, so it sees its own changes despite replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DB_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        allowed = self.use_replica(request)
+        with replica_reads(allowed) as state:
+            response = self.get_response(request)
+        return self.pin(request, response, allowed, state)
+
+    async def __acall__(self, request):
+        allowed = self.use_replica(request)
+        with replica_reads(allowed) as state:
+            response = await self.get_response(request)
+        return self.pin(request, response, allowed, state)
+
+    @staticmethod
+    def use_replica(request) -> bool:
+        return request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+
+    @staticmethod
+    def pin(request, response, allowed: bool, state):
+        # Unsafe requests, and safe ones that wrote CV data, send the client's next reads to the primary.
+        if request.method not in SAFE_METHODS or allowed and state.replica is None:
+            response.set_cookie(
+                PIN_COOKIE, "1", max_age=settings.DB_REPLICA_PIN_SECONDS, httponly=True, samesite="Lax"
+            )
+        return response
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import caches
+
+HEALTH_KEY = "health:ping"
+
+
+class SharedConnectionPool(redis.BlockingConnectionPool):
+    """
+    Connection pool shared by every Redis client of the process with the same URL and options.
+
+    Django creates one RedisCache per alias and per thread, each with its own
+    pool; with this class as the caches' pool_class they all draw from one
+    bounded set of connections. Callers wait up to `timeout` seconds for a free
+    connection instead of failing once max_connections are in use.
+    """
+
+    _instances = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        key = (url, repr(sorted(kwargs.items())))
+        with cls._lock:
+            pool = cls._instances.get(key)
+            if pool is None:
+                pool = cls._instances[key] = super().from_url(url, **kwargs)
+            return pool
+
+    @classmethod
+    def instances(cls) -> list["SharedConnectionPool"]:
+        with cls._lock:
+            return list(cls._instances.values())
+
+
+def get_redis(url: str = None) -> redis.Redis:
+    """
+    Returns a client on the shared pool of url, REDIS_URL by default.
+    """
+    # Same options as Django's RedisCache passes, so the caches' pool is reused.
+    pool = SharedConnectionPool.from_url(
+        url or settings.REDIS_URL, parser_class=redis.connection.DefaultParser, **settings.REDIS_POOL_OPTIONS
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def timed(check) -> dict:
+    started = time.perf_counter()
+    try:
+        check()
+    except Exception as e:
+        return {"ok": False, "error": str(e), "latency_ms": (time.perf_counter() - started) * 1000}
+    return {"ok": True, "latency_ms": (time.perf_counter() - started) * 1000}
+
+
+def health() -> dict:
+    """
+    Round-trip latency of every cache alias and every shared Redis pool of this process.
+    """
+    return {
+        "caches": {alias: timed(lambda: caches[alias].get(HEALTH_KEY)) for alias in settings.CACHES},
+        "pools": [
+            {
+                "host": f"{pool.connection_kwargs.get('host')}:{pool.connection_kwargs.get('port')}",
+                "db": pool.connection_kwargs.get("db"),
+                "max_connections": pool.max_connections,
+                **timed(redis.Redis(connection_pool=pool).ping),
+            }
+            for pool in SharedConnectionPool.instances()
+        ],
+    }
@@ -3,7 +3,12 @@ from core.models import (
     CurriculumVitae,
     Skill,
     Project,
-    Contact
+    Contact,
+    PDFRenderJob,
+    CurriculumVitaeTranslation,
+    PDFEmailBatch,
+    PDFEmailDelivery,
+    SkillFacet
 )
 
 
@@ -25,3 +30,28 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(PDFRenderJob)
+class PDFRenderJobAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(CurriculumVitaeTranslation)
+class CurriculumVitaeTranslationAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(PDFEmailBatch)
+class PDFEmailBatchAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(PDFEmailDelivery)
+class PDFEmailDeliveryAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(SkillFacet)
+class SkillFacetAdmin(admin.ModelAdmin):
+    pass
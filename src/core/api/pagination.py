@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CurriculumVitaeCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first, or over (rank, id)
+    when the list is filtered by a search query.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        if 'rank' in queryset.query.annotations:
+            return ('-rank', '-id')
+        return super().get_ordering(request, queryset, view)
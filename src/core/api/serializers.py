@@ -1,5 +1,57 @@
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
-from core.models import CurriculumVitae, Project, Skill, Contact
+from core.constants import PDF_EMAIL_MAX_RECIPIENTS
+from core.models import CurriculumVitae, PDFEmailBatch, PDFEmailDelivery, Project, Skill, Contact
+from core.services.cv_card import schedule_card_refresh
+from core.services.facets import schedule_skill_facet_refresh
+from core.services.search import schedule_search_vector_update
+from core.tasks import schedule_pretranslation
+
+
+def resolve_by_name(model, items: list[dict]) -> dict:
+    """
+    Maps each item name to an existing or newly created object with one IN
+    lookup, creating the missing ones in a single bulk insert.
+    """
+    items_by_name = {item['name']: item for item in items}
+    if not items_by_name:
+        return {}
+
+    objects = {obj.name: obj for obj in model.objects.filter(name__in=items_by_name)}
+    missing = [model(**item) for name, item in items_by_name.items() if name not in objects]
+    if missing:
+        # Rows inserted concurrently are skipped here and picked up by the lookup below.
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+        objects.update(
+            (obj.name, obj) for obj in model.objects.filter(name__in=[obj.name for obj in missing])
+        )
+    return objects
+
+
+def contact_key(contact_data: dict) -> tuple[str, str]:
+    return contact_data['type'], contact_data['contact_link']
+
+
+def resolve_contacts(items: list[dict]) -> dict:
+    """
+    Maps each (type, contact_link) pair to an existing or newly created Contact.
+    """
+    items_by_key = {contact_key(item): item for item in items}
+    if not items_by_key:
+        return {}
+
+    query = Q()
+    for contact_type, contact_link in items_by_key:
+        query |= Q(type=contact_type, contact_link=contact_link)
+    contacts = {}
+    for contact in Contact.objects.filter(query):
+        contacts.setdefault((contact.type, contact.contact_link), contact)
+
+    missing = [Contact(**item) for key, item in items_by_key.items() if key not in contacts]
+    for contact in Contact.objects.bulk_create(missing):
+        contacts[(contact.type, contact.contact_link)] = contact
+    return contacts
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -28,6 +80,62 @@ class ContactSerializer(serializers.ModelSerializer):
         )
 
 
+class CurriculumVitaeBulkSerializer(serializers.ListSerializer):
+    """
+    Creates many CVs with a fixed number of queries, whatever the batch size.
+    """
+
+    @transaction.atomic
+    def create(self, validated_data):
+        skills = resolve_by_name(Skill, [skill for item in validated_data for skill in item.get('skills_data', [])])
+        projects = resolve_by_name(
+            Project, [project for item in validated_data for project in item.get('projects_data', [])]
+        )
+        contacts = resolve_contacts([item['contacts_data'] for item in validated_data])
+
+        cvs = CurriculumVitae.objects.bulk_create([
+            CurriculumVitae(
+                contacts=contacts[contact_key(item['contacts_data'])],
+                **{
+                    field: value for field, value in item.items()
+                    if field not in ('skills_data', 'projects_data', 'contacts_data')
+                }
+            )
+            for item in validated_data
+        ])
+
+        skill_links = CurriculumVitae.skills.through
+        project_links = CurriculumVitae.projects.through
+        skill_links.objects.bulk_create([
+            skill_links(curriculumvitae_id=cv.pk, skill_id=skills[skill['name']].pk)
+            for cv, item in zip(cvs, validated_data)
+            for skill in item.get('skills_data', [])
+        ], ignore_conflicts=True)
+        project_links.objects.bulk_create([
+            project_links(curriculumvitae_id=cv.pk, project_id=projects[project['name']].pk)
+            for cv, item in zip(cvs, validated_data)
+            for project in item.get('projects_data', [])
+        ], ignore_conflicts=True)
+
+        # bulk_create skips the signals that index, count and pre-translate CVs.
+        cv_ids = [cv.pk for cv in cvs]
+        schedule_card_refresh(cv_ids)
+        schedule_search_vector_update(cv_ids)
+        schedule_skill_facet_refresh(skill.pk for skill in skills.values())
+        schedule_pretranslation(cv_ids)
+
+        return cvs
+
+
+class CurriculumVitaeCardSerializer(serializers.BaseSerializer):
+    """
+    Read-only list item built from the stored card alone.
+    """
+
+    def to_representation(self, instance):
+        return {'id': instance.pk, **(instance.card or {})}
+
+
 class CurriculumVitaeSerializer(serializers.ModelSerializer):
     skills = SkillSerializer(many=True, read_only=True)
     projects = ProjectSerializer(many=True, read_only=True)
@@ -42,42 +150,79 @@ class CurriculumVitaeSerializer(serializers.ModelSerializer):
     )
     contacts_data = serializers.DictField(write_only=True, required=False)
 
+    # Nested relations that can be left out with ?expand=
+    expandable_fields = ('skills', 'projects', 'contacts')
+
     class Meta:
         model = CurriculumVitae
+        list_serializer_class = CurriculumVitaeBulkSerializer
         fields = [
             'id', 'first_name', 'last_name', 'bio', 'created_at', 'updated_at',
             'skills', 'projects', 'contacts',
             'skills_data', 'projects_data', 'contacts_data'
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+
+        requested = self.requested_fields(request.query_params)
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, query_params) -> set[str]:
+        """
+        Resolves the sparse fieldset of a read request.
+
+        ?fields=id,first_name limits the response to the listed fields and
+        ?expand=skills limits nested relations to the listed ones; without
+        either parameter every field is returned.
+        """
+        names = set(cls.Meta.fields)
+        expand = None
+        if 'expand' in query_params:
+            expand = {name for name in query_params['expand'].split(',') if name}
+        if 'fields' in query_params:
+            names &= {name for name in query_params['fields'].split(',') if name} | (expand or set())
+        if expand is not None:
+            names -= set(cls.expandable_fields) - expand
+        return names
+
+    def validate_skills_data(self, value):
+        if any('name' not in item for item in value):
+            raise serializers.ValidationError("Every skill needs a name.")
+        return value
+
+    def validate_projects_data(self, value):
+        if any('name' not in item or 'description' not in item for item in value):
+            raise serializers.ValidationError("Every project needs a name and a description.")
+        return value
+
+    def validate_contacts_data(self, value):
+        if 'type' not in value or 'contact_link' not in value:
+            raise serializers.ValidationError("The contact needs a type and a contact_link.")
+        return value
+
+    def validate(self, attrs):
+        if self.instance is None and not attrs.get('contacts_data'):
+            raise serializers.ValidationError({'contacts_data': "This field is required."})
+        return attrs
+
     def create(self, validated_data):
         skills_data = validated_data.pop('skills_data', [])
         projects_data = validated_data.pop('projects_data', [])
-        contacts_data = validated_data.pop('contacts_data', None)
-
-        contact = None
-        if contacts_data:
-            contact, created = Contact.objects.get_or_create(
-                type=contacts_data['type'],
-                contact_link=contacts_data['contact_link'],
-                defaults=contacts_data
-            )
+        contacts_data = validated_data.pop('contacts_data')
 
+        contact = resolve_contacts([contacts_data])[contact_key(contacts_data)]
         cv = CurriculumVitae.objects.create(contacts=contact, **validated_data)
 
-        for skill_data in skills_data:
-            skill, created = Skill.objects.get_or_create(
-                name=skill_data['name'],
-                defaults=skill_data
-            )
-            cv.skills.add(skill)
-
-        for project_data in projects_data:
-            project, created = Project.objects.get_or_create(
-                name=project_data['name'],
-                defaults=project_data
-            )
-            cv.projects.add(project)
+        if skills_data:
+            cv.skills.add(*resolve_by_name(Skill, skills_data).values())
+        if projects_data:
+            cv.projects.add(*resolve_by_name(Project, projects_data).values())
 
         return cv
 
@@ -90,31 +235,66 @@ class CurriculumVitaeSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
 
         if contacts_data:
-            contact, created = Contact.objects.get_or_create(
-                type=contacts_data['type'],
-                contact_link=contacts_data['contact_link'],
-                defaults=contacts_data
-            )
-            instance.contacts = contact
+            instance.contacts = resolve_contacts([contacts_data])[contact_key(contacts_data)]
 
         instance.save()
 
         if skills_data is not None:
-            instance.skills.clear()
-            for skill_data in skills_data:
-                skill, created = Skill.objects.get_or_create(
-                    name=skill_data['name'],
-                    defaults=skill_data
-                )
-                instance.skills.add(skill)
+            instance.skills.set(resolve_by_name(Skill, skills_data).values())
 
         if projects_data is not None:
-            instance.projects.clear()
-            for project_data in projects_data:
-                project, created = Project.objects.get_or_create(
-                    name=project_data['name'],
-                    defaults=project_data
-                )
-                instance.projects.add(project)
+            instance.projects.set(resolve_by_name(Project, projects_data).values())
 
         return instance
+
+
+class PDFEmailDeliverySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PDFEmailDelivery
+        fields = (
+            'email',
+            'status',
+            'error',
+            'sent_at',
+        )
+
+
+class PDFEmailBatchSerializer(serializers.ModelSerializer):
+    cv_ids = serializers.PrimaryKeyRelatedField(
+        source='curriculum_vitae', queryset=CurriculumVitae.objects.all(), many=True, allow_empty=False
+    )
+    emails = serializers.ListField(
+        child=serializers.EmailField(), write_only=True, allow_empty=False, max_length=PDF_EMAIL_MAX_RECIPIENTS
+    )
+    summary = serializers.SerializerMethodField()
+    deliveries = PDFEmailDeliverySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = PDFEmailBatch
+        fields = (
+            'id',
+            'status',
+            'cv_ids',
+            'emails',
+            'summary',
+            'deliveries',
+            'created_at',
+        )
+        read_only_fields = ('status',)
+
+    def get_summary(self, obj) -> dict:
+        summary = dict.fromkeys(PDFEmailDelivery.Status.values, 0)
+        for delivery in obj.deliveries.all():
+            summary[delivery.status] += 1
+        return summary
+
+    @transaction.atomic
+    def create(self, validated_data):
+        batch = PDFEmailBatch.objects.create()
+        batch.curriculum_vitae.set(validated_data['curriculum_vitae'])
+        # Addresses differing only in case are one recipient.
+        emails = {email.lower(): email for email in validated_data['emails']}
+        PDFEmailDelivery.objects.bulk_create([
+            PDFEmailDelivery(batch=batch, email=email) for email in emails.values()
+        ])
+        return batch
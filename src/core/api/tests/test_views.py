@@ -1,7 +1,9 @@
+from unittest import mock
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from core.models import CurriculumVitae, Skill, Project, Contact
+from core.models import CurriculumVitae, PDFEmailBatch, PDFEmailDelivery, Skill, Project, Contact
 
 
 class CurriculumVitaeAPITestCase(APITestCase):
@@ -117,7 +119,7 @@ class CurriculumVitaeAPITestCase(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_get_cv_detail(self):
         """Test retrieving CV detail"""
@@ -154,6 +156,150 @@ class CurriculumVitaeAPITestCase(APITestCase):
         self.assertFalse(CurriculumVitae.objects.filter(pk=cv.pk).exists())
 
 
+class CurriculumVitaeBulkAPITestCase(APITestCase):
+
+    def setUp(self):
+        self.url = reverse('curriculumvitae-bulk')
+        Skill.objects.create(name="Python")
+
+    def make_item(self, i, skills):
+        return {
+            'first_name': f'Bulk{i}',
+            'last_name': 'Test',
+            'bio': 'Imported',
+            'contacts_data': {'type': 'email', 'contact_link': f'bulk{i}@example.com'},
+            'skills_data': [{'name': name} for name in skills],
+            'projects_data': [{'name': f'Project {i}', 'description': 'Imported project'}],
+        }
+
+    def test_bulk_create(self):
+        """Test creating several CVs and linking shared skills"""
+        data = [self.make_item(i, ['Python', 'Django', f'Skill {i}']) for i in range(3)]
+
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['ids']), 3)
+        self.assertEqual(Skill.objects.filter(name__in=['Python', 'Django']).count(), 2)
+        cv = CurriculumVitae.objects.get(first_name='Bulk1')
+        self.assertEqual(set(cv.skills.values_list('name', flat=True)), {'Python', 'Django', 'Skill 1'})
+        self.assertEqual(cv.projects.get().name, 'Project 1')
+        self.assertEqual(cv.contacts.contact_link, 'bulk1@example.com')
+
+    def test_bulk_create_query_count_does_not_grow(self):
+        """Test the number of queries is the same for 1 and 20 CVs"""
+        with self.assertNumQueries(14):
+            self.client.post(self.url, [self.make_item(0, ['Python', 'Go'])], format='json')
+        data = [self.make_item(i, ['Python', f'Lang {i}']) for i in range(1, 21)]
+        with self.assertNumQueries(14):
+            self.client.post(self.url, data, format='json')
+
+    def test_bulk_create_reports_invalid_items(self):
+        """Test per-item errors are returned and nothing is created"""
+        data = [self.make_item(0, ['Python']), {'first_name': 'Broken'}]
+
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertIn('last_name', response.data['errors'][0]['errors'])
+        self.assertFalse(CurriculumVitae.objects.exists())
+
+
+class CurriculumVitaeListAPITestCase(APITestCase):
+
+    def setUp(self):
+        contact = Contact.objects.create(type="email", contact_link="list@example.com")
+        skill = Skill.objects.create(name="Python")
+        self.cvs = []
+        for i in range(5):
+            cv = CurriculumVitae.objects.create(
+                first_name=f'User{i}',
+                last_name='Test',
+                bio='Test Bio',
+                contacts=contact
+            )
+            cv.skills.add(skill)
+            self.cvs.append(cv)
+        self.url = reverse('curriculumvitae-list')
+
+    def test_cursor_pagination_walks_all_cvs(self):
+        """Test following next links returns every CV once, newest first"""
+        ids = []
+        url = f'{self.url}?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(ids, [cv.pk for cv in reversed(self.cvs)])
+
+    def test_sparse_fieldset(self):
+        """Test ?fields= limits the returned fields"""
+        response = self.client.get(self.url, {'fields': 'id,first_name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'first_name'})
+
+    def test_expand_limits_nested_relations(self):
+        """Test ?expand= drops nested relations that were not requested"""
+        response = self.client.get(self.url, {'expand': 'skills'})
+        item = response.data['results'][0]
+
+        self.assertIn('skills', item)
+        self.assertIn('bio', item)
+        self.assertNotIn('projects', item)
+        self.assertNotIn('contacts', item)
+
+    def test_queryset_skips_unrequested_relations(self):
+        """Test nested relations that are not returned are not queried"""
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'expand': ''})
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'expand': 'skills,contacts'})
+
+
+class PDFEmailBatchAPITestCase(APITestCase):
+
+    def setUp(self):
+        contact = Contact.objects.create(type="email", contact_link="batch@example.com")
+        self.cv = CurriculumVitae.objects.create(first_name="John", last_name="Doe", bio="Dev", contacts=contact)
+
+    def test_create_batch(self):
+        """Test queueing a batch creates one delivery per distinct recipient"""
+        data = {'cv_ids': [self.cv.pk], 'emails': ['a@example.com', 'b@example.com', 'A@example.com']}
+        with mock.patch('core.api.views.send_cv_pdf_batch.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('pdfemailbatch-list'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['summary'], {'pending': 2, 'sent': 0, 'failed': 0})
+        self.assertEqual(response.data['cv_ids'], [self.cv.pk])
+        delay.assert_called_once_with(response.data['id'])
+
+    def test_batch_status(self):
+        """Test retrieving the per-recipient status of a batch"""
+        batch = PDFEmailBatch.objects.create()
+        batch.curriculum_vitae.add(self.cv)
+        PDFEmailDelivery.objects.create(batch=batch, email='a@example.com', status=PDFEmailDelivery.Status.SENT)
+        PDFEmailDelivery.objects.create(batch=batch, email='b@example.com', status=PDFEmailDelivery.Status.FAILED)
+
+        response = self.client.get(reverse('pdfemailbatch-detail', kwargs={'pk': batch.pk}))
+
+        self.assertEqual(response.data['summary'], {'pending': 0, 'sent': 1, 'failed': 1})
+        self.assertEqual({d['email']: d['status'] for d in response.data['deliveries']},
+                         {'a@example.com': 'sent', 'b@example.com': 'failed'})
+
+    def test_invalid_batch(self):
+        """Test rejecting unknown CVs and invalid email addresses"""
+        data = {'cv_ids': [999], 'emails': ['not-an-email']}
+        response = self.client.post(reverse('pdfemailbatch-list'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('cv_ids', response.data)
+        self.assertIn('emails', response.data)
+
+
 class SkillAPITestCase(APITestCase):
 
     def setUp(self):
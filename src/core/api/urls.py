@@ -7,6 +7,7 @@ router.register(r'curriculum-vitae', views.CurriculumVitaeViewSet)
 router.register(r'skills', views.SkillViewSet)
 router.register(r'projects', views.ProjectViewSet)
 router.register(r'contacts', views.ContactViewSet)
+router.register(r'cv-email-batches', views.PDFEmailBatchViewSet)
 
 urlpatterns = [
     path("api/", include(router.urls)),
@@ -1,16 +1,76 @@
-from rest_framework import viewsets, status
+from django.db import transaction
+from rest_framework import mixins, viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from core.models import CurriculumVitae, Skill, Project, Contact
+from rest_framework.exceptions import ValidationError
+from core.models import CurriculumVitae, PDFEmailBatch, Skill, Project, Contact
+from core.api.pagination import CurriculumVitaeCursorPagination
+from core.constants import SEARCH_QUERY_PARAM
+from core.services.facets import skill_facets
+from core.services.search import search_cvs
 from core.api.serializers import (
-    CurriculumVitaeSerializer, SkillSerializer,
-    ProjectSerializer, ContactSerializer
+    CurriculumVitaeSerializer, CurriculumVitaeCardSerializer, SkillSerializer,
+    ProjectSerializer, ContactSerializer,
+    PDFEmailBatchSerializer
 )
+from core.tasks import send_cv_pdf_batch
 
 
 class CurriculumVitaeViewSet(viewsets.ModelViewSet):
-    queryset = CurriculumVitae.objects.all().select_related('contacts').prefetch_related('skills', 'projects')
+    queryset = CurriculumVitae.objects.full()
     serializer_class = CurriculumVitaeSerializer
+    pagination_class = CurriculumVitaeCursorPagination
+
+    def get_queryset(self):
+        if self.request.method != 'GET':
+            return super().get_queryset()
+
+        # Only join and prefetch the relations the response will contain.
+        fields = self.serializer_class.requested_fields(self.request.query_params)
+        queryset = CurriculumVitae.objects.with_relations(*fields)
+        if self.action == 'list':
+            queryset = self.filter_cvs(queryset)
+        return queryset
+
+    def filter_cvs(self, queryset):
+        """
+        Applies the list filters: ?skills=Python,Django and ?projects=... with
+        ?skills_match=all (default any), and the ?q= full-text search.
+        """
+        params = self.request.query_params
+        for relation in ('skills', 'projects'):
+            names = [name.strip() for name in params.get(relation, '').split(',') if name.strip()]
+            match = params.get(f'{relation}_match', 'any')
+            if match not in ('any', 'all'):
+                raise ValidationError({f'{relation}_match': "Expected 'any' or 'all'."})
+            if names:
+                queryset = queryset.with_linked(relation, names, match_all=match == 'all')
+
+        q = params.get(SEARCH_QUERY_PARAM, '').strip()
+        if q:
+            queryset = search_cvs(queryset, q)
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def cards(self, request):
+        """
+        Lightweight list served from the stored cards: one query, no joins or prefetches.
+        """
+        queryset = self.filter_cvs(CurriculumVitae.objects.cards())
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(CurriculumVitaeCardSerializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Counts the CVs matching the list filters and the matching CVs per skill.
+        """
+        if not any(request.query_params.get(name) for name in ('skills', 'projects', SEARCH_QUERY_PARAM)):
+            # Unfiltered counts come straight from the stored skill facets.
+            return Response({'count': CurriculumVitae.objects.count(), 'skills': skill_facets()})
+
+        queryset = self.filter_cvs(CurriculumVitae.objects.all())
+        return Response({'count': queryset.count(), 'skills': skill_facets(queryset)})
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -19,6 +79,26 @@ class CurriculumVitaeViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Creates a list of CVs in one transaction; nothing is saved if any item is invalid.
+        """
+        if not isinstance(request.data, list):
+            return Response({'error': 'Expected a list of CVs.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            # Depending on the DRF version, list errors are a list or a dict keyed by item index.
+            item_errors = serializer.errors
+            if not isinstance(item_errors, dict):
+                item_errors = dict(enumerate(item_errors))
+            errors = [{'index': index, 'errors': errors} for index, errors in item_errors.items() if errors]
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        cvs = serializer.save()
+        return Response({'ids': [cv.pk for cv in cvs]}, status=status.HTTP_201_CREATED)
+
 class SkillViewSet(viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
@@ -32,3 +112,19 @@ class ProjectViewSet(viewsets.ModelViewSet):
 class ContactViewSet(viewsets.ModelViewSet):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
+
+
+class PDFEmailBatchViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Queues CV PDFs for many recipients and reports per-recipient delivery status.
+    """
+    queryset = PDFEmailBatch.objects.prefetch_related('curriculum_vitae', 'deliveries')
+    serializer_class = PDFEmailBatchSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch = serializer.save()
+        transaction.on_commit(lambda: send_cv_pdf_batch.delay(batch.pk))
+        batch = self.get_queryset().get(pk=batch.pk)
+        return Response(self.get_serializer(batch).data, status=status.HTTP_202_ACCEPTED)
@@ -20,3 +20,24 @@ LANG_CODES = {
     "srm": "EN",
     "bi": "EN"
 }
+
+# Rows fetched per server-side cursor round trip when streaming CV exports.
+EXPORT_CHUNK_SIZE = 500
+
+# DeepL accepts at most 50 text parameters per translate request.
+DEEPL_MAX_TEXTS_PER_REQUEST = 50
+
+# Templates rendered to PDF; engine workers load them at startup.
+CV_PDF_TEMPLATE = "core/curriculum-vitae-pdf.html"
+CV_EMAIL_PDF_TEMPLATE = "core/curriculum-vitae-detail-pdf.html"
+PDF_TEMPLATES = (CV_PDF_TEMPLATE, CV_EMAIL_PDF_TEMPLATE)
+
+# Recipients accepted by one bulk CV email batch.
+PDF_EMAIL_MAX_RECIPIENTS = 1000
+
+# PostgreSQL text search configuration of CV search vectors and queries.
+SEARCH_CONFIG = "english"
+SEARCH_QUERY_PARAM = "q"
+
+# Words of the bio kept on a CV list card.
+CV_CARD_BIO_WORDS = 20
@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+
+
+class Command(BaseCommand):
+    help = "Times requests with a new database connection per request and with persistent connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--path", default="/")
+        parser.add_argument("--conn-max-age", type=int, default=60, help="CONN_MAX_AGE of the persistent run.")
+
+    def handle(self, *args, **options):
+        results = [
+            self.run(options["path"], options["requests"], max_age)
+            for max_age in (0, options["conn_max_age"])
+        ]
+
+        self.stdout.write(f"{'mode':<18}{'connections':>12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for result in results:
+            self.stdout.write(
+                f"{'CONN_MAX_AGE=' + str(result['max_age']):<18}{result['connections']:>12}"
+                f"{result['mean']:>10.2f}{result['p50']:>10.2f}{result['p95']:>10.2f}"
+            )
+        saved = results[0]["mean"] - results[1]["mean"]
+        self.stdout.write(f"Connection setup per request: {saved:.2f} ms")
+
+    def run(self, path: str, count: int, max_age: int) -> dict:
+        """
+        Requests path count times, closing connections around each request the
+        way Django's request_started/request_finished handlers do (the test
+        client skips those).
+        """
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        client = Client()
+        original_max_age = connection.settings_dict["CONN_MAX_AGE"]
+        connection.close()
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        connection_created.connect(count_connection)
+        durations = []
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"]):
+                client.get(path)  # Warm up templates and URL resolution.
+                opened.clear()
+                for _ in range(count):
+                    started = time.perf_counter()
+                    close_old_connections()
+                    client.get(path)
+                    close_old_connections()
+                    durations.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
+
+        return {
+            "max_age": max_age,
+            "connections": len(opened),
+            "mean": statistics.fmean(durations),
+            "p50": statistics.median(durations),
+            "p95": statistics.quantiles(durations, n=20)[-1] if len(durations) > 1 else durations[0],
+        }
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.constants import EXPORT_CHUNK_SIZE
+from core.services.export import EXPORT_FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Streams every CV as NDJSON or CSV with constant memory usage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument("--output", help="File to write to, stdout by default.")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        chunks = iter_export(options["format"], options["chunk_size"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exported CVs to {options['output']}"))
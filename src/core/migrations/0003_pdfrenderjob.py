@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_project_name_alter_skill_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFRenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cache_key', models.CharField(max_length=255, unique=True, verbose_name='Cache key')),
+                ('template_path', models.CharField(max_length=255, verbose_name='Template path')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=16, verbose_name='Status')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('curriculum_vitae', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pdf_jobs', to='core.curriculumvitae')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
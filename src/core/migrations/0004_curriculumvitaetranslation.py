@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_pdfrenderjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pdfrenderjob',
+            name='language',
+            field=models.CharField(blank=True, max_length=8, verbose_name='Language'),
+        ),
+        migrations.CreateModel(
+            name='CurriculumVitaeTranslation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('language', models.CharField(max_length=8, verbose_name='Language')),
+                ('source_hash', models.CharField(max_length=64, verbose_name='Source hash')),
+                ('bio', models.TextField(blank=True, verbose_name='Biography')),
+                ('skills', models.JSONField(default=dict, verbose_name='Skills')),
+                ('projects', models.JSONField(default=dict, verbose_name='Projects')),
+                ('curriculum_vitae', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translations', to='core.curriculumvitae')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('curriculum_vitae', 'language'), name='unique_cv_translation_language')],
+            },
+        ),
+    ]
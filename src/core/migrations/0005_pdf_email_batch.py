@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_curriculumvitaetranslation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFEmailBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('done', 'Done')], default='pending', max_length=16, verbose_name='Status')),
+                ('curriculum_vitae', models.ManyToManyField(related_name='pdf_email_batches', to='core.curriculumvitae')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PDFEmailDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=16, verbose_name='Status')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent at')),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='core.pdfemailbatch')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('batch', 'email'), name='unique_pdf_email_delivery')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+BACKFILL_SEARCH_VECTORS = """
+UPDATE core_curriculumvitae cv SET search_vector =
+    setweight(to_tsvector('english', coalesce(cv.first_name, '') || ' ' || coalesce(cv.last_name, '')), 'A')
+    || setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(s.name, ' ') FROM core_skill s
+        JOIN core_curriculumvitae_skills cs ON cs.skill_id = s.id
+        WHERE cs.curriculumvitae_id = cv.id
+    ), '')), 'B')
+    || setweight(to_tsvector('english', coalesce(cv.bio, '')), 'C')
+    || setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(p.description, ' ') FROM core_project p
+        JOIN core_curriculumvitae_projects cp ON cp.project_id = p.id
+        WHERE cp.curriculumvitae_id = cv.id
+    ), '')), 'D')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_pdf_email_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculumvitae',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='curriculumvitae',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_cv_search_vector_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTORS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_SKILL_FACETS = """
+INSERT INTO core_skillfacet (created_at, updated_at, skill_id, cv_count)
+SELECT now(), now(), s.id, count(cs.id)
+FROM core_skill s
+LEFT JOIN core_curriculumvitae_skills cs ON cs.skill_id = s.id
+GROUP BY s.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_curriculumvitae_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cv_count', models.PositiveIntegerField(default=0, verbose_name='CV count')),
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='facet', to='core.skill')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SKILL_FACETS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:09
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+BATCH_SIZE = 1000
+
+
+def build_cards(apps, schema_editor):
+    """
+    Fills the cards in id-ordered batches, holding one batch and its skills in memory.
+    """
+    CurriculumVitae = apps.get_model('core', 'CurriculumVitae')
+    queryset = CurriculumVitae.objects.order_by('id').only(
+        'id', 'first_name', 'last_name', 'bio'
+    ).prefetch_related('skills')
+    last_id = 0
+    while cvs := list(queryset.filter(id__gt=last_id)[:BATCH_SIZE]):
+        for cv in cvs:
+            cv.card = {
+                'name': f'{cv.first_name} {cv.last_name}',
+                'bio': Truncator(cv.bio).words(20, truncate=' …'),
+                'skills': [skill.name for skill in cv.skills.all()],
+            }
+        CurriculumVitae.objects.bulk_update(cvs, ['card'])
+        last_id = cvs[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_skillfacet'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculumvitae',
+            name='card',
+            field=models.JSONField(editable=False, null=True, verbose_name='Card'),
+        ),
+        migrations.RunPython(build_cards, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,51 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from base.models import BaseModel
 from django.utils.translation import gettext_lazy as _
 
 
+class CurriculumVitaeQuerySet(models.QuerySet):
+    def with_relations(self, *relations):
+        """
+        Loads the given relations ("contacts", "skills", "projects") up front.
+        """
+        queryset = self
+        if "contacts" in relations:
+            queryset = queryset.select_related("contacts")
+        prefetches = [name for name in ("skills", "projects") if name in relations]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def with_linked(self, relation: str, names, match_all: bool = False):
+        """
+        Keeps the CVs linked to any, or with match_all every, of the named skills or projects.
+
+        Runs as a subquery on the M2M table instead of a join, so CVs are not duplicated.
+        """
+        names = set(names)
+        through = self.model._meta.get_field(relation).remote_field.through
+        target = f"{relation.removesuffix('s')}__name__in"
+        links = through.objects.filter(**{target: names}).values("curriculumvitae_id")
+        if match_all:
+            links = links.annotate(matched=models.Count("pk")).filter(matched=len(names))
+        return self.filter(pk__in=links.values("curriculumvitae_id"))
+
+    def cards(self):
+        """
+        Loads only the stored list cards, without joins or prefetches.
+        """
+        return self.only("pk", "created_at", "updated_at", "card")
+
+    def full(self):
+        """
+        Loads everything a CV page, PDF or API response shows: one query plus one per M2M relation.
+        """
+        return self.with_relations("contacts", "skills", "projects")
+
+
 class CurriculumVitae(BaseModel):
     first_name = models.CharField(_("First name"), max_length=255)
     last_name = models.CharField(_("Last name"), max_length=255)
@@ -11,6 +53,17 @@ class CurriculumVitae(BaseModel):
     projects = models.ManyToManyField('Project', related_name="curriculum_vitae")
     bio = models.TextField(_("Biography"))
     contacts = models.ForeignKey("Contact", on_delete=models.CASCADE, related_name="curriculum_vitae")
+    # Names, skill names, bio and project descriptions; maintained by core.signals.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Precomputed list card (name, truncated bio, skill names); maintained by core.signals.
+    card = models.JSONField(_("Card"), null=True, editable=False)
+
+    objects = CurriculumVitaeQuerySet.as_manager()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            GinIndex(fields=["search_vector"], name="core_cv_search_vector_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -23,6 +76,17 @@ class Skill(BaseModel):
         return f"{self.name}"
 
 
+class SkillFacet(BaseModel):
+    """
+    Number of CVs linked to a skill, kept up to date by core.signals for the facet endpoint.
+    """
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, related_name="facet")
+    cv_count = models.PositiveIntegerField(_("CV count"), default=0)
+
+    def __str__(self):
+        return f"{self.skill_id}: {self.cv_count}"
+
+
 class Project(BaseModel):
     name = models.CharField(_("Name"), max_length=255, unique=True)
     description = models.TextField(_("Description"))
@@ -37,3 +101,87 @@ class Contact(BaseModel):
 
     def __str__(self):
         return f"{self.type} {self.contact_link}"
+
+
+class PDFRenderJob(BaseModel):
+    """
+    Background render of a CV PDF, identified by the PDF cache key it fills.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        READY = "ready", _("Ready")
+        FAILED = "failed", _("Failed")
+
+    curriculum_vitae = models.ForeignKey(CurriculumVitae, on_delete=models.CASCADE, related_name="pdf_jobs")
+    cache_key = models.CharField(_("Cache key"), max_length=255, unique=True)
+    template_path = models.CharField(_("Template path"), max_length=255)
+    language = models.CharField(_("Language"), max_length=8, blank=True)
+    status = models.CharField(_("Status"), max_length=16, choices=Status.choices, default=Status.PENDING)
+    error = models.TextField(_("Error"), blank=True)
+
+    def __str__(self):
+        return f"{self.cache_key} {self.status}"
+
+
+class CurriculumVitaeTranslation(BaseModel):
+    """
+    Translated CV fields in one DeepL target language.
+
+    skills and projects map the skill/project id to its translated name or
+    description. source_hash identifies the CV content that was translated,
+    so stale rows are never served.
+    """
+
+    curriculum_vitae = models.ForeignKey(CurriculumVitae, on_delete=models.CASCADE, related_name="translations")
+    language = models.CharField(_("Language"), max_length=8)
+    source_hash = models.CharField(_("Source hash"), max_length=64)
+    bio = models.TextField(_("Biography"), blank=True)
+    skills = models.JSONField(_("Skills"), default=dict)
+    projects = models.JSONField(_("Projects"), default=dict)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["curriculum_vitae", "language"], name="unique_cv_translation_language"),
+        ]
+
+    def __str__(self):
+        return f"{self.curriculum_vitae_id} {self.language}"
+
+
+class PDFEmailBatch(BaseModel):
+    """
+    CV PDFs emailed to many recipients; every recipient gets all of the batch's CVs in one message.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENDING = "sending", _("Sending")
+        DONE = "done", _("Done")
+
+    curriculum_vitae = models.ManyToManyField(CurriculumVitae, related_name="pdf_email_batches")
+    status = models.CharField(_("Status"), max_length=16, choices=Status.choices, default=Status.PENDING)
+
+    def __str__(self):
+        return f"{self.pk} {self.status}"
+
+
+class PDFEmailDelivery(BaseModel):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    batch = models.ForeignKey(PDFEmailBatch, on_delete=models.CASCADE, related_name="deliveries")
+    email = models.EmailField(_("Email"))
+    status = models.CharField(_("Status"), max_length=16, choices=Status.choices, default=Status.PENDING)
+    error = models.TextField(_("Error"), blank=True)
+    sent_at = models.DateTimeField(_("Sent at"), null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["batch", "email"], name="unique_pdf_email_delivery"),
+        ]
+
+    def __str__(self):
+        return f"{self.email} {self.status}"
@@ -0,0 +1,39 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils.text import Truncator
+
+from core.constants import CV_CARD_BIO_WORDS
+from core.models import CurriculumVitae
+
+
+def build_card(cv) -> dict:
+    """
+    Builds the payload a CV list card shows; the CV's skills should be prefetched.
+    """
+    return {
+        "name": f"{cv.first_name} {cv.last_name}",
+        "bio": Truncator(cv.bio).words(CV_CARD_BIO_WORDS, truncate=" …"),
+        "skills": [skill.name for skill in cv.skills.all()],
+    }
+
+
+def refresh_cards(cv_ids) -> int:
+    """
+    Rebuilds the stored cards of the given CVs with one read and one bulk update.
+    """
+    cvs = list(CurriculumVitae.objects.filter(pk__in=list(cv_ids)).prefetch_related("skills").only(
+        "pk", "first_name", "last_name", "bio"
+    ))
+    for cv in cvs:
+        cv.card = build_card(cv)
+    return CurriculumVitae.objects.bulk_update(cvs, ["card"])
+
+
+def schedule_card_refresh(cv_ids) -> None:
+    """
+    Rebuilds the cards once the current transaction commits, so unlinked skills are already gone.
+    """
+    cv_ids = list(cv_ids)
+    if cv_ids:
+        transaction.on_commit(partial(refresh_cards, cv_ids))
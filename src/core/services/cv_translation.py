@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+
+from core.constants import LANG_CODES
+from core.models import CurriculumVitae, CurriculumVitaeTranslation
+from core.services.deepl_translate import atranslate_segments, translate_segments
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_language(lang_code: str) -> str:
+    """
+    Maps a language picker code ("br") or a DeepL code ("fr") to the DeepL target code ("FR").
+    """
+    return LANG_CODES.get(lang_code, lang_code).upper()
+
+
+def pretranslation_languages() -> list[str]:
+    languages = settings.CV_TRANSLATION_LANGUAGES or LANG_CODES.values()
+    return sorted({language.upper() for language in languages})
+
+
+def source_hash(cv: CurriculumVitae) -> str:
+    """
+    Hashes the translatable fields of a CV with prefetched skills and projects.
+    """
+    source = {
+        "bio": cv.bio,
+        "skills": sorted((skill.pk, skill.name) for skill in cv.skills.all()),
+        "projects": sorted((project.pk, project.description) for project in cv.projects.all()),
+    }
+    return hashlib.sha256(json.dumps(source).encode("utf-8")).hexdigest()
+
+
+def cv_segments(cv: CurriculumVitae) -> tuple[list, list, list[str]]:
+    """
+    Returns the skills, the projects and the texts to translate: bio, skill names, project descriptions.
+    """
+    skills = list(cv.skills.all())
+    projects = list(cv.projects.all())
+    segments = [cv.bio] + [skill.name for skill in skills] + [project.description for project in projects]
+    return skills, projects, segments
+
+
+def build_cv_translation(target_lang: str, skills: list, projects: list, segments: list[str]) -> dict:
+    translated = iter(segments)
+    return {
+        "target_language": target_lang,
+        "bio": next(translated),
+        "skills": [{"id": skill.pk, "name": next(translated)} for skill in skills],
+        "projects": [{"id": project.pk, "description": next(translated)} for project in projects],
+    }
+
+
+def translate_cv(cv: CurriculumVitae, target_lang: str) -> tuple:
+    """
+    Translates the bio, skill names and project descriptions of a CV in one batch.
+
+    Returns ({"target_language", "bio", "skills", "projects"}, status), or an
+    error dict and status when DeepL fails.
+    """
+    skills, projects, segments = cv_segments(cv)
+    result, status_code = translate_segments(segments, target_lang)
+    if status_code != 200:
+        return result, status_code
+    return build_cv_translation(target_lang, skills, projects, result["segments"]), 200
+
+
+async def atranslate_cv(cv: CurriculumVitae, target_lang: str) -> tuple:
+    """
+    Async version of translate_cv; skills and projects must be prefetched.
+    """
+    skills, projects, segments = cv_segments(cv)
+    result, status_code = await atranslate_segments(segments, target_lang)
+    if status_code != 200:
+        return result, status_code
+    return build_cv_translation(target_lang, skills, projects, result["segments"]), 200
+
+
+def store_translation(cv: CurriculumVitae, target_lang: str) -> CurriculumVitaeTranslation | None:
+    """
+    Translates and stores the CV unless an up-to-date translation exists.
+    """
+    current_hash = source_hash(cv)
+    translation = CurriculumVitaeTranslation.objects.filter(curriculum_vitae=cv, language=target_lang).first()
+    if translation is not None and translation.source_hash == current_hash:
+        return translation
+
+    result, status_code = translate_cv(cv, target_lang)
+    if status_code != 200:
+        logger.warning("Could not translate CV %s into %s: %s", cv.pk, target_lang, result.get("error"))
+        return None
+
+    translation, _ = CurriculumVitaeTranslation.objects.update_or_create(
+        curriculum_vitae=cv,
+        language=target_lang,
+        defaults={
+            "source_hash": current_hash,
+            "bio": result["bio"],
+            "skills": {str(skill["id"]): skill["name"] for skill in result["skills"]},
+            "projects": {str(project["id"]): project["description"] for project in result["projects"]},
+        },
+    )
+    return translation
+
+
+def get_stored_translation(cv: CurriculumVitae, target_lang: str) -> CurriculumVitaeTranslation | None:
+    """
+    Returns the stored translation of the CV's current content, without calling DeepL.
+    """
+    translation = CurriculumVitaeTranslation.objects.filter(curriculum_vitae=cv, language=target_lang).first()
+    if translation is None or translation.source_hash != source_hash(cv):
+        return None
+    return translation
+
+
+def apply_translation(cv: CurriculumVitae, translation: CurriculumVitaeTranslation) -> CurriculumVitae:
+    """
+    Swaps the translated texts into the CV and its prefetched skills and projects, in memory only.
+    """
+    cv.bio = translation.bio
+    for skill in cv.skills.all():
+        skill.name = translation.skills.get(str(skill.pk), skill.name)
+    for project in cv.projects.all():
+        project.description = translation.projects.get(str(project.pk), project.description)
+    return cv
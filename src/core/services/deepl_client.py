@@ -0,0 +1,309 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from functools import lru_cache
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+
+from core.constants import DEEPL_FREE_API_URL, DEEPL_PRO_API_URL
+
+
+class DeepLError(Exception):
+    """
+    A failed translation, with the HTTP status to report to our own client.
+    """
+
+    def __init__(self, message: str, status_code: int = 500, details: str = None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+    def as_dict(self) -> dict:
+        result = {"error": self.message}
+        if self.details:
+            result["details"] = self.details
+        return result
+
+
+class CircuitOpenError(DeepLError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and lets a single trial
+    request through once reset_timeout seconds have passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: restart the timer so concurrent callers keep failing fast.
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class BaseDeepLClient:
+    """
+    Settings and response handling shared by the sync and async DeepL clients.
+    """
+
+    retry_statuses = frozenset({429, 500, 502, 503, 504, 529})
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = None,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8,
+        pool_maxsize: int = 10,
+        circuit_breaker: CircuitBreaker = None,
+    ):
+        self.api_key = api_key.strip()
+        self.api_url = api_url or (DEEPL_FREE_API_URL if self.api_key.endswith(":fx") else DEEPL_PRO_API_URL)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_maxsize = pool_maxsize
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        self.headers = {"Authorization": f"DeepL-Auth-Key {self.api_key}"}
+
+    def backoff(self, attempt: int, retry_after: str = None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def check_circuit(self) -> None:
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError("DeepL API is temporarily unavailable", 503)
+
+    def retry_error(self, response) -> DeepLError | None:
+        """
+        Returns the error to raise if this response is still retryable once retries run out.
+        """
+        if response.status_code not in self.retry_statuses:
+            return None
+        if response.status_code == 429:
+            return DeepLError("DeepL API quota exceeded", 429)
+        return DeepLError(f"DeepL API error {response.status_code}", 502, response.text)
+
+    def parse_response(self, response, texts: list[str]) -> list[str]:
+        if response.status_code == 403:
+            raise DeepLError(
+                "DeepL API authentication failed. Check your API key and endpoint.", 403, response.text
+            )
+        if response.status_code == 456:
+            raise DeepLError("DeepL API quota exceeded", 429)
+        if response.status_code >= 400:
+            raise DeepLError(f"DeepL API error {response.status_code}", 502, response.text)
+
+        try:
+            translations = response.json().get("translations") or []
+        except ValueError as e:
+            # A 2xx body that is not JSON, such as a proxy's error page.
+            raise DeepLError(f"Request failed: {str(e)}", 503, response.text)
+        if len(translations) != len(texts):
+            raise DeepLError("No translation returned", 500)
+        return [translation["text"] for translation in translations]
+
+
+class DeepLClient(BaseDeepLClient):
+    """
+    DeepL translate API client with a pooled keep-alive session, timeouts,
+    jittered exponential backoff on 429/5xx and a circuit breaker.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+
+    def translate(self, texts: list[str], target_lang: str) -> list[str]:
+        """
+        Translates every text in one request and returns the results in order.
+        """
+        self.check_circuit()
+
+        response = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                time.sleep(self.backoff(attempt - 1, retry_after))
+            try:
+                response = self.session.post(
+                    self.api_url,
+                    data={"text": texts, "target_lang": target_lang},
+                    timeout=(self.connect_timeout, self.read_timeout),
+                )
+            except requests.exceptions.RequestException as e:
+                response = None
+                error = DeepLError(f"Request failed: {str(e)}", 503)
+                continue
+
+            error = self.retry_error(response)
+            if error is None:
+                break
+        else:
+            self.circuit_breaker.record_failure()
+            raise error
+
+        self.circuit_breaker.record_success()
+        return self.parse_response(response, texts)
+
+
+class AsyncDeepLClient(BaseDeepLClient):
+    """
+    Asyncio counterpart of DeepLClient built on a pooled httpx.AsyncClient.
+
+    An httpx client is bound to the event loop it was first used on, so use
+    get_async_deepl_client() to get the one of the running loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize),
+        )
+
+    async def translate(self, texts: list[str], target_lang: str) -> list[str]:
+        """
+        Translates every text in one request and returns the results in order.
+        """
+        self.check_circuit()
+
+        response = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                await asyncio.sleep(self.backoff(attempt - 1, retry_after))
+            try:
+                response = await self.client.post(
+                    self.api_url,
+                    data={"text": texts, "target_lang": target_lang},
+                )
+            except httpx.HTTPError as e:
+                response = None
+                error = DeepLError(f"Request failed: {str(e)}", 503)
+                continue
+
+            error = self.retry_error(response)
+            if error is None:
+                break
+        else:
+            self.circuit_breaker.record_failure()
+            raise error
+
+        self.circuit_breaker.record_success()
+        return self.parse_response(response, texts)
+
+
+class ThreadedDeepLClient:
+    """
+    Async interface to the process's pooled DeepLClient, running each call in a thread.
+
+    Used where event loops only live for one request, as for async views under
+    WSGI, so connections and the circuit breaker outlive the loop.
+    """
+
+    def __init__(self, client: DeepLClient):
+        self.client = client
+
+    async def translate(self, texts: list[str], target_lang: str) -> list[str]:
+        return await sync_to_async(self.client.translate, thread_sensitive=False)(texts, target_lang)
+
+
+def client_options() -> dict:
+    return {
+        "api_key": settings.DEEPL_API_KEY,
+        "api_url": settings.DEEPL_API_URL,
+        "connect_timeout": settings.DEEPL_CONNECT_TIMEOUT,
+        "read_timeout": settings.DEEPL_READ_TIMEOUT,
+        "max_retries": settings.DEEPL_MAX_RETRIES,
+        "backoff_base": settings.DEEPL_BACKOFF_BASE,
+        "backoff_max": settings.DEEPL_BACKOFF_MAX,
+        "pool_maxsize": settings.DEEPL_POOL_MAXSIZE,
+        "circuit_breaker": get_circuit_breaker(),
+    }
+
+
+@lru_cache(maxsize=None)
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    The breaker shared by every client of the process, sync or async.
+    """
+    return CircuitBreaker(
+        failure_threshold=settings.DEEPL_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.DEEPL_CIRCUIT_RESET_TIMEOUT,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_deepl_client() -> DeepLClient:
+    return DeepLClient(**client_options())
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_deepl_client() -> AsyncDeepLClient | ThreadedDeepLClient:
+    if not settings.DEEPL_ASYNC_HTTP:
+        return ThreadedDeepLClient(get_deepl_client())
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncDeepLClient(**client_options())
+    return client
+
+
+@receiver(setting_changed)
+def _reset_deepl_client(setting, **kwargs):
+    if setting.startswith("DEEPL_"):
+        get_circuit_breaker.cache_clear()
+        get_deepl_client.cache_clear()
+        _async_clients.clear()
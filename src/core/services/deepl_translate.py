@@ -1,43 +1,108 @@
-import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from core.constants import DEEPL_FREE_API_URL, DEEPL_PRO_API_URL
+from core.constants import DEEPL_MAX_TEXTS_PER_REQUEST
+from core.services import translation_cache
+from core.services.deepl_client import DeepLError, get_async_deepl_client, get_deepl_client
+
+NOT_CONFIGURED = {"error": "DeepL API key not configured"}, 500
 
 
 def translate_text(text: str, target_lang_code: str) -> dict:
+    cached = translation_cache.get_translation(text, target_lang_code)
+    if cached is not None:
+        return {"translated_text": cached}, 200
+
     api_key = getattr(settings, 'DEEPL_API_KEY', None)
     if not api_key:
-        return {"error": "DeepL API key not configured"}, 500
+        return NOT_CONFIGURED
+
+    try:
+        translated, = get_deepl_client().translate([text], target_lang_code)
+    except DeepLError as e:
+        return e.as_dict(), e.status_code
+
+    translation_cache.set_translation(text, target_lang_code, translated)
+    return {"translated_text": translated}, 200
+
 
-    api_key = api_key.strip()
-    api_url = DEEPL_FREE_API_URL if api_key.endswith(':fx') else DEEPL_PRO_API_URL
+async def atranslate_text(text: str, target_lang_code: str) -> dict:
+    """
+    Async version of translate_text, calling DeepL without blocking the event loop.
+    """
+    cached = await sync_to_async(translation_cache.get_translation)(text, target_lang_code)
+    if cached is not None:
+        return {"translated_text": cached}, 200
+
+    if not getattr(settings, 'DEEPL_API_KEY', None):
+        return NOT_CONFIGURED
 
     try:
-        response = requests.post(
-            api_url,
-            data={
-                "auth_key": api_key,
-                "text": text,
-                "target_lang": target_lang_code
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
-        )
-
-        if response.status_code == 403:
-            return {
-                "error": "DeepL API authentication failed. Check your API key and endpoint.",
-                "details": response.text
-            }, 403
-
-        if response.status_code == 456:
-            return {"error": "DeepL API quota exceeded"}, 429
-
-        response.raise_for_status()
-        result = response.json()
-
-        if "translations" in result and result["translations"]:
-            return {"translated_text": result["translations"][0]["text"]}, 200
-        else:
-            return {"error": "No translation returned"}, 500
-
-    except requests.exceptions.RequestException as e:
-        return {"error": f"Request failed: {str(e)}"}, 500
+        translated, = await get_async_deepl_client().translate([text], target_lang_code)
+    except DeepLError as e:
+        return e.as_dict(), e.status_code
+
+    await sync_to_async(translation_cache.set_translation)(text, target_lang_code, translated)
+    return {"translated_text": translated}, 200
+
+
+def lookup_segments(segments: list[str], target_lang_code: str) -> tuple[list[str], dict, list[str]]:
+    """
+    Returns the normalized segments, the cached translations and the distinct texts still to translate.
+    """
+    texts = [translation_cache.normalize_text(segment) for segment in segments]
+    translated = translation_cache.get_translations({text for text in texts if text}, target_lang_code)
+    missing = list(dict.fromkeys(text for text in texts if text and text not in translated))
+    return texts, translated, missing
+
+
+def batches(texts: list[str]):
+    for start in range(0, len(texts), DEEPL_MAX_TEXTS_PER_REQUEST):
+        yield texts[start:start + DEEPL_MAX_TEXTS_PER_REQUEST]
+
+
+def translate_segments(segments: list[str], target_lang_code: str) -> tuple:
+    """
+    Translates each segment on its own and returns ({"segments": [...]}, status).
+
+    Segments are cached one by one, so only those missing from the cache are
+    sent to DeepL, batched into as few requests as possible. Blank segments
+    are returned unchanged.
+    """
+    texts, translated, missing = lookup_segments(segments, target_lang_code)
+
+    if missing:
+        if not getattr(settings, 'DEEPL_API_KEY', None):
+            return NOT_CONFIGURED
+
+        client = get_deepl_client()
+        for batch in batches(missing):
+            try:
+                results = dict(zip(batch, client.translate(batch, target_lang_code)))
+            except DeepLError as e:
+                return e.as_dict(), e.status_code
+            translation_cache.set_translations(results, target_lang_code)
+            translated.update(results)
+
+    return {"segments": [translated.get(text, segment) for text, segment in zip(texts, segments)]}, 200
+
+
+async def atranslate_segments(segments: list[str], target_lang_code: str) -> tuple:
+    """
+    Async version of translate_segments.
+    """
+    texts, translated, missing = await sync_to_async(lookup_segments)(segments, target_lang_code)
+
+    if missing:
+        if not getattr(settings, 'DEEPL_API_KEY', None):
+            return NOT_CONFIGURED
+
+        client = get_async_deepl_client()
+        for batch in batches(missing):
+            try:
+                results = dict(zip(batch, await client.translate(batch, target_lang_code)))
+            except DeepLError as e:
+                return e.as_dict(), e.status_code
+            await sync_to_async(translation_cache.set_translations)(results, target_lang_code)
+            translated.update(results)
+
+    return {"segments": [translated.get(text, segment) for text, segment in zip(texts, segments)]}, 200
@@ -0,0 +1,96 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+from core.constants import EXPORT_CHUNK_SIZE
+from core.models import CurriculumVitae
+
+CSV_HEADER = (
+    "id", "first_name", "last_name", "bio", "created_at", "updated_at",
+    "contact_type", "contact_link", "skills", "projects",
+)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def iter_cvs(chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Yields every CV with its relations, holding only one chunk in memory.
+
+    Reads through a server-side cursor, or by id ranges when server-side
+    cursors are disabled for pgbouncer, where iterator() would fetch the whole
+    table at once.
+    """
+    queryset = CurriculumVitae.objects.full().order_by("id")
+    if not connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    last_id = 0
+    while chunk := list(queryset.filter(id__gt=last_id)[:chunk_size]):
+        yield from chunk
+        last_id = chunk[-1].pk
+
+
+def iter_cv_records(chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Yields every CV as a plain dict, with only one chunk (and its prefetched relations) in memory.
+    """
+    for cv in iter_cvs(chunk_size):
+        yield {
+            "id": cv.pk,
+            "first_name": cv.first_name,
+            "last_name": cv.last_name,
+            "bio": cv.bio,
+            "created_at": cv.created_at,
+            "updated_at": cv.updated_at,
+            "contacts": {"type": cv.contacts.type, "contact_link": cv.contacts.contact_link},
+            "skills": [skill.name for skill in cv.skills.all()],
+            "projects": [
+                {"name": project.name, "description": project.description} for project in cv.projects.all()
+            ],
+        }
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer rows can be yielded.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for record in records:
+        yield writer.writerow((
+            record["id"],
+            record["first_name"],
+            record["last_name"],
+            record["bio"],
+            record["created_at"].isoformat(),
+            record["updated_at"].isoformat(),
+            record["contacts"]["type"],
+            record["contacts"]["contact_link"],
+            ";".join(record["skills"]),
+            ";".join(project["name"] for project in record["projects"]),
+        ))
+
+
+def iter_export(export_format: str, chunk_size: int = EXPORT_CHUNK_SIZE):
+    records = iter_cv_records(chunk_size)
+    if export_format == "csv":
+        return iter_csv(records)
+    return iter_ndjson(records)
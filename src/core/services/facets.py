@@ -0,0 +1,51 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count
+
+from core.models import CurriculumVitae, Skill, SkillFacet
+
+
+def refresh_skill_facets(skill_ids=None) -> int:
+    """
+    Recounts the CVs of the given skills, or of every skill, and stores the counts.
+    """
+    skills = Skill.objects.all() if skill_ids is None else Skill.objects.filter(pk__in=list(skill_ids))
+    counts = skills.order_by().annotate(cv_count=Count("curriculum_vitae")).values_list("pk", "cv_count")
+    facets = [SkillFacet(skill_id=skill_id, cv_count=cv_count) for skill_id, cv_count in counts]
+    SkillFacet.objects.bulk_create(
+        facets,
+        update_conflicts=True,
+        unique_fields=["skill"],
+        update_fields=["cv_count", "updated_at"],
+    )
+    return len(facets)
+
+
+def schedule_skill_facet_refresh(skill_ids) -> None:
+    """
+    Recounts the given skills once the current transaction commits, so removed links are already gone.
+    """
+    skill_ids = set(skill_ids)
+    if skill_ids:
+        transaction.on_commit(partial(refresh_skill_facets, skill_ids))
+
+
+def skill_facets(queryset=None) -> list[dict]:
+    """
+    Returns the skills with their number of CVs, most common first.
+
+    Without a queryset the stored counts are read as they are; otherwise the
+    links of the matching CVs are counted in one grouped query.
+    """
+    if queryset is None:
+        rows = SkillFacet.objects.filter(
+            cv_count__gt=0
+        ).order_by("-cv_count", "skill__name").values_list("skill_id", "skill__name", "cv_count")
+    else:
+        rows = CurriculumVitae.skills.through.objects.filter(
+            curriculumvitae_id__in=queryset.order_by().values("pk")
+        ).values("skill_id", "skill__name").annotate(
+            cv_count=Count("curriculumvitae_id")
+        ).order_by("-cv_count", "skill__name").values_list("skill_id", "skill__name", "cv_count")
+    return [{"id": skill_id, "name": name, "count": count} for skill_id, name, count in rows]
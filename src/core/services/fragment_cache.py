@@ -0,0 +1,132 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from base import metrics
+from core.models import CurriculumVitae
+from core.services.cv_translation import apply_translation, get_stored_translation, pretranslation_languages
+
+HITS_METRIC = "fragment_cache.hits"
+MISSES_METRIC = "fragment_cache.misses"
+
+CARD_TEMPLATE = "core/fragments/cv-card.html"
+DETAIL_SECTIONS = {
+    "profile": "core/fragments/cv-profile.html",
+    "skills": "core/fragments/cv-skills.html",
+    "projects": "core/fragments/cv-projects.html",
+}
+
+
+def get_cache():
+    return caches[settings.FRAGMENT_CACHE_ALIAS]
+
+
+def fragment_key(section: str, cv_id: int, version, language: str = "") -> str:
+    return f"fragment:{section}:cv{cv_id}:{language}:{version.timestamp():.6f}"
+
+
+def get_or_render(renderers: dict, prepare=None) -> dict:
+    """
+    Returns the cached value of every key in one round trip, calling the
+    renderer of each missing key and storing the results in a second one.
+
+    prepare() runs once before the first renderer, e.g. to load what only
+    a render needs.
+    """
+    cache = get_cache()
+    found = cache.get_many(renderers)
+    if found:
+        metrics.incr(HITS_METRIC, len(found))
+
+    missing = [key for key in renderers if key not in found]
+    if missing:
+        metrics.incr(MISSES_METRIC, len(missing))
+        if prepare is not None:
+            prepare()
+        rendered = {key: renderers[key]() for key in missing}
+        cache.set_many(rendered, timeout=settings.FRAGMENT_CACHE_TIMEOUT)
+        found.update(rendered)
+    return found
+
+
+def card_fragments(cvs) -> list[SafeString]:
+    """
+    Returns the list card HTML of each CV loaded with CurriculumVitae.objects.cards().
+    """
+    keys = [fragment_key("card", cv.pk, cv.updated_at) for cv in cvs]
+    fragments = get_or_render({
+        key: partial(render_to_string, CARD_TEMPLATE, {"cv": cv}) for key, cv in zip(keys, cvs)
+    })
+    return [mark_safe(fragments[key]) for key in keys]
+
+
+def detail_fragments(cv: CurriculumVitae, language: str = "") -> tuple[dict[str, SafeString], str]:
+    """
+    Returns the detail page sections of the CV, translated into language when an
+    up-to-date translation is stored, and the language actually applied.
+
+    Skills, projects and the translation are only loaded if a section has to be rendered.
+    """
+    state = {"language": ""}
+
+    def prepare():
+        prefetch_related_objects([cv], "skills", "projects")
+        if language:
+            translation = get_stored_translation(cv, language)
+            if translation is not None:
+                apply_translation(cv, translation)
+                state["language"] = language
+
+    def render(template):
+        return state["language"], render_to_string(template, {"cv": cv})
+
+    keys = {section: fragment_key(section, cv.pk, cv.updated_at, language) for section in DETAIL_SECTIONS}
+    fragments = get_or_render(
+        {keys[section]: partial(render, template) for section, template in DETAIL_SECTIONS.items()},
+        prepare=prepare,
+    )
+    applied = {fragments[key][0] for key in keys.values()}
+    sections = {section: mark_safe(fragments[key][1]) for section, key in keys.items()}
+    # Sections cached around a translation update may disagree; report the original then.
+    return sections, applied.pop() if len(applied) == 1 else ""
+
+
+def invalidate(cv_ids, languages=None) -> None:
+    """
+    Drops the cached card and detail sections of the CVs' current versions.
+
+    Older versions are never looked up again and expire on their own.
+    """
+    languages = [""] + pretranslation_languages() if languages is None else languages
+    keys = []
+    for cv_id, version in CurriculumVitae.objects.filter(pk__in=list(cv_ids)).values_list("pk", "updated_at"):
+        keys.append(fragment_key("card", cv_id, version))
+        keys.extend(
+            fragment_key(section, cv_id, version, language) for section in DETAIL_SECTIONS for language in languages
+        )
+    if keys:
+        get_cache().delete_many(keys)
+
+
+def schedule_invalidation(cv_ids, languages=None) -> None:
+    """
+    Invalidates once the current transaction commits, after the stored cards are rebuilt.
+    """
+    cv_ids = list(cv_ids)
+    if cv_ids:
+        transaction.on_commit(partial(invalidate, cv_ids, languages))
+
+
+def stats() -> dict:
+    counters = metrics.get_many(HITS_METRIC, MISSES_METRIC)
+    hits, misses = counters[HITS_METRIC], counters[MISSES_METRIC]
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / (hits + misses) if hits + misses else None,
+    }
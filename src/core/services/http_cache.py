@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from core.models import CurriculumVitae, CurriculumVitaeTranslation
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: datetime
+
+
+def cv_validators(cv_id: int, language: str = "") -> Validators | None:
+    """
+    Versions a CV page in one query: the CV's updated_at, which relation changes
+    also bump, and the stored translation's updated_at when a language is given.
+
+    Returns None if the CV does not exist.
+    """
+    queryset = CurriculumVitae.objects.filter(pk=cv_id)
+    if language:
+        translations = CurriculumVitaeTranslation.objects.filter(curriculum_vitae=OuterRef("pk"), language=language)
+        queryset = queryset.annotate(translated_at=Subquery(translations.values("updated_at")[:1]))
+    row = queryset.values("updated_at", *(["translated_at"] if language else [])).first()
+    if row is None:
+        return None
+
+    last_modified = max(filter(None, row.values()))
+    return Validators(f"cv-{cv_id}-{last_modified.timestamp():.6f}-{language}", last_modified)
+
+
+def list_validators() -> Validators | None:
+    """
+    Versions CV lists by the number of CVs and the latest updated_at, so deletes change it too.
+    """
+    row = CurriculumVitae.objects.aggregate(count=Count("pk"), last_modified=Max("updated_at"))
+    if row["last_modified"] is None:
+        return None
+    return Validators(f"cvs-{row['count']}-{row['last_modified'].timestamp():.6f}", row["last_modified"])
+
+
+def viewer_validators(request, validators: Validators | None) -> Validators | None:
+    """
+    Marks the version with what the page shows per visitor, or drops it while
+    flash messages are pending, since those are rendered only once.
+    """
+    if validators is None or len(get_messages(request)):
+        return None
+    if request.user.is_authenticated:
+        return validators._replace(etag=f"{validators.etag}-u{request.user.pk}")
+    return validators
+
+
+def not_modified(request, validators: Validators | None) -> HttpResponse | None:
+    """
+    Returns a 304 (or 412) response when the client already holds this version.
+    """
+    if validators is None:
+        return None
+    response = get_conditional_response(
+        request,
+        etag=quote_etag(validators.etag),
+        last_modified=int(validators.last_modified.timestamp()),
+    )
+    if response is not None:
+        add_cache_headers(request, response, validators)
+    return response
+
+
+def add_cache_headers(request, response: HttpResponse, validators: Validators | None) -> HttpResponse:
+    """
+    Sets ETag, Last-Modified and a Cache-Control that lets shared caches keep anonymous pages only.
+    """
+    if validators is None:
+        return response
+    response.headers.setdefault("ETag", quote_etag(validators.etag))
+    response.headers.setdefault("Last-Modified", http_date(validators.last_modified.timestamp()))
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.HTTP_CACHE_MAX_AGE, must_revalidate=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
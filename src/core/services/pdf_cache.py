@@ -0,0 +1,323 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from base import metrics
+from core.services.pdf_engine import get_pdf_engine
+
+logger = logging.getLogger(__name__)
+
+HITS_METRIC = "pdf_cache.hits"
+MISSES_METRIC = "pdf_cache.misses"
+
+
+def cv_fingerprint(cv, template_path: str, language: str = "") -> str:
+    """
+    Builds a content fingerprint for a CV rendered with the given template.
+
+    The fingerprint changes whenever the CV, its contact, any linked skill or
+    project is updated, or a skill/project is linked or unlinked. A language
+    marks a PDF rendered from a stored translation.
+    """
+    parts = [template_path, f"cv:{cv.pk}:{cv.updated_at.isoformat()}"]
+    if language:
+        parts.append(f"lang:{language}")
+
+    contact = cv.contacts
+    if contact is not None:
+        parts.append(f"contact:{contact.pk}:{contact.updated_at.isoformat()}")
+
+    for label, related in (("skill", cv.skills.all()), ("project", cv.projects.all())):
+        for obj in sorted(related, key=lambda item: item.pk):
+            parts.append(f"{label}:{obj.pk}:{obj.updated_at.isoformat()}")
+
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class BasePDFCacheBackend:
+    """
+    Storage interface for cached PDF documents.
+    """
+
+    def __init__(self, location: str, max_size: int):
+        self.location = location
+        self.max_size = max_size
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def delete_prefixes(self, prefixes: tuple[str, ...]) -> None:
+        """
+        Deletes every entry whose key starts with one of the prefixes, in a single pass.
+        """
+        raise NotImplementedError
+
+    def usage(self) -> dict:
+        """
+        Returns the number of stored entries and their total size in bytes.
+        """
+        raise NotImplementedError
+
+
+class DummyPDFCacheBackend(BasePDFCacheBackend):
+    """
+    Stores nothing, so every lookup is a miss.
+    """
+
+    def get(self, key):
+        return None
+
+    def set(self, key, data):
+        pass
+
+    def delete_prefixes(self, prefixes):
+        pass
+
+    def usage(self):
+        return {"entries": 0, "size": 0}
+
+
+class FileSystemPDFCacheBackend(BasePDFCacheBackend):
+    """
+    Stores each PDF as a file; the file mtime is used as the LRU clock.
+    """
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.location, f"{key}.pdf")
+
+    def _entries(self) -> list[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self.location) if entry.name.endswith(".pdf")]
+        except FileNotFoundError:
+            return []
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def set(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.location, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("Could not write PDF cache entry %s", path, exc_info=True)
+            return
+        self._evict()
+
+    def delete_prefixes(self, prefixes):
+        for entry in self._entries():
+            if entry.name.startswith(prefixes):
+                self._remove(entry.path)
+
+    def usage(self):
+        entries = self._entries()
+        return {"entries": len(entries), "size": sum(self._stat(entry)[1] for entry in entries)}
+
+    def _evict(self):
+        entries = sorted((self._stat(entry) + (entry.path,) for entry in self._entries()))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _stat(entry: os.DirEntry) -> tuple[float, int]:
+        try:
+            stat = entry.stat()
+        except OSError:
+            return 0.0, 0
+        return stat.st_mtime, stat.st_size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class RedisPDFCacheBackend(BasePDFCacheBackend):
+    """
+    Stores PDFs in Redis with a sorted set of last-access times for LRU eviction.
+    """
+
+    key_prefix = "pdf_cache"
+
+    def __init__(self, location, max_size):
+        super().__init__(location, max_size)
+        from base.redis_pool import get_redis
+
+        self.client = get_redis(location)
+        self.lru_key = f"{self.key_prefix}:lru"
+        self.sizes_key = f"{self.key_prefix}:sizes"
+
+    def _data_key(self, key: str) -> str:
+        return f"{self.key_prefix}:data:{key}"
+
+    def get(self, key):
+        data = self.client.get(self._data_key(key))
+        if data is None:
+            return None
+        self.client.zadd(self.lru_key, {key: time.time()})
+        return data
+
+    def set(self, key, data):
+        pipe = self.client.pipeline()
+        pipe.set(self._data_key(key), data)
+        pipe.zadd(self.lru_key, {key: time.time()})
+        pipe.hset(self.sizes_key, key, len(data))
+        pipe.execute()
+        self._evict()
+
+    def delete_prefixes(self, prefixes):
+        keys = [
+            key for key, _ in self.client.zscan_iter(self.lru_key)
+            if (key.decode() if isinstance(key, bytes) else key).startswith(prefixes)
+        ]
+        if keys:
+            self._delete(keys)
+
+    def usage(self):
+        sizes = self.client.hvals(self.sizes_key)
+        return {"entries": len(sizes), "size": sum(int(size) for size in sizes)}
+
+    def _evict(self):
+        total = self.usage()["size"]
+        while total > self.max_size:
+            oldest = self.client.zrange(self.lru_key, 0, 0)
+            if not oldest:
+                break
+            size = self.client.hget(self.sizes_key, oldest[0])
+            self._delete(oldest)
+            total -= int(size or 0)
+
+    def _delete(self, keys: list):
+        pipe = self.client.pipeline()
+        pipe.delete(*(self._data_key(key.decode() if isinstance(key, bytes) else key) for key in keys))
+        pipe.zrem(self.lru_key, *keys)
+        pipe.hdel(self.sizes_key, *keys)
+        pipe.execute()
+
+
+PDF_CACHE_BACKENDS = {
+    "dummy": DummyPDFCacheBackend,
+    "filesystem": FileSystemPDFCacheBackend,
+    "redis": RedisPDFCacheBackend,
+}
+
+
+class PDFCache:
+    """
+    Serves rendered CV PDFs from a content-addressed cache, rendering on a miss.
+    """
+
+    def __init__(self, backend: BasePDFCacheBackend):
+        self.backend = backend
+
+    @staticmethod
+    def key_for(cv, template_path: str, language: str = "") -> str:
+        return f"cv{cv.pk}-{cv_fingerprint(cv, template_path, language)}"
+
+    def get(self, key: str) -> bytes | None:
+        pdf = self.backend.get(key)
+        metrics.incr(HITS_METRIC if pdf is not None else MISSES_METRIC)
+        return pdf
+
+    def render(self, cv, template_path: str, key: str = None, language: str = "") -> bytes | None:
+        """
+        Renders the CV and stores the result, skipping the cache lookup.
+        """
+        pdf = get_pdf_engine().render(template_path, {"cv": cv})
+        if pdf is not None:
+            self.backend.set(key or self.key_for(cv, template_path, language), pdf)
+        return pdf
+
+    def get_or_render(self, cv, template_path: str, language: str = "") -> bytes | None:
+        key = self.key_for(cv, template_path, language)
+        pdf = self.get(key)
+        if pdf is None:
+            pdf = self.render(cv, template_path, key)
+        return pdf
+
+    async def aget_or_render(self, cv, template_path: str, language: str = "") -> bytes | None:
+        """
+        Runs get_or_render in the bounded render pool so the event loop keeps serving other requests.
+
+        The CV must have its contact, skills and projects loaded, as no queries can run in the pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_render_executor(), partial(self.get_or_render, cv, template_path, language)
+        )
+
+    def invalidate(self, cv_ids) -> None:
+        """
+        Drops every cached PDF of the given CVs, whatever template it used.
+
+        Keys are content-addressed, so stale PDFs are never served; this only frees their space early.
+        """
+        prefixes = tuple(f"cv{cv_id}-" for cv_id in cv_ids)
+        if prefixes:
+            self.backend.delete_prefixes(prefixes)
+
+    def stats(self) -> dict:
+        counters = metrics.get_many(HITS_METRIC, MISSES_METRIC)
+        return {
+            "hits": counters[HITS_METRIC],
+            "misses": counters[MISSES_METRIC],
+            **self.backend.usage(),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_pdf_cache() -> PDFCache:
+    backend = settings.PDF_CACHE_BACKEND
+    backend_class = PDF_CACHE_BACKENDS.get(backend) or import_string(backend)
+    return PDFCache(backend_class(settings.PDF_CACHE_LOCATION, settings.PDF_CACHE_MAX_SIZE))
+
+
+def schedule_invalidation(cv_ids) -> None:
+    """
+    Invalidates the CVs' PDFs once the current transaction commits, with one scan of the cache.
+    """
+    cv_ids = list(cv_ids)
+    if cv_ids:
+        transaction.on_commit(lambda: get_pdf_cache().invalidate(cv_ids))
+
+
+@lru_cache(maxsize=None)
+def get_render_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.PDF_RENDER_THREADS, thread_name_prefix="pdf-render")
+
+
+@receiver(setting_changed)
+def _reset_pdf_cache(setting, **kwargs):
+    if setting.startswith("PDF_CACHE_"):
+        get_pdf_cache.cache_clear()
+    if setting == "PDF_RENDER_THREADS":
+        get_render_executor.cache_clear()
@@ -0,0 +1,149 @@
+import logging
+import smtplib
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from core.constants import CV_EMAIL_PDF_TEMPLATE
+from core.models import CurriculumVitae, PDFEmailBatch, PDFEmailDelivery
+from core.services.pdf_cache import get_pdf_cache
+
+logger = logging.getLogger(__name__)
+
+# Delivery status updates are written in batches of this size.
+STATUS_BATCH_SIZE = 100
+
+
+class SMTPUnavailable(Exception):
+    """
+    The SMTP server could not be reached; the batch's pending deliveries are left for a retry.
+    """
+
+
+class RateLimiter:
+    """
+    Spaces calls to wait() at least 1 / rate seconds apart; a rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = time.monotonic()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+
+
+def render_attachments(batch: PDFEmailBatch) -> tuple[list[tuple[str, bytes, str]], list[int]]:
+    """
+    Renders each CV of the batch once, through the PDF cache.
+
+    Returns the attachments and the ids of the CVs that could not be rendered.
+    """
+    cvs = CurriculumVitae.objects.full().filter(pdf_email_batches=batch).order_by("pk")
+
+    pdf_cache = get_pdf_cache()
+    attachments = []
+    missing = []
+    for cv in cvs:
+        pdf = pdf_cache.get_or_render(cv, CV_EMAIL_PDF_TEMPLATE)
+        if pdf is None:
+            logger.warning("Could not render the PDF of CV %s for email batch %s", cv.pk, batch.pk)
+            missing.append(cv.pk)
+            continue
+        attachments.append((f"CV_{cv.first_name}_{cv.last_name}.pdf", pdf, "application/pdf"))
+    return attachments, missing
+
+
+def send_batch(batch: PDFEmailBatch, final_attempt: bool = True) -> None:
+    """
+    Sends the batch's pending deliveries over one SMTP connection, at most PDF_EMAIL_RATE_LIMIT per second.
+
+    Each recipient's outcome is stored on its delivery, so a retried batch
+    only emails the recipients still pending; CVs that could not be rendered
+    are listed in the error of the deliveries sent without them. A message cut
+    off by the server closing the connection is sent once more after
+    reconnecting. When the SMTP server cannot be reached, the batch is set back
+    to pending and SMTPUnavailable is raised, or on the final attempt the
+    remaining deliveries are marked failed.
+    """
+    PDFEmailBatch.objects.filter(pk=batch.pk).update(status=PDFEmailBatch.Status.SENDING, updated_at=timezone.now())
+    deliveries = list(batch.deliveries.filter(status=PDFEmailDelivery.Status.PENDING).order_by("pk"))
+    attachments, missing = render_attachments(batch) if deliveries else ([], [])
+    missing_note = f"Sent without the PDFs of CVs {', '.join(map(str, missing))}" if missing else ""
+
+    updated = []
+
+    def record(delivery, status, error=""):
+        delivery.status = status
+        delivery.error = error
+        delivery.updated_at = timezone.now()
+        delivery.sent_at = delivery.updated_at if status == PDFEmailDelivery.Status.SENT else None
+        updated.append(delivery)
+        if len(updated) >= STATUS_BATCH_SIZE:
+            flush()
+
+    def flush():
+        PDFEmailDelivery.objects.bulk_update(updated, ["status", "error", "sent_at", "updated_at"])
+        updated.clear()
+
+    if deliveries and not attachments:
+        for delivery in deliveries:
+            record(delivery, PDFEmailDelivery.Status.FAILED, "PDF generation failed")
+        deliveries = []
+
+    limiter = RateLimiter(settings.PDF_EMAIL_RATE_LIMIT)
+    connection = get_connection()
+    remaining = deque(deliveries)
+    resent = set()
+    try:
+        connection.open()
+        while remaining:
+            delivery = remaining.popleft()
+            message = EmailMessage(
+                subject="CV PDF",
+                body="Please find the CVs attached." if len(attachments) > 1 else "Please find your CV attached.",
+                to=[delivery.email],
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                attachments=attachments,
+                connection=connection,
+            )
+            limiter.wait()
+            try:
+                connection.send_messages([message])
+            except smtplib.SMTPServerDisconnected as e:
+                # Nothing reached the recipient: reconnect and send it once more.
+                if delivery.pk in resent:
+                    record(delivery, PDFEmailDelivery.Status.FAILED, str(e))
+                else:
+                    resent.add(delivery.pk)
+                    remaining.appendleft(delivery)
+                connection.close()
+                connection.open()
+            except (smtplib.SMTPException, OSError) as e:
+                record(delivery, PDFEmailDelivery.Status.FAILED, str(e))
+            else:
+                record(delivery, PDFEmailDelivery.Status.SENT, missing_note)
+    except (smtplib.SMTPException, OSError) as e:
+        # Opening or reopening the connection failed; send errors are recorded per delivery above.
+        if not final_attempt:
+            PDFEmailBatch.objects.filter(pk=batch.pk).update(
+                status=PDFEmailBatch.Status.PENDING, updated_at=timezone.now()
+            )
+            raise SMTPUnavailable(str(e)) from e
+        logger.warning("Could not connect to the SMTP server for email batch %s: %s", batch.pk, e)
+        for delivery in remaining:
+            record(delivery, PDFEmailDelivery.Status.FAILED, f"SMTP server unavailable: {e}")
+    finally:
+        connection.close()
+        # Outcomes recorded before an unexpected error are kept; the rest stay pending for a retry.
+        flush()
+
+    PDFEmailBatch.objects.filter(pk=batch.pk).update(status=PDFEmailBatch.Status.DONE, updated_at=timezone.now())
@@ -0,0 +1,143 @@
+import atexit
+import logging
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from core.constants import PDF_TEMPLATES
+from core.utils import PDFRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class PDFRenderTimeout(Exception):
+    pass
+
+
+@contextmanager
+def job_timeout(seconds: float):
+    """
+    Interrupts the block after the given seconds; only effective in a process's main thread.
+    """
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _timeout(signum, frame):
+        raise PDFRenderTimeout(f"PDF render exceeded {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, _timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def render_job(template_path: str, context: dict, timeout: float = None) -> bytes | None:
+    with job_timeout(timeout):
+        return PDFRenderer(template_path, context).render()
+
+
+def warm_worker(template_paths) -> None:
+    """
+    Pool initializer: sets Django up and loads templates, xhtml2pdf and its fonts once per worker.
+    """
+    import django
+    from django.template.loader import get_template
+    from xhtml2pdf import pisa
+
+    django.setup()
+    for template_path in template_paths:
+        get_template(template_path)
+    pisa.CreatePDF("<p>warm-up</p>", dest=BytesIO())
+
+
+class PDFEngine:
+    """
+    Renders (template, context) jobs to PDF in a pool of warm worker processes.
+
+    xhtml2pdf is CPU-bound pure Python, so separate processes let renders use
+    every core instead of queueing on the GIL. Workers are recycled after
+    max_tasks_per_child jobs to cap memory growth, and a job running longer
+    than timeout seconds is interrupted. With workers=0, or in a daemonic
+    process such as a Celery prefork worker, which may not start children of
+    its own, jobs render inline.
+
+    Context values are pickled to reach the workers, so CVs must be sent with
+    their contact, skills and projects already loaded.
+    """
+
+    def __init__(self, workers: int, timeout: float, max_tasks_per_child: int, warm_templates=()):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.warm_templates = tuple(warm_templates)
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Forking a threaded web or Celery process is unsafe, and recycling needs spawn anyway.
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=warm_worker,
+                    initargs=(self.warm_templates,),
+                    max_tasks_per_child=self.max_tasks_per_child or None,
+                )
+            return self.executor
+
+    def render(self, template_path: str, context: dict) -> bytes | None:
+        """
+        Renders the template to PDF bytes, returning None when rendering fails or times out.
+        """
+        try:
+            if not self.workers or multiprocessing.current_process().daemon:
+                return render_job(template_path, context, self.timeout)
+            future = self.get_executor().submit(render_job, template_path, context, self.timeout)
+            # The worker interrupts itself at the timeout; the margin covers a cold start.
+            return future.result(timeout=self.timeout + 30 if self.timeout else None)
+        except BrokenProcessPool:
+            logger.exception("PDF worker died rendering %s, restarting the pool", template_path)
+            self.shutdown()
+        except (PDFRenderTimeout, FutureTimeoutError):
+            logger.warning("PDF render of %s timed out after %ss", template_path, self.timeout)
+        return None
+
+    def shutdown(self) -> None:
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=None)
+def get_pdf_engine() -> PDFEngine:
+    engine = PDFEngine(
+        workers=settings.PDF_ENGINE_WORKERS,
+        timeout=settings.PDF_ENGINE_TIMEOUT,
+        max_tasks_per_child=settings.PDF_ENGINE_MAX_TASKS_PER_CHILD,
+        warm_templates=PDF_TEMPLATES,
+    )
+    atexit.register(engine.shutdown)
+    return engine
+
+
+@receiver(setting_changed)
+def _reset_pdf_engine(setting, **kwargs):
+    if setting.startswith("PDF_ENGINE_"):
+        if get_pdf_engine.cache_info().currsize:
+            get_pdf_engine().shutdown()
+        get_pdf_engine.cache_clear()
@@ -0,0 +1,68 @@
+from functools import partial
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce
+
+from core.constants import SEARCH_CONFIG
+from core.models import CurriculumVitae, Project, Skill
+
+
+def related_text(model, field: str):
+    """
+    Subquery joining the given field of every object linked to the outer CV.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                curriculum_vitae=OuterRef("pk")
+            ).order_by().values("curriculum_vitae").annotate(
+                text=StringAgg(field, delimiter=" ")
+            ).values("text")
+        ),
+        Value(""),
+        output_field=TextField(),
+    )
+
+
+def search_vector():
+    """
+    Names weigh most, then skills, the bio and project descriptions.
+    """
+    return (
+        SearchVector("first_name", "last_name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(related_text(Skill, "name"), weight="B", config=SEARCH_CONFIG)
+        + SearchVector("bio", weight="C", config=SEARCH_CONFIG)
+        + SearchVector(related_text(Project, "description"), weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(cv_ids) -> int:
+    """
+    Recomputes the search vectors of the given CVs in one UPDATE, without touching updated_at or signals.
+    """
+    return CurriculumVitae.objects.filter(pk__in=list(cv_ids)).update(search_vector=search_vector())
+
+
+def schedule_search_vector_update(cv_ids) -> None:
+    """
+    Updates the vectors once the current transaction commits, so deleted links are already gone.
+    """
+    cv_ids = list(cv_ids)
+    if cv_ids:
+        transaction.on_commit(partial(update_search_vectors, cv_ids))
+
+
+def search_cvs(queryset, q: str):
+    """
+    Filters the CVs matching a web-search style query and orders them by rank, best first.
+    """
+    query = SearchQuery(q, search_type="websearch", config=SEARCH_CONFIG)
+    # SearchRank is a float4; as float8 it round-trips exactly through pagination cursors.
+    return queryset.filter(
+        search_vector=query
+    ).annotate(
+        rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+    ).order_by("-rank", "-id")
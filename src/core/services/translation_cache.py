@@ -0,0 +1,66 @@
+import hashlib
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import caches
+
+from base import metrics
+
+HITS_METRIC = "translation_cache.hits"
+MISSES_METRIC = "translation_cache.misses"
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text.replace("\r\n", "\n")).strip()
+
+
+def cache_key(text: str, target_lang: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"translation:{target_lang.upper()}:{digest}"
+
+
+def get_cache():
+    return caches[settings.TRANSLATION_CACHE_ALIAS]
+
+
+def get_translation(text: str, target_lang: str) -> str | None:
+    """
+    Returns the cached translation of text, recording a hit or a miss.
+    """
+    translated = get_cache().get(cache_key(text, target_lang))
+    metrics.incr(HITS_METRIC if translated is not None else MISSES_METRIC)
+    return translated
+
+
+def set_translation(text: str, target_lang: str, translated: str) -> None:
+    get_cache().set(cache_key(text, target_lang), translated, timeout=settings.TRANSLATION_CACHE_TIMEOUT)
+
+
+def get_translations(texts, target_lang: str) -> dict[str, str]:
+    """
+    Returns {text: translation} for the cached texts, fetched in one round trip.
+    """
+    keys = {cache_key(text, target_lang): text for text in texts}
+    found = get_cache().get_many(keys)
+    if found:
+        metrics.incr(HITS_METRIC, len(found))
+    if len(keys) > len(found):
+        metrics.incr(MISSES_METRIC, len(keys) - len(found))
+    return {keys[key]: translated for key, translated in found.items()}
+
+
+def set_translations(translations: dict[str, str], target_lang: str) -> None:
+    get_cache().set_many(
+        {cache_key(text, target_lang): translated for text, translated in translations.items()},
+        timeout=settings.TRANSLATION_CACHE_TIMEOUT,
+    )
+
+
+def stats() -> dict:
+    counters = metrics.get_many(HITS_METRIC, MISSES_METRIC)
+    hits, misses = counters[HITS_METRIC], counters[MISSES_METRIC]
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / (hits + misses) if hits + misses else None,
+    }
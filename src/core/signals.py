@@ -0,0 +1,84 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Contact, CurriculumVitae, CurriculumVitaeTranslation, Project, Skill
+from core.services import fragment_cache, pdf_cache
+from core.services.cv_card import schedule_card_refresh
+from core.services.facets import schedule_skill_facet_refresh
+from core.services.search import schedule_search_vector_update
+from core.tasks import schedule_pretranslation
+
+
+def relations_changed(cv_ids) -> None:
+    """
+    Bumps updated_at of CVs whose contact, skills or projects changed, so it versions the whole CV.
+    """
+    cv_ids = list(cv_ids)
+    CurriculumVitae.objects.filter(pk__in=cv_ids).update(updated_at=timezone.now())
+    cvs_changed(cv_ids)
+
+
+def cvs_changed(cv_ids) -> None:
+    """
+    Drops the cached PDFs and HTML fragments of the CVs and refreshes their cards,
+    search vectors and stored translations.
+    """
+    cv_ids = list(cv_ids)
+    pdf_cache.schedule_invalidation(cv_ids)
+    schedule_card_refresh(cv_ids)
+    fragment_cache.schedule_invalidation(cv_ids)
+    schedule_search_vector_update(cv_ids)
+    schedule_pretranslation(cv_ids)
+
+
+@receiver(post_save, sender=CurriculumVitae)
+def curriculum_vitae_saved(sender, instance, **kwargs):
+    cvs_changed([instance.pk])
+
+
+@receiver(pre_delete, sender=CurriculumVitae)
+def curriculum_vitae_deleting(sender, instance, **kwargs):
+    # The cascade to the M2M table sends no m2m_changed.
+    schedule_skill_facet_refresh(instance.skills.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=CurriculumVitae)
+def curriculum_vitae_deleted(sender, instance, **kwargs):
+    pdf_cache.schedule_invalidation([instance.pk])
+
+
+@receiver(post_save, sender=CurriculumVitaeTranslation)
+def translation_saved(sender, instance, **kwargs):
+    fragment_cache.schedule_invalidation([instance.curriculum_vitae_id], [instance.language])
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=Project)
+@receiver(pre_delete, sender=Skill)
+@receiver(pre_delete, sender=Project)
+def related_object_changed(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    relations_changed(instance.curriculum_vitae.values_list("pk", flat=True))
+
+
+@receiver(m2m_changed, sender=CurriculumVitae.skills.through)
+@receiver(m2m_changed, sender=CurriculumVitae.projects.through)
+def curriculum_vitae_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        relations_changed(pk_set if reverse else [instance.pk])
+    elif action == "post_clear" and not reverse:
+        relations_changed([instance.pk])
+    elif action == "pre_clear" and reverse:
+        # Clearing from the Skill/Project side does not report the affected CVs.
+        relations_changed(instance.curriculum_vitae.values_list("pk", flat=True))
+
+
+@receiver(m2m_changed, sender=CurriculumVitae.skills.through)
+def curriculum_vitae_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        schedule_skill_facet_refresh([instance.pk] if reverse else pk_set)
+    elif action == "pre_clear":
+        schedule_skill_facet_refresh([instance.pk] if reverse else instance.skills.values_list("pk", flat=True))
@@ -1,17 +1,27 @@
+from functools import partial
+
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import EmailMessage
-from core.models import CurriculumVitae
+from django.db import transaction
+from core.constants import CV_EMAIL_PDF_TEMPLATE
+from core.models import CurriculumVitae, PDFEmailBatch, PDFRenderJob
 
-from core.utils import PDFRenderer
+from core.services.cv_translation import (
+    apply_translation,
+    get_stored_translation,
+    pretranslation_languages,
+    store_translation,
+)
+from core.services.pdf_cache import get_pdf_cache
+from core.services.pdf_email import SMTPUnavailable, send_batch
 
 
 @shared_task
 def send_cv_pdf_email(email, cv_id):
-    cv = CurriculumVitae.objects.get(id=cv_id)
+    cv = CurriculumVitae.objects.full().get(id=cv_id)
 
-    pdf_renderer = PDFRenderer("core/curriculum-vitae-detail-pdf.html", {"cv": cv})
-    pdf_bytes = pdf_renderer.render()
+    pdf_bytes = get_pdf_cache().get_or_render(cv, CV_EMAIL_PDF_TEMPLATE)
 
     if pdf_bytes is None:
         return
@@ -25,3 +35,72 @@ def send_cv_pdf_email(email, cv_id):
 
     email_message.attach('cv.pdf', pdf_bytes, 'application/pdf')
     email_message.send()
+
+
+@shared_task(bind=True)
+def send_cv_pdf_batch(self, batch_id):
+    """
+    Emails the CVs of a PDFEmailBatch to its recipients, rendering each CV once.
+
+    Retried with a growing delay while the SMTP server cannot be reached.
+    """
+    batch = PDFEmailBatch.objects.filter(pk=batch_id).first()
+    if batch is None:
+        return
+
+    retries = self.request.retries
+    try:
+        send_batch(batch, final_attempt=retries >= settings.PDF_EMAIL_MAX_RETRIES)
+    except SMTPUnavailable as e:
+        raise self.retry(
+            exc=e, countdown=settings.PDF_EMAIL_RETRY_DELAY * 2 ** retries, max_retries=settings.PDF_EMAIL_MAX_RETRIES
+        )
+
+
+@shared_task
+def render_cv_pdf(job_id):
+    """
+    Renders the PDF of a queued PDFRenderJob into the PDF cache.
+    """
+    job = PDFRenderJob.objects.get(id=job_id)
+    cv = CurriculumVitae.objects.full().get(pk=job.curriculum_vitae_id)
+
+    if job.language:
+        translation = get_stored_translation(cv, job.language)
+        if translation is not None:
+            apply_translation(cv, translation)
+
+    pdf_cache = get_pdf_cache()
+    if pdf_cache.key_for(cv, job.template_path, job.language) != job.cache_key:
+        job.status = PDFRenderJob.Status.FAILED
+        job.error = "The CV changed before it was rendered, request the PDF again."
+    elif pdf_cache.render(cv, job.template_path, job.cache_key) is None:
+        job.status = PDFRenderJob.Status.FAILED
+        job.error = "PDF generation failed"
+    else:
+        job.status = PDFRenderJob.Status.READY
+        job.error = ""
+    job.save(update_fields=["status", "error", "updated_at"])
+
+
+@shared_task
+def pretranslate_cv(cv_id, languages=None):
+    """
+    Stores translations of a CV into every pre-translation language that lacks an up-to-date one.
+    """
+    cv = CurriculumVitae.objects.full().filter(pk=cv_id).first()
+    if cv is None:
+        return
+
+    for language in languages or pretranslation_languages():
+        store_translation(cv, language)
+
+
+def schedule_pretranslation(cv_ids) -> None:
+    """
+    Queues pretranslate_cv for each CV once the current transaction commits.
+    """
+    if not settings.CV_PRETRANSLATE:
+        return
+    for cv_id in cv_ids:
+        transaction.on_commit(partial(pretranslate_cv.delay, cv_id))
@@ -0,0 +1,97 @@
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+from urllib.parse import parse_qs
+
+from django.test import override_settings
+
+
+class FakeDeepLServer:
+    """
+    A local HTTP server speaking the DeepL /v2/translate protocol.
+
+    Texts are "translated" to "<TARGET_LANG>:<text>". Queue responses with
+    enqueue() to simulate errors, rate limits or slow answers.
+    """
+
+    def __init__(self):
+        self.responses = deque()
+        self.requests = []
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/v2/translate"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def enqueue(self, status: int, body=None, headers: dict = None, delay: float = 0) -> None:
+        self.responses.append((status, body, headers or {}, delay))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                server.requests.append({"headers": dict(self.headers), "form": form})
+
+                if server.responses:
+                    status, body, headers, delay = server.responses.popleft()
+                    sleep(delay)
+                else:
+                    status, headers = 200, {}
+                    target = form.get("target_lang", [""])[0]
+                    body = {
+                        "translations": [
+                            {"detected_source_language": "EN", "text": f"{target}:{text}"}
+                            for text in form.get("text", [])
+                        ]
+                    }
+
+                payload = json.dumps(body).encode() if body is not None else b""
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting, e.g. after a read timeout.
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class FakeDeepLMixin:
+    """
+    Runs a FakeDeepLServer for each test and points the DeepL settings at it.
+
+    deepl_settings overrides further settings for the duration of the test.
+    """
+
+    deepl_settings = {}
+
+    def setUp(self):
+        super().setUp()
+        self.server = FakeDeepLServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        settings_override = override_settings(
+            DEEPL_API_KEY="test:fx", DEEPL_API_URL=self.server.url, **self.deepl_settings
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
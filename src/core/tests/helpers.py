@@ -0,0 +1,20 @@
+from unittest import mock
+
+from core.models import Contact, CurriculumVitae
+
+
+def create_cv(first_name: str, bio: str = "Developer", skills=(), projects=()) -> CurriculumVitae:
+    contact = Contact.objects.create(type="email", contact_link=f"{first_name.lower()}@example.com")
+    cv = CurriculumVitae.objects.create(first_name=first_name, last_name="Doe", bio=bio, contacts=contact)
+    cv.skills.set(skills)
+    cv.projects.set(projects)
+    return cv
+
+
+def patch_pdf_render(test_case, **kwargs) -> mock.Mock:
+    """
+    Replaces the PDF renderer for the rest of the test; it returns a stub PDF unless told otherwise.
+    """
+    patcher = mock.patch("core.services.pdf_engine.PDFRenderer.render", **{"return_value": b"%PDF-1.4", **kwargs})
+    test_case.addCleanup(patcher.stop)
+    return patcher.start()
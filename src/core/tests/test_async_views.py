@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Contact, CurriculumVitae, Skill
+from core.services.deepl_client import AsyncDeepLClient, get_async_deepl_client
+from core.tests.fake_deepl import FakeDeepLMixin
+
+
+class AsyncViewsTestCase(FakeDeepLMixin, TestCase):
+    deepl_settings = {"DEEPL_MAX_RETRIES": 0}
+
+    def setUp(self):
+        super().setUp()
+        caches["translations"].clear()
+
+        self.cv = CurriculumVitae.objects.create(
+            first_name="John",
+            last_name="Doe",
+            bio="Python developer",
+            contacts=Contact.objects.create(type="email", contact_link="test@example.com"),
+        )
+        self.cv.skills.add(Skill.objects.create(name="Python"))
+        self.translate_url = reverse("translate_curriculum_vita", kwargs={"curriculum_id": self.cv.pk})
+        self.pdf_url = reverse("curriculum_vita_pdf", kwargs={"curriculum_id": self.cv.pk})
+
+    async def test_translate_view_is_async(self):
+        """Tests that the translate view translates CV segments through the async client."""
+        response = await self.async_client.post(
+            self.translate_url, {"target_language_code": "br"}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["bio"], "FR:Python developer")
+        self.assertEqual(response.json()["skills"][0]["name"], "FR:Python")
+
+    @override_settings(DEEPL_ASYNC_HTTP=True)
+    async def test_slow_translations_do_not_block_each_other(self):
+        """Tests that concurrent CV translations wait on DeepL together through the async HTTP client."""
+        # One translation per segment of the CV: its bio and its skill.
+        for _ in range(3):
+            self.server.enqueue(200, {"translations": [{"text": "BR:Python developer"}, {"text": "BR:Python"}]}, delay=0.5)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        responses = await asyncio.gather(*(
+            self.async_client.post(self.translate_url, {"target_language_code": "br"}, content_type="application/json")
+            for _ in range(3)
+        ))
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200])
+        self.assertEqual(responses[0].json()["bio"], "BR:Python developer")
+        self.assertEqual([len(request["form"]["text"]) for request in self.server.requests], [2, 2, 2])
+        self.assertLess(loop.time() - started, 1.2)
+        self.assertIsInstance(get_async_deepl_client(), AsyncDeepLClient)
+
+    async def test_pdf_rendered_in_pool(self):
+        """Tests that the async PDF view renders outside the event loop thread."""
+        threads = []
+
+        def render():
+            threads.append(threading.current_thread().name)
+            return b"%PDF-1.4"
+
+        with mock.patch("core.services.pdf_engine.PDFRenderer.render", side_effect=render):
+            response = await self.async_client.get(self.pdf_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"%PDF-1.4")
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("pdf-render"))
+
+    async def test_pdf_for_missing_cv(self):
+        """Tests that an unknown CV id returns 404."""
+        response = await self.async_client.get(reverse("curriculum_vita_pdf", kwargs={"curriculum_id": 999}))
+
+        self.assertEqual(response.status_code, 404)
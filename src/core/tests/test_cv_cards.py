@@ -0,0 +1,64 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Contact, CurriculumVitae, Skill
+from core.services.cv_card import refresh_cards
+
+
+@override_settings(CV_PRETRANSLATE=False)
+class CVCardTestCase(TestCase):
+    def setUp(self):
+        self.python = Skill.objects.create(name="Python")
+        contact = Contact.objects.create(type="email", contact_link="john@example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv = CurriculumVitae.objects.create(
+                first_name="John", last_name="Doe", bio=" ".join(f"word{i}" for i in range(30)), contacts=contact
+            )
+            self.cv.skills.add(self.python)
+
+    def card(self) -> dict:
+        self.cv.refresh_from_db(fields=["card"])
+        return self.cv.card
+
+    def test_built_on_create(self):
+        """Tests that a new CV gets its name, truncated bio and skill names stored."""
+        card = self.card()
+
+        self.assertEqual(card["name"], "John Doe")
+        self.assertEqual(card["bio"], " ".join(f"word{i}" for i in range(20)) + " …")
+        self.assertEqual(card["skills"], ["Python"])
+
+    def test_refreshed_on_changes(self):
+        """Tests that CV edits, skill renames and unlinks all reach the card."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv.first_name = "Jack"
+            self.cv.save()
+        self.assertEqual(self.card()["name"], "Jack Doe")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.name = "Django"
+            self.python.save()
+        self.assertEqual(self.card()["skills"], ["Django"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv.skills.clear()
+        self.assertEqual(self.card()["skills"], [])
+
+    def test_refresh_returns_updated_count(self):
+        """Tests that refreshing rebuilds only the given CVs."""
+        self.assertEqual(refresh_cards([self.cv.pk, 0]), 1)
+
+    def test_list_page_renders_cards(self):
+        """Tests that the HTML list shows the stored card contents."""
+        response = self.client.get(reverse("curriculum_vitae_list"))
+
+        self.assertContains(response, "John Doe")
+        self.assertContains(response, "word19 …")
+        self.assertContains(response, "Python")
+
+    def test_cards_api(self):
+        """Tests that the card list returns the stored cards with their ids."""
+        response = self.client.get(reverse("curriculumvitae-cards"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [{"id": self.cv.pk, **self.card()}])
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Contact, CurriculumVitae, CurriculumVitaeTranslation, Project, Skill
+from core.tasks import pretranslate_cv
+from core.tests.fake_deepl import FakeDeepLMixin
+
+
+@override_settings(CV_TRANSLATION_LANGUAGES=["FR", "DE"])
+class CurriculumVitaeTranslationTestCase(FakeDeepLMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["translations"].clear()
+
+        self.skill = Skill.objects.create(name="Python")
+        self.project = Project.objects.create(name="Website", description="Portfolio site")
+        self.cv = CurriculumVitae.objects.create(
+            first_name="John",
+            last_name="Doe",
+            bio="Python developer",
+            contacts=Contact.objects.create(type="email", contact_link="test@example.com"),
+        )
+        self.cv.skills.add(self.skill)
+        self.cv.projects.add(self.project)
+        self.detail_url = reverse("curriculum_vita_detailed", kwargs={"curriculum_id": self.cv.pk})
+
+    def test_pretranslation_stores_every_language(self):
+        """Tests that the task stores one translation per configured language."""
+        pretranslate_cv(self.cv.pk)
+
+        translation = CurriculumVitaeTranslation.objects.get(curriculum_vitae=self.cv, language="FR")
+        self.assertEqual(translation.bio, "FR:Python developer")
+        self.assertEqual(translation.skills, {str(self.skill.pk): "FR:Python"})
+        self.assertEqual(translation.projects, {str(self.project.pk): "FR:Portfolio site"})
+        self.assertEqual(
+            sorted(self.cv.translations.values_list("language", flat=True)),
+            ["DE", "FR"]
+        )
+
+    def test_up_to_date_translations_skipped(self):
+        """Tests that rerunning the task for an unchanged CV does not call DeepL."""
+        pretranslate_cv(self.cv.pk)
+        caches["translations"].clear()
+
+        pretranslate_cv(self.cv.pk)
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_detail_view_serves_stored_translation(self):
+        """Tests that ?lang renders the stored translation without calling DeepL."""
+        pretranslate_cv(self.cv.pk, ["FR"])
+        requests_before = len(self.server.requests)
+
+        response = self.client.get(self.detail_url, {"lang": "br"})
+
+        self.assertContains(response, "FR:Python developer")
+        self.assertContains(response, "FR:Portfolio site")
+        self.assertEqual(response.context["language"], "FR")
+        self.assertEqual(len(self.server.requests), requests_before)
+
+    def test_stale_translation_not_served(self):
+        """Tests that a translation of older CV content falls back to the original."""
+        pretranslate_cv(self.cv.pk, ["FR"])
+        self.cv.bio = "Django developer"
+        self.cv.save()
+
+        response = self.client.get(self.detail_url, {"lang": "fr"})
+
+        self.assertContains(response, "Django developer")
+        self.assertEqual(response.context["language"], "")
+
+    def test_pdf_rendered_from_stored_translation(self):
+        """Tests that the PDF view renders the translated CV under its own cache key."""
+        pretranslate_cv(self.cv.pk, ["FR"])
+        url = reverse("curriculum_vita_pdf", kwargs={"curriculum_id": self.cv.pk})
+
+        with mock.patch("core.services.pdf_engine.PDFRenderer") as renderer:
+            renderer.return_value.render.return_value = b"%PDF-1.4"
+            response = self.client.get(url, {"lang": "FR"})
+
+        self.assertEqual(response.status_code, 200)
+        cv = renderer.call_args.args[1]["cv"]
+        self.assertEqual(cv.bio, "FR:Python developer")
+        self.assertEqual([skill.name for skill in cv.skills.all()], ["FR:Python"])
+
+    @override_settings(CV_PRETRANSLATE=True)
+    def test_saving_cv_queues_pretranslation(self):
+        """Tests that a saved CV is queued for pre-translation after commit."""
+        with mock.patch("core.tasks.pretranslate_cv.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.cv.save()
+
+        delay.assert_called_once_with(self.cv.pk)
@@ -0,0 +1,16 @@
+import io
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+
+class BenchmarkDBConnectionsTestCase(TransactionTestCase):
+    def test_persistent_connections_reused(self):
+        """Tests that the benchmark opens a connection per request only without CONN_MAX_AGE."""
+        out = io.StringIO()
+        call_command("benchmark_db_connections", requests=3, path="/missing/", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1].split()[:2], ["CONN_MAX_AGE=0", "3"])
+        self.assertEqual(lines[2].split()[:2], ["CONN_MAX_AGE=60", "0"])
+        self.assertIn("Connection setup per request", lines[3])
@@ -0,0 +1,108 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from audit.models import RequestLog
+from base.db_router import replica_reads
+from base.middleware import PIN_COOKIE, ReplicaRoutingMiddleware
+from core.models import Contact, CurriculumVitae, Project, Skill
+
+REPLICAS = ["replica_0", "replica_1"]
+
+
+@override_settings(DB_REPLICAS=REPLICAS, AUDIT_DATABASE="audit")
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    def test_primary_outside_requests(self):
+        """Tests that CV reads go to the primary outside replica_reads(), as in Celery tasks."""
+        self.assertEqual(router.db_for_read(CurriculumVitae), "default")
+
+    def test_replica_reads(self):
+        """Tests that CV models are read from one replica and everything else keeps its database."""
+        with replica_reads() as state:
+            self.assertIn(state.replica, REPLICAS)
+            for model in (CurriculumVitae, Skill, Project, Contact):
+                self.assertEqual(router.db_for_read(model), state.replica)
+            self.assertEqual(router.db_for_read(User), "default")
+            self.assertEqual(router.db_for_read(RequestLog), "audit")
+
+    def test_pinned_after_write(self):
+        """Tests that writing CV data sends the rest of the block's reads to the primary."""
+        with replica_reads():
+            self.assertEqual(router.db_for_write(Skill), "default")
+            self.assertEqual(router.db_for_read(CurriculumVitae), "default")
+
+    def test_audit_writes(self):
+        """Tests that request logs are written to the audit database without pinning CV reads."""
+        with replica_reads() as state:
+            self.assertEqual(router.db_for_write(RequestLog), "audit")
+            self.assertIn(router.db_for_read(CurriculumVitae), REPLICAS)
+            self.assertTrue(router.allow_relation(RequestLog(), User()))
+        self.assertIsNotNone(state.replica)
+
+    def test_allow_migrate(self):
+        """Tests that replicas are never migrated and the audit app only lives in the audit database."""
+        self.assertFalse(router.allow_migrate("replica_0", "core"))
+        self.assertTrue(router.allow_migrate("audit", "audit"))
+        self.assertFalse(router.allow_migrate("audit", "core"))
+        self.assertFalse(router.allow_migrate("default", "audit"))
+        self.assertTrue(router.allow_migrate("default", "core"))
+
+
+@override_settings(DB_REPLICAS=REPLICAS, DB_REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.reads = []
+
+    def view(self, request, write=False):
+        if write:
+            router.db_for_write(CurriculumVitae)
+        self.reads.append(router.db_for_read(CurriculumVitae))
+        return HttpResponse()
+
+    def test_get_reads_replica(self):
+        """Tests that a GET reads CV data from a replica and does not pin the client."""
+        response = ReplicaRoutingMiddleware(self.view)(self.factory.get("/"))
+
+        self.assertIn(self.reads[0], REPLICAS)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_post_pins_client(self):
+        """Tests that a POST reads from the primary and pins the client's following reads to it."""
+        middleware = ReplicaRoutingMiddleware(self.view)
+        response = middleware(self.factory.post("/"))
+
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 5)
+        self.factory.cookies[PIN_COOKIE] = "1"
+        middleware(self.factory.get("/"))
+        self.assertEqual(self.reads, ["default", "default"])
+
+    def test_get_writing_pins_client(self):
+        """Tests that a GET writing CV data reads it back from the primary and pins the client."""
+        response = ReplicaRoutingMiddleware(lambda request: self.view(request, write=True))(self.factory.get("/"))
+
+        self.assertEqual(self.reads, ["default"])
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    async def test_async_views(self):
+        """Tests that ORM calls made through sync_to_async see the request's replica and pin it."""
+        async def view(request):
+            self.reads.append(await sync_to_async(router.db_for_read)(CurriculumVitae))
+            await sync_to_async(router.db_for_write)(CurriculumVitae)
+            self.reads.append(await sync_to_async(router.db_for_read)(CurriculumVitae))
+            return HttpResponse()
+
+        response = await ReplicaRoutingMiddleware(view)(self.factory.get("/"))
+
+        self.assertIn(self.reads[0], REPLICAS)
+        self.assertEqual(self.reads[1], "default")
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    @override_settings(DB_REPLICAS=[])
+    def test_unused_without_replicas(self):
+        """Tests that the middleware is skipped when no replica is configured."""
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(self.view)
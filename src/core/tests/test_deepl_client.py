@@ -0,0 +1,142 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from core.services.deepl_client import (
+    AsyncDeepLClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeepLClient,
+    DeepLError,
+    ThreadedDeepLClient,
+    get_async_deepl_client,
+)
+from core.tests.fake_deepl import FakeDeepLServer
+
+
+class DeepLClientTestCase(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeDeepLServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+        sleep_patcher = mock.patch("core.services.deepl_client.time.sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def make_client(self, **kwargs):
+        kwargs.setdefault("circuit_breaker", CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        return DeepLClient("test:fx", api_url=self.server.url, read_timeout=1, **kwargs)
+
+    def test_translates_batch_with_auth_header(self):
+        """Tests that all texts go out in one request authenticated by header."""
+        client = self.make_client()
+
+        self.assertEqual(client.translate(["Hello", "World"], "DE"), ["DE:Hello", "DE:World"])
+        request, = self.server.requests
+        self.assertEqual(request["headers"]["Authorization"], "DeepL-Auth-Key test:fx")
+        self.assertEqual(request["form"]["text"], ["Hello", "World"])
+        self.assertNotIn("auth_key", request["form"])
+
+    def test_retries_server_errors_and_rate_limits(self):
+        """Tests that 5xx and 429 answers are retried with backoff, honouring Retry-After."""
+        self.server.enqueue(503, {"message": "busy"})
+        self.server.enqueue(429, {"message": "slow down"}, headers={"Retry-After": "3"})
+        client = self.make_client(max_retries=2)
+
+        self.assertEqual(client.translate(["Hello"], "FR"), ["FR:Hello"])
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+        self.assertGreaterEqual(self.sleep.call_args_list[1].args[0], 3)
+
+    def test_gives_up_after_max_retries(self):
+        """Tests that retries are bounded and the last error is reported."""
+        for _ in range(3):
+            self.server.enqueue(502)
+        client = self.make_client(max_retries=1)
+
+        with self.assertRaises(DeepLError) as raised:
+            client.translate(["Hello"], "FR")
+        self.assertEqual(raised.exception.status_code, 502)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_client_errors_not_retried(self):
+        """Tests that authentication and quota errors fail immediately."""
+        self.server.enqueue(456)
+        client = self.make_client()
+
+        with self.assertRaises(DeepLError) as raised:
+            client.translate(["Hello"], "FR")
+        self.assertEqual(raised.exception.status_code, 429)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_non_json_response(self):
+        """Tests that a successful response without a JSON body is reported as a failed request."""
+        for _ in range(2):
+            self.server.enqueue(200)
+
+        with self.assertRaises(DeepLError) as raised:
+            self.make_client().translate(["Hello"], "FR")
+        self.assertEqual(raised.exception.status_code, 503)
+
+        async_client = AsyncDeepLClient("test:fx", api_url=self.server.url)
+        with self.assertRaises(DeepLError):
+            async_to_sync(async_client.translate)(["Hello"], "FR")
+
+    def test_read_timeout(self):
+        """Tests that a hung endpoint is abandoned after the read timeout."""
+        self.server.enqueue(200, {"translations": []}, delay=1.5)
+        client = self.make_client(max_retries=0)
+
+        with self.assertRaises(DeepLError) as raised:
+            client.translate(["Hello"], "FR")
+        self.assertEqual(raised.exception.status_code, 503)
+
+    def test_circuit_breaker_fails_fast(self):
+        """Tests that the circuit opens after repeated failures and closes after a successful trial."""
+        for _ in range(2):
+            self.server.enqueue(500)
+        client = self.make_client(max_retries=0)
+
+        for _ in range(2):
+            with self.assertRaises(DeepLError):
+                client.translate(["Hello"], "FR")
+        with self.assertRaises(CircuitOpenError):
+            client.translate(["Hello"], "FR")
+        self.assertEqual(len(self.server.requests), 2)
+
+        client.circuit_breaker.reset_timeout = 0
+        self.assertEqual(client.translate(["Hello"], "FR"), ["FR:Hello"])
+        self.assertFalse(client.circuit_breaker.is_open)
+
+
+@override_settings(DEEPL_API_KEY="test:fx")
+class AsyncDeepLClientTestCase(SimpleTestCase):
+    @staticmethod
+    def clients_of_loop():
+        async def clients():
+            return get_async_deepl_client(), get_async_deepl_client()
+        return async_to_sync(clients)()
+
+    @override_settings(DEEPL_ASYNC_HTTP=False)
+    def test_short_lived_loops_share_sync_client(self):
+        """Tests that async calls on one-off event loops, as under WSGI, reuse the pooled sync client."""
+        (first, _), (second, _) = self.clients_of_loop(), self.clients_of_loop()
+
+        self.assertIsInstance(first, ThreadedDeepLClient)
+        self.assertIs(first.client, second.client)
+
+    @override_settings(DEEPL_ASYNC_HTTP=True)
+    def test_async_client_per_loop(self):
+        """Tests that under ASGI each event loop keeps one httpx client."""
+        first, again = self.clients_of_loop()
+
+        self.assertIsInstance(first, AsyncDeepLClient)
+        self.assertIs(first, again)
+
+    def test_threaded_client_translates(self):
+        """Tests that the threaded client returns the pooled client's translations."""
+        with FakeDeepLServer() as server:
+            client = ThreadedDeepLClient(DeepLClient("test:fx", api_url=server.url))
+
+            self.assertEqual(async_to_sync(client.translate)(["Hello"], "FR"), ["FR:Hello"])
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import CurriculumVitae, Skill, Project, Contact
+from core.services.export import iter_cv_records
+
+
+class CurriculumVitaeExportTestCase(TestCase):
+    def setUp(self):
+        contact = Contact.objects.create(type="email", contact_link="export@example.com")
+        skill = Skill.objects.create(name="Python")
+        project = Project.objects.create(name="Export", description="Streaming export")
+        for i in range(3):
+            cv = CurriculumVitae.objects.create(
+                first_name=f"User{i}",
+                last_name="Doe",
+                bio="Exported",
+                contacts=contact,
+            )
+            cv.skills.add(skill)
+            cv.projects.add(project)
+        self.url = reverse("curriculum_vitae_export")
+
+    def test_ndjson_export(self):
+        """Tests that the default export streams one JSON document per CV."""
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["first_name"] for row in rows], ["User0", "User1", "User2"])
+        self.assertEqual(rows[0]["skills"], ["Python"])
+        self.assertEqual(rows[0]["projects"], [{"name": "Export", "description": "Streaming export"}])
+
+    def test_csv_export(self):
+        """Tests that the CSV export has a header and one row per CV."""
+        response = self.client.get(self.url, {"format": "csv"})
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["contact_link"], "export@example.com")
+        self.assertEqual(rows[0]["skills"], "Python")
+
+    def test_unknown_format(self):
+        """Tests that unsupported formats are rejected."""
+        self.assertEqual(self.client.get(self.url, {"format": "xml"}).status_code, 400)
+
+    def test_export_command(self):
+        """Tests that the management command writes the export to a file."""
+        with tempfile.NamedTemporaryFile(suffix=".ndjson") as f:
+            call_command("export_cvs", output=f.name, chunk_size=2, stderr=io.StringIO())
+            self.assertEqual(len(f.read().splitlines()), 3)
+
+    def test_export_command_stdout(self):
+        """Tests that without --output the command writes the export to its stdout."""
+        out = io.StringIO()
+        call_command("export_cvs", format="csv", stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+
+    def test_export_without_server_side_cursors(self):
+        """Tests that the pgbouncer mode reads CVs in id-ordered chunks instead of a cursor."""
+        with mock.patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}):
+            # Two chunks of two and one CV, each with its two prefetches, plus the empty last chunk.
+            with self.assertNumQueries(7):
+                rows = list(iter_cv_records(chunk_size=2))
+
+        self.assertEqual([row["first_name"] for row in rows], ["User0", "User1", "User2"])
+
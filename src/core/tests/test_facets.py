@@ -0,0 +1,120 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import CurriculumVitae, Project, Skill, SkillFacet
+from core.services.facets import refresh_skill_facets
+from core.tests.helpers import create_cv
+
+
+@override_settings(CV_PRETRANSLATE=False)
+class SkillFacetTestCase(TestCase):
+    def setUp(self):
+        self.python, self.django, self.go = (Skill.objects.create(name=name) for name in ("Python", "Django", "Go"))
+
+    def counts(self) -> dict:
+        return dict(SkillFacet.objects.values_list("skill__name", "cv_count"))
+
+    def test_counted_on_link(self):
+        """Tests that linking skills to CVs updates their counts."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_cv("John", skills=[self.python, self.django])
+            create_cv("Jane", skills=[self.python])
+
+        self.assertEqual(self.counts(), {"Python": 2, "Django": 1})
+
+    def test_counted_on_unlink_and_clear(self):
+        """Tests that removing and clearing links, from either side, lowers the counts."""
+        with self.captureOnCommitCallbacks(execute=True):
+            john = create_cv("John", skills=[self.python, self.django, self.go])
+            create_cv("Jane", skills=[self.python, self.go])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            john.skills.remove(self.django)
+            self.python.curriculum_vitae.remove(john)
+            self.go.curriculum_vitae.clear()
+
+        self.assertEqual(self.counts(), {"Python": 1, "Django": 0, "Go": 0})
+
+    def test_counted_on_cv_delete(self):
+        """Tests that deleting a CV lowers the counts of its skills."""
+        with self.captureOnCommitCallbacks(execute=True):
+            john = create_cv("John", skills=[self.python])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            john.delete()
+
+        self.assertEqual(self.counts(), {"Python": 0})
+
+    def test_refresh_all(self):
+        """Tests that a full refresh rebuilds counts written without signals."""
+        john = create_cv("John")
+        CurriculumVitae.skills.through.objects.create(curriculumvitae=john, skill=self.go)
+
+        self.assertEqual(refresh_skill_facets(), 3)
+        self.assertEqual(self.counts(), {"Python": 0, "Django": 0, "Go": 1})
+
+
+@override_settings(CV_PRETRANSLATE=False)
+class SkillFilterAPITestCase(APITestCase):
+    def setUp(self):
+        python, django, go = (Skill.objects.create(name=name) for name in ("Python", "Django", "Go"))
+        shop = Project.objects.create(name="Shop", description="Online shop")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.john = create_cv("John", skills=[python, django], projects=[shop])
+            self.jane = create_cv("Jane", skills=[python])
+            self.jack = create_cv("Jack", skills=[go])
+        self.list_url = reverse("curriculumvitae-list")
+        self.facets_url = reverse("curriculumvitae-facets")
+
+    def names(self, params: dict) -> set[str]:
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {cv["first_name"] for cv in response.data["results"]}
+
+    def test_skills_any(self):
+        """Test CVs with any of the listed skills are returned once each"""
+        self.assertEqual(self.names({"skills": "Python,Django"}), {"John", "Jane"})
+        self.assertEqual(self.names({"skills": "Django,Go"}), {"John", "Jack"})
+
+    def test_skills_all(self):
+        """Test CVs need every listed skill with skills_match=all"""
+        self.assertEqual(self.names({"skills": "Python,Django", "skills_match": "all"}), {"John"})
+        self.assertEqual(self.names({"skills": "Python,Go", "skills_match": "all"}), set())
+
+    def test_names_stripped(self):
+        """Test spaces around listed names and empty items are ignored"""
+        self.assertEqual(self.names({"skills": "Python, Django,", "skills_match": "all"}), {"John"})
+        self.assertEqual(self.names({"skills": " , "}), {"John", "Jane", "Jack"})
+
+    def test_projects_filter(self):
+        """Test filtering by project names combines with skill filters"""
+        self.assertEqual(self.names({"projects": "Shop"}), {"John"})
+        self.assertEqual(self.names({"projects": "Shop", "skills": "Go"}), set())
+
+    def test_invalid_match(self):
+        """Test an unknown match mode is rejected"""
+        response = self.client.get(self.list_url, {"skills": "Python", "skills_match": "some"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_facets_unfiltered(self):
+        """Test unfiltered facets are read from the stored counts"""
+        with self.assertNumQueries(3):
+            response = self.client.get(self.facets_url)
+
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [(skill["name"], skill["count"]) for skill in response.data["skills"]],
+            [("Python", 2), ("Django", 1), ("Go", 1)]
+        )
+
+    def test_facets_filtered(self):
+        """Test facets count the skills of the CVs matching the filters"""
+        response = self.client.get(self.facets_url, {"skills": "Python"})
+
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [(skill["name"], skill["count"]) for skill in response.data["skills"]],
+            [("Python", 2), ("Django", 1)]
+        )
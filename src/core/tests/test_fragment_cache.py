@@ -0,0 +1,91 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Contact, CurriculumVitae, CurriculumVitaeTranslation, Project, Skill
+from core.services import fragment_cache
+from core.services.cv_translation import source_hash
+
+
+@override_settings(CV_PRETRANSLATE=False, AUDIT_LOG_MODE="sync")
+class FragmentCacheTestCase(TestCase):
+    def setUp(self):
+        fragment_cache.get_cache().clear()
+        self.skill = Skill.objects.create(name="Python")
+        self.project = Project.objects.create(name="Shop", description="Online shop")
+        contact = Contact.objects.create(type="email", contact_link="john@example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv = CurriculumVitae.objects.create(
+                first_name="John", last_name="Doe", bio="Developer", contacts=contact
+            )
+            self.cv.skills.add(self.skill)
+            self.cv.projects.add(self.project)
+        self.detail_url = reverse("curriculum_vita_detailed", kwargs={"curriculum_id": self.cv.pk})
+        self.list_url = reverse("curriculum_vitae_list")
+
+    def test_detail_sections_cached(self):
+        """Tests that a warm detail page skips loading skills, projects and the translation."""
+        self.client.get(self.detail_url, {"lang": "fr"})
+
+        # Version lookup, the CV with its contact and the request log row.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.detail_url, {"lang": "fr"})
+
+        self.assertContains(response, "Python")
+        self.assertContains(response, "Online shop")
+        self.assertContains(response, "john@example.com")
+
+    def test_list_cards_cached(self):
+        """Tests that a warm list page is assembled from cached cards."""
+        self.client.get(self.list_url)
+        before = fragment_cache.stats()
+
+        response = self.client.get(self.list_url)
+
+        self.assertContains(response, "John Doe")
+        self.assertEqual(fragment_cache.stats()["hits"], before["hits"] + 1)
+        self.assertEqual(fragment_cache.stats()["misses"], before["misses"])
+
+    def test_invalidated_on_related_changes(self):
+        """Tests that skill, project and contact edits reach cached cards and sections."""
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.skill.name = "Haskell"
+            self.skill.save()
+            self.project.description = "Bicycle shop"
+            self.project.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv.contacts.contact_link = "jd@example.com"
+            self.cv.contacts.save()
+
+        self.assertContains(self.client.get(self.list_url), "Haskell")
+        detail = self.client.get(self.detail_url)
+        self.assertContains(detail, "Haskell")
+        self.assertContains(detail, "Bicycle shop")
+        self.assertContains(detail, "jd@example.com")
+
+    def test_invalidated_on_unlink(self):
+        """Tests that removing a skill from a CV drops it from the cached sections."""
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv.skills.remove(self.skill)
+
+        self.assertContains(self.client.get(self.detail_url), "No skills listed.")
+
+    def test_invalidated_on_translation_stored(self):
+        """Tests that storing a translation replaces the cached untranslated sections of its language."""
+        response = self.client.get(self.detail_url, {"lang": "fr"})
+        self.assertEqual(response.context["language"], "")
+
+        cv = CurriculumVitae.objects.full().get(pk=self.cv.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            CurriculumVitaeTranslation.objects.create(
+                curriculum_vitae=cv, language="FR", source_hash=source_hash(cv),
+                bio="Développeur", skills={}, projects={str(self.project.pk): "Boutique en ligne"},
+            )
+
+        response = self.client.get(self.detail_url, {"lang": "fr"})
+        self.assertContains(response, "Boutique en ligne")
+        self.assertEqual(response.context["language"], "FR")
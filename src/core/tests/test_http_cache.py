@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Contact, CurriculumVitae, CurriculumVitaeTranslation, Skill
+from core.tests.helpers import patch_pdf_render
+
+
+@override_settings(
+    CV_PRETRANSLATE=False, PDF_CACHE_BACKEND="dummy", PDF_RENDER_MODE="sync", HTTP_CACHE_MAX_AGE=60
+)
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.skill = Skill.objects.create(name="Python")
+        contact = Contact.objects.create(type="email", contact_link="john@example.com")
+        self.cv = CurriculumVitae.objects.create(first_name="John", last_name="Doe", bio="Developer", contacts=contact)
+        self.cv.skills.add(self.skill)
+        self.detail_url = reverse("curriculum_vita_detailed", kwargs={"curriculum_id": self.cv.pk})
+        self.list_url = reverse("curriculum_vitae_list")
+
+        self.render = patch_pdf_render(self)
+
+    def revalidate(self, url: str, response, **params):
+        return self.client.get(url, params, headers={"if-none-match": response["ETag"]})
+
+    def test_detail_not_modified(self):
+        """Tests that a detail page revalidated with its ETag or Last-Modified answers 304."""
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=60", response["Cache-Control"])
+        self.assertEqual(self.revalidate(self.detail_url, response).status_code, 304)
+        since = self.client.get(self.detail_url, headers={"if-modified-since": response["Last-Modified"]})
+        self.assertEqual(since.status_code, 304)
+
+    def test_detail_changes_with_relations(self):
+        """Tests that editing the CV, a linked skill or the links gives a new ETag."""
+        changes = [
+            lambda: CurriculumVitae.objects.get(pk=self.cv.pk).save(),
+            lambda: Skill.objects.filter(pk=self.skill.pk).first().save(),
+            lambda: self.cv.skills.remove(self.skill),
+        ]
+        for change in changes:
+            response = self.client.get(self.detail_url)
+            change()
+            with self.subTest(change=change):
+                self.assertEqual(self.revalidate(self.detail_url, response).status_code, 200)
+
+    def test_detail_changes_with_translation(self):
+        """Tests that storing a translation changes the ETag of the translated page only."""
+        plain = self.client.get(self.detail_url)
+        translated = self.client.get(self.detail_url, {"lang": "fr"})
+        self.assertNotEqual(plain["ETag"], translated["ETag"])
+
+        CurriculumVitaeTranslation.objects.create(curriculum_vitae=self.cv, language="FR", source_hash="")
+
+        self.assertEqual(self.revalidate(self.detail_url, plain).status_code, 304)
+        self.assertEqual(self.revalidate(self.detail_url, translated, lang="fr").status_code, 200)
+
+    def test_list_not_modified(self):
+        """Tests that the list page answers 304 until a CV is added or removed."""
+        response = self.client.get(self.list_url)
+        self.assertEqual(self.revalidate(self.list_url, response).status_code, 304)
+
+        self.cv.delete()
+        self.assertEqual(self.revalidate(self.list_url, response).status_code, 200)
+
+    def test_pdf_not_modified(self):
+        """Tests that a current PDF is not rendered again for a revalidating client."""
+        response = self.client.get(reverse("curriculum_vita_pdf", kwargs={"curriculum_id": self.cv.pk}))
+        self.assertEqual(response.status_code, 200)
+
+        repeat = self.revalidate(reverse("curriculum_vita_pdf", kwargs={"curriculum_id": self.cv.pk}), response)
+
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_authenticated_pages_private(self):
+        """Tests that logged-in pages get their own ETag and are kept out of shared caches."""
+        anonymous = self.client.get(self.detail_url)
+        user = User.objects.create_user(username="viewer", password="testpass")
+        self.client.force_login(user)
+
+        response = self.client.get(self.detail_url)
+
+        self.assertNotEqual(response["ETag"], anonymous["ETag"])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(self.revalidate(self.detail_url, anonymous).status_code, 200)
+
+    def test_missing_cv(self):
+        """Tests that unknown CVs still answer 404 without validators."""
+        response = self.client.get(reverse("curriculum_vita_detailed", kwargs={"curriculum_id": 0}))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
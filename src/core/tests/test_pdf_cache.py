@@ -0,0 +1,144 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from base import metrics
+from core.constants import PDF_TEMPLATES
+from core.models import CurriculumVitae, Skill, Project, Contact
+from core.services.pdf_cache import (
+    HITS_METRIC,
+    MISSES_METRIC,
+    FileSystemPDFCacheBackend,
+    cv_fingerprint,
+    get_pdf_cache,
+)
+from core.tests.helpers import patch_pdf_render
+
+TEMPLATE = "core/curriculum-vitae-detail-pdf.html"
+
+
+class PDFCacheTestCase(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        settings_override = override_settings(
+            PDF_CACHE_BACKEND="filesystem",
+            PDF_CACHE_LOCATION=self.tmp_dir.name,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.reset(HITS_METRIC, MISSES_METRIC)
+
+        self.contact = Contact.objects.create(type="email", contact_link="cache@example.com")
+        self.skill = Skill.objects.create(name="Python")
+        self.project = Project.objects.create(name="Cache", description="PDF cache")
+        self.cv = CurriculumVitae.objects.create(
+            first_name="John",
+            last_name="Doe",
+            bio="Python developer",
+            contacts=self.contact,
+        )
+        self.cv.skills.add(self.skill)
+        self.cv.projects.add(self.project)
+
+        self.render = patch_pdf_render(self)
+
+    def _cached_files(self):
+        return [name for name in os.listdir(self.tmp_dir.name) if name.endswith(".pdf")]
+
+    def test_second_render_is_served_from_cache(self):
+        """Tests that the same CV version is rendered only once."""
+        pdf_cache = get_pdf_cache()
+        self.assertEqual(pdf_cache.get_or_render(self.cv, TEMPLATE), b"%PDF-1.4")
+        self.assertEqual(pdf_cache.get_or_render(self.cv, TEMPLATE), b"%PDF-1.4")
+
+        self.assertEqual(self.render.call_count, 1)
+        stats = pdf_cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_fingerprint_changes_with_related_objects(self):
+        """Tests that linking a skill or editing a project changes the fingerprint."""
+        original = cv_fingerprint(self.cv, TEMPLATE)
+
+        self.cv.skills.add(Skill.objects.create(name="Django"))
+        with_skill = cv_fingerprint(self.cv, TEMPLATE)
+        self.assertNotEqual(original, with_skill)
+
+        self.project.description = "Updated"
+        self.project.save()
+        self.assertNotEqual(with_skill, cv_fingerprint(self.cv, TEMPLATE))
+        self.assertNotEqual(with_skill, cv_fingerprint(self.cv, "core/curriculum-vitae-detail.html"))
+
+    def test_related_changes_invalidate_cached_pdfs(self):
+        """Tests that stale PDFs are removed when related models change."""
+        get_pdf_cache().get_or_render(self.cv, TEMPLATE)
+        self.assertEqual(len(self._cached_files()), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.skill.name = "Python 3"
+            self.skill.save()
+        self.assertEqual(self._cached_files(), [])
+
+        get_pdf_cache().get_or_render(self.cv, TEMPLATE)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv.projects.remove(self.project)
+        self.assertEqual(self._cached_files(), [])
+
+    def test_invalidation_scans_cache_once(self):
+        """Tests that a skill shared by many CVs drops their PDFs in one pass after commit."""
+        other = CurriculumVitae.objects.create(first_name="Jane", last_name="Doe", bio="Developer", contacts=self.contact)
+        other.skills.add(self.skill)
+        backend = get_pdf_cache().backend
+
+        with mock.patch.object(backend, "delete_prefixes") as delete_prefixes:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.skill.name = "Python 3"
+                self.skill.save()
+                delete_prefixes.assert_not_called()
+
+        delete_prefixes.assert_called_once()
+        self.assertCountEqual(delete_prefixes.call_args.args[0], (f"cv{self.cv.pk}-", f"cv{other.pk}-"))
+
+    def test_filesystem_backend_evicts_least_recently_used(self):
+        """Tests that the backend stays under its size limit by dropping the oldest entries."""
+        backend = FileSystemPDFCacheBackend(self.tmp_dir.name, max_size=10)
+        backend.set("first", b"12345")
+        backend.set("second", b"12345")
+        os.utime(os.path.join(self.tmp_dir.name, "first.pdf"), (0, 0))
+        backend.set("third", b"12345")
+
+        self.assertIsNone(backend.get("first"))
+        self.assertEqual(backend.get("second"), b"12345")
+        self.assertEqual(backend.get("third"), b"12345")
+
+    def test_pdf_view_uses_cache(self):
+        """Tests that repeated PDF downloads render the document once."""
+        url = reverse("curriculum_vita_pdf", kwargs={"curriculum_id": self.cv.pk})
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(self.render.call_count, 1)
+        self.assertEqual(self.client.get(reverse("metrics")).json()["pdf_cache"]["hits"], 1)
+
+
+class PDFTemplateTestCase(TestCase):
+    def test_templates_render_whole_cv(self):
+        """Tests that every PDF template renders the bio, contact, skills and projects from the CV alone."""
+        contact = Contact.objects.create(type="email", contact_link="pdf@example.com")
+        cv = CurriculumVitae.objects.create(first_name="John", last_name="Doe", bio="Python developer", contacts=contact)
+        cv.skills.add(Skill.objects.create(name="Django"))
+        cv.projects.add(Project.objects.create(name="Shop", description="Online shop"))
+
+        for template in PDF_TEMPLATES:
+            with self.subTest(template=template):
+                html = render_to_string(template, {"cv": cv})
+                for text in ("John Doe", "Python developer", "pdf@example.com", "Django", "Online shop"):
+                    self.assertIn(text, html)
@@ -0,0 +1,165 @@
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from core.models import Contact, CurriculumVitae, PDFEmailBatch, PDFEmailDelivery
+from core.services.pdf_email import RateLimiter, SMTPUnavailable, send_batch
+from core.tasks import send_cv_pdf_batch
+from core.tests.helpers import patch_pdf_render
+
+
+@override_settings(PDF_EMAIL_RATE_LIMIT=0, DEFAULT_FROM_EMAIL="cv@example.com")
+class PDFEmailBatchTestCase(TestCase):
+    def setUp(self):
+        contact = Contact.objects.create(type="email", contact_link="batch@example.com")
+        self.cvs = [
+            CurriculumVitae.objects.create(first_name=name, last_name="Doe", bio="Developer", contacts=contact)
+            for name in ("John", "Jane")
+        ]
+        self.batch = PDFEmailBatch.objects.create()
+        self.batch.curriculum_vitae.set(self.cvs)
+        self.emails = [f"user{i}@example.com" for i in range(20)]
+        PDFEmailDelivery.objects.bulk_create([PDFEmailDelivery(batch=self.batch, email=email) for email in self.emails])
+
+        self.render = patch_pdf_render(self)
+
+    def test_each_cv_rendered_once(self):
+        """Tests that every recipient gets all CVs while each CV is rendered only once."""
+        send_cv_pdf_batch(self.batch.pk)
+
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(len(mail.outbox), 20)
+        self.assertEqual(
+            [name for name, _, _ in mail.outbox[0].attachments],
+            ["CV_John_Doe.pdf", "CV_Jane_Doe.pdf"]
+        )
+        self.assertEqual(self.batch.deliveries.filter(status=PDFEmailDelivery.Status.SENT).count(), 20)
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.status, PDFEmailBatch.Status.DONE)
+
+    def test_single_connection(self):
+        """Tests that all messages go through one opened connection."""
+        with mock.patch("core.services.pdf_email.get_connection", wraps=mail.get_connection) as get_connection:
+            send_cv_pdf_batch(self.batch.pk)
+
+        get_connection.assert_called_once_with()
+
+    def test_failures_tracked_per_recipient(self):
+        """Tests that a refused recipient is marked failed without stopping the others."""
+        connection = mail.get_connection()
+        send_messages = connection.send_messages
+
+        def refuse_one(messages):
+            if messages[0].to == ["user3@example.com"]:
+                raise smtplib.SMTPRecipientsRefused({"user3@example.com": (550, b"No such user")})
+            return send_messages(messages)
+
+        connection.send_messages = refuse_one
+        with mock.patch("core.services.pdf_email.get_connection", return_value=connection):
+            send_cv_pdf_batch(self.batch.pk)
+
+        failed = self.batch.deliveries.get(status=PDFEmailDelivery.Status.FAILED)
+        self.assertEqual(failed.email, "user3@example.com")
+        self.assertIn("No such user", failed.error)
+        self.assertEqual(len(mail.outbox), 19)
+
+    def test_retry_only_sends_pending(self):
+        """Tests that rerunning a batch skips recipients that were already emailed."""
+        send_cv_pdf_batch(self.batch.pk)
+        self.batch.deliveries.filter(email="user0@example.com").update(status=PDFEmailDelivery.Status.PENDING)
+
+        send_cv_pdf_batch(self.batch.pk)
+
+        self.assertEqual(len(mail.outbox), 21)
+
+    def test_unreachable_server_left_pending(self):
+        """Tests that a batch whose SMTP server is down goes back to pending for a retry."""
+        with mock.patch.object(mail.get_connection().__class__, "open", side_effect=ConnectionRefusedError("refused")):
+            with self.assertRaises(SMTPUnavailable):
+                send_batch(self.batch, final_attempt=False)
+
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.status, PDFEmailBatch.Status.PENDING)
+        self.assertEqual(self.batch.deliveries.filter(status=PDFEmailDelivery.Status.PENDING).count(), 20)
+
+    @override_settings(PDF_EMAIL_MAX_RETRIES=2)
+    def test_unreachable_server_fails_after_retries(self):
+        """Tests that the task retries an unreachable SMTP server, then marks the deliveries failed."""
+        with mock.patch.object(
+            mail.get_connection().__class__, "open", side_effect=ConnectionRefusedError("refused")
+        ) as open_connection, self.assertLogs("core.services.pdf_email", "WARNING"):
+            send_cv_pdf_batch.apply((self.batch.pk,))
+
+        self.assertEqual(open_connection.call_count, 3)
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.status, PDFEmailBatch.Status.DONE)
+        failed = self.batch.deliveries.filter(status=PDFEmailDelivery.Status.FAILED)
+        self.assertEqual(failed.count(), 20)
+        self.assertIn("refused", failed.first().error)
+
+    def test_reconnect_failure_keeps_outcomes(self):
+        """Tests that a failed reconnect keeps the recorded outcomes and leaves the rest pending."""
+        connection = mail.get_connection()
+        send_messages = connection.send_messages
+
+        def disconnect_at_third(messages):
+            if messages[0].to == ["user2@example.com"]:
+                connection.open = mock.Mock(side_effect=OSError("unreachable"))
+                raise smtplib.SMTPServerDisconnected("gone")
+            return send_messages(messages)
+
+        connection.send_messages = disconnect_at_third
+        with mock.patch("core.services.pdf_email.get_connection", return_value=connection):
+            with self.assertRaises(SMTPUnavailable):
+                send_batch(self.batch, final_attempt=False)
+
+        statuses = dict(self.batch.deliveries.values_list("email", "status"))
+        self.assertEqual(statuses["user1@example.com"], PDFEmailDelivery.Status.SENT)
+        self.assertEqual(list(statuses.values()).count(PDFEmailDelivery.Status.PENDING), 18)
+
+    def test_disconnect_resends_once(self):
+        """Tests that a message cut off by a disconnect is resent once, then marked failed."""
+        connection = mail.get_connection()
+        send_messages = connection.send_messages
+        drops = {"user2@example.com": 1, "user5@example.com": 2}
+
+        def drop_connection(messages):
+            email = messages[0].to[0]
+            if drops.get(email):
+                drops[email] -= 1
+                raise smtplib.SMTPServerDisconnected("gone")
+            return send_messages(messages)
+
+        connection.send_messages = drop_connection
+        with mock.patch("core.services.pdf_email.get_connection", return_value=connection):
+            send_batch(self.batch)
+
+        statuses = dict(self.batch.deliveries.values_list("email", "status"))
+        self.assertEqual(statuses["user2@example.com"], PDFEmailDelivery.Status.SENT)
+        self.assertEqual(statuses["user5@example.com"], PDFEmailDelivery.Status.FAILED)
+        self.assertEqual(len(mail.outbox), 19)
+
+    def test_unrendered_cv_noted(self):
+        """Tests that deliveries sent without a CV that failed to render record which one is missing."""
+        self.render.side_effect = [b"%PDF-1.4", None]
+        with self.assertLogs("core.services.pdf_email", "WARNING"):
+            send_batch(self.batch)
+
+        delivery = self.batch.deliveries.first()
+        self.assertEqual(delivery.status, PDFEmailDelivery.Status.SENT)
+        self.assertEqual(delivery.error, f"Sent without the PDFs of CVs {self.cvs[1].pk}")
+        self.assertEqual(len(mail.outbox[0].attachments), 1)
+
+
+class RateLimiterTestCase(TestCase):
+    def test_calls_spaced_by_rate(self):
+        """Tests that the limiter sleeps to keep calls under the configured rate."""
+        with mock.patch("core.services.pdf_email.time.sleep") as sleep:
+            limiter = RateLimiter(rate=2)
+            for _ in range(3):
+                limiter.wait()
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertAlmostEqual(sleep.call_args_list[0].args[0], 0.5, places=2)
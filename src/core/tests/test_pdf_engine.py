@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import time
+
+from django.test import TestCase
+
+from core.constants import CV_EMAIL_PDF_TEMPLATE
+from core.models import Contact, CurriculumVitae, Project, Skill
+from core.services.pdf_engine import PDFEngine, PDFRenderTimeout, job_timeout
+
+
+class PDFEngineTestCase(TestCase):
+    def setUp(self):
+        self.cv = CurriculumVitae.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            bio="Senior developer",
+            contacts=Contact.objects.create(type="email", contact_link="engine@example.com"),
+        )
+        self.cv.skills.add(Skill.objects.create(name="Python"))
+        self.cv.projects.add(Project.objects.create(name="Engine", description="PDF engine"))
+
+    def load_cv(self):
+        return CurriculumVitae.objects.select_related(
+            "contacts"
+        ).prefetch_related(
+            "skills",
+            "projects"
+        ).get(pk=self.cv.pk)
+
+    def make_engine(self, **kwargs):
+        engine = PDFEngine(**{"workers": 1, "timeout": 30, "max_tasks_per_child": 0, **kwargs})
+        self.addCleanup(engine.shutdown)
+        return engine
+
+    def test_renders_in_worker_process(self):
+        """Tests that a prefetched CV is rendered to PDF by a pool worker without database access."""
+        engine = self.make_engine(warm_templates=[CV_EMAIL_PDF_TEMPLATE])
+
+        pdf = engine.render(CV_EMAIL_PDF_TEMPLATE, {"cv": self.load_cv()})
+
+        self.assertTrue(pdf.startswith(b"%PDF"))
+
+    def test_inline_without_workers(self):
+        """Tests that workers=0 renders in the calling process."""
+        engine = self.make_engine(workers=0)
+
+        self.assertTrue(engine.render(CV_EMAIL_PDF_TEMPLATE, {"cv": self.load_cv()}).startswith(b"%PDF"))
+        self.assertIsNone(engine.executor)
+
+    def test_inline_in_daemonic_process(self):
+        """Tests that a daemonic process, like a Celery prefork worker, renders inline instead of failing."""
+        engine = self.make_engine()
+        cv = self.load_cv()
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+
+        def render():
+            pdf = engine.render(CV_EMAIL_PDF_TEMPLATE, {"cv": cv})
+            results.put((pdf[:4] if pdf else None, engine.executor is None))
+
+        process = context.Process(target=render, daemon=True)
+        process.start()
+        process.join(timeout=60)
+
+        self.assertEqual(results.get(timeout=1), (b"%PDF", True))
+
+    def test_workers_recycled(self):
+        """Tests that a worker is replaced after max_tasks_per_child jobs."""
+        executor = self.make_engine(max_tasks_per_child=1).get_executor()
+
+        first = executor.submit(os.getpid).result()
+        second = executor.submit(os.getpid).result()
+
+        self.assertNotEqual(first, second)
+
+    def test_job_timeout(self):
+        """Tests that a job running past its timeout is interrupted."""
+        started = time.monotonic()
+        with self.assertRaises(PDFRenderTimeout):
+            with job_timeout(0.1):
+                time.sleep(2)
+        self.assertLess(time.monotonic() - started, 1)
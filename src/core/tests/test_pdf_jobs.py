@@ -0,0 +1,93 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import CurriculumVitae, Contact, PDFRenderJob
+from core.tasks import render_cv_pdf
+from core.tests.helpers import patch_pdf_render
+
+
+class AsyncPDFViewTestCase(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        settings_override = override_settings(
+            PDF_RENDER_MODE="async",
+            PDF_CACHE_BACKEND="filesystem",
+            PDF_CACHE_LOCATION=self.tmp_dir.name,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        contact = Contact.objects.create(type="email", contact_link="async@example.com")
+        self.cv = CurriculumVitae.objects.create(
+            first_name="Jane",
+            last_name="Doe",
+            bio="Senior developer",
+            contacts=contact,
+        )
+        self.url = reverse("curriculum_vita_pdf", kwargs={"curriculum_id": self.cv.pk})
+
+        self.render = patch_pdf_render(self)
+
+        delay_patcher = mock.patch("core.views.render_cv_pdf.delay")
+        self.delay = delay_patcher.start()
+        self.addCleanup(delay_patcher.stop)
+
+    def test_concurrent_requests_enqueue_one_job(self):
+        """Tests that repeated requests for the same CV version share one render job."""
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(first.json()["job_id"], second.json()["job_id"])
+        self.assertEqual(PDFRenderJob.objects.count(), 1)
+        self.delay.assert_called_once_with(first.json()["job_id"])
+        self.render.assert_not_called()
+
+    def test_status_redirects_to_finished_pdf(self):
+        """Tests polling a job until its PDF can be downloaded."""
+        job_id = self.client.get(self.url).json()["job_id"]
+        status_url = reverse("pdf_render_job_status", kwargs={"job_id": job_id})
+
+        self.assertEqual(self.client.get(status_url).json()["status"], "pending")
+
+        render_cv_pdf(job_id)
+
+        response = self.client.get(status_url, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response.content, b"%PDF-1.4")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_job_for_outdated_cv_version_fails(self):
+        """Tests that a job is not marked ready with a PDF of a different CV version."""
+        job_id = self.client.get(self.url).json()["job_id"]
+        self.cv.bio = "Changed"
+        self.cv.save()
+
+        render_cv_pdf(job_id)
+
+        self.assertEqual(PDFRenderJob.objects.get(pk=job_id).status, PDFRenderJob.Status.FAILED)
+        self.render.assert_not_called()
+
+    @override_settings(PDF_RENDER_RETRY_AFTER=300)
+    def test_failed_job_retried_after_cooldown(self):
+        """Tests that a failed render is reported until PDF_RENDER_RETRY_AFTER has passed, then requeued once."""
+        job_id = self.client.get(self.url).json()["job_id"]
+        PDFRenderJob.objects.filter(pk=job_id).update(status=PDFRenderJob.Status.FAILED, error="PDF generation failed")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()["error"], "PDF generation failed")
+        self.assertEqual(self.delay.call_count, 1)
+
+        PDFRenderJob.objects.filter(pk=job_id).update(updated_at=timezone.now() - timedelta(seconds=301))
+        self.assertEqual(self.client.get(self.url).status_code, 202)
+        self.assertEqual(self.client.get(self.url).status_code, 202)
+        self.assertEqual(self.delay.call_count, 2)
+        self.assertEqual(PDFRenderJob.objects.get(pk=job_id).status, PDFRenderJob.Status.PENDING)
@@ -0,0 +1,111 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Contact, CurriculumVitae, Project, Skill
+from core.services import fragment_cache
+from core.tasks import send_cv_pdf_email
+from core.tests.helpers import patch_pdf_render
+
+SIZES = (1, 10, 1000)
+
+
+@override_settings(AUDIT_LOG_MODE="sync", PDF_CACHE_BACKEND="dummy", PDF_RENDER_MODE="sync")
+class QueryCountTestCase(TestCase):
+    """
+    Pins the number of queries per endpoint, whatever the number of CVs.
+
+    Every HTTP request also runs one INSERT for its RequestLog row.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}") for i in range(3)])
+        cls.projects = Project.objects.bulk_create(
+            [Project(name=f"Project {i}", description="Description") for i in range(3)]
+        )
+
+    def setUp(self):
+        patch_pdf_render(self)
+
+    def grow_to(self, size: int) -> CurriculumVitae:
+        """
+        Adds CVs, each with its own contact and every skill and project, until there are size of them.
+        """
+        missing = size - CurriculumVitae.objects.count()
+        contacts = Contact.objects.bulk_create(
+            [Contact(type="email", contact_link=f"cv{i}@example.com") for i in range(missing)]
+        )
+        cvs = CurriculumVitae.objects.bulk_create([
+            CurriculumVitae(first_name=f"First {i}", last_name="Last", bio="Bio", contacts=contact)
+            for i, contact in enumerate(contacts)
+        ])
+        CurriculumVitae.skills.through.objects.bulk_create([
+            CurriculumVitae.skills.through(curriculumvitae_id=cv.pk, skill_id=skill.pk)
+            for cv in cvs for skill in self.skills
+        ])
+        CurriculumVitae.projects.through.objects.bulk_create([
+            CurriculumVitae.projects.through(curriculumvitae_id=cv.pk, project_id=project.pk)
+            for cv in cvs for project in self.projects
+        ])
+        return CurriculumVitae.objects.earliest("created_at")
+
+    def assertQueriesAtEverySize(self, expected: int, request):
+        for size in SIZES:
+            cv = self.grow_to(size)
+            fragment_cache.get_cache().clear()
+            with self.subTest(cvs=size), self.assertNumQueries(expected):
+                response = request(cv)
+                if response is not None:
+                    self.assertEqual(response.status_code, 200)
+
+    def test_list_view(self):
+        """Tests that the HTML list reads the list version and the stored cards in two queries."""
+        self.assertQueriesAtEverySize(3, lambda cv: self.client.get(reverse("curriculum_vitae_list")))
+
+    def test_detail_view(self):
+        """Tests that the HTML detail page looks up the CV version and loads the CV in three queries."""
+        self.assertQueriesAtEverySize(5, lambda cv: self.client.get(
+            reverse("curriculum_vita_detailed", kwargs={"curriculum_id": cv.pk})
+        ))
+
+    def test_pdf_view(self):
+        """Tests that rendering a PDF needs no queries beyond the version lookup and loading the CV."""
+        self.assertQueriesAtEverySize(5, lambda cv: self.client.get(
+            reverse("curriculum_vita_pdf", kwargs={"curriculum_id": cv.pk})
+        ))
+
+    def test_not_modified(self):
+        """Tests that a repeat view of an unchanged CV costs only the version lookup."""
+        def request(cv):
+            url = reverse("curriculum_vita_detailed", kwargs={"curriculum_id": cv.pk})
+            etag = self.client.get(url)["ETag"]
+            with self.assertNumQueries(2):
+                self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+
+        for size in SIZES:
+            with self.subTest(cvs=size):
+                request(self.grow_to(size))
+
+    def test_email_task(self):
+        """Tests that emailing a CV PDF loads the CV in three queries."""
+        self.assertQueriesAtEverySize(3, lambda cv: send_cv_pdf_email("to@example.com", cv.pk))
+
+    def test_api_list(self):
+        """Tests that an API page loads CVs, skills and projects in three queries."""
+        self.assertQueriesAtEverySize(4, lambda cv: self.client.get(reverse("curriculumvitae-list")))
+
+    def test_api_detail(self):
+        """Tests that the API detail loads a CV in three queries."""
+        self.assertQueriesAtEverySize(4, lambda cv: self.client.get(
+            reverse("curriculumvitae-detail", kwargs={"pk": cv.pk})
+        ))
+
+    def test_api_sparse_list(self):
+        """Tests that unrequested relations are not queried at all."""
+        self.assertQueriesAtEverySize(2, lambda cv: self.client.get(
+            reverse("curriculumvitae-list"), {"fields": "id,first_name"}
+        ))
+
+    def test_api_cards(self):
+        """Tests that the card list reads the stored cards in one query."""
+        self.assertQueriesAtEverySize(2, lambda cv: self.client.get(reverse("curriculumvitae-cards")))
@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from base.redis_pool import SharedConnectionPool, get_redis, health
+
+UNREACHABLE_URL = "redis://127.0.0.1:1/0"
+POOL_OPTIONS = {"max_connections": 5, "timeout": 0.1, "socket_timeout": 0.1, "socket_connect_timeout": 0.1}
+REDIS_CACHE = {
+    "BACKEND": "django.core.cache.backends.redis.RedisCache",
+    "LOCATION": UNREACHABLE_URL,
+    "OPTIONS": {"pool_class": "base.redis_pool.SharedConnectionPool", **POOL_OPTIONS},
+}
+
+
+@override_settings(REDIS_URL=UNREACHABLE_URL, REDIS_POOL_OPTIONS=POOL_OPTIONS)
+class SharedConnectionPoolTestCase(TestCase):
+    def setUp(self):
+        SharedConnectionPool._instances.clear()
+        self.addCleanup(SharedConnectionPool._instances.clear)
+
+    def test_pool_shared_by_url_and_options(self):
+        """Tests that clients with the same URL and options get the same pool."""
+        pool = SharedConnectionPool.from_url(UNREACHABLE_URL, max_connections=5)
+
+        self.assertIs(SharedConnectionPool.from_url(UNREACHABLE_URL, max_connections=5), pool)
+        self.assertIsNot(SharedConnectionPool.from_url(UNREACHABLE_URL, max_connections=6), pool)
+        self.assertIsNot(SharedConnectionPool.from_url("redis://127.0.0.1:1/1", max_connections=5), pool)
+
+    @override_settings(CACHES={"default": REDIS_CACHE, "other": {**REDIS_CACHE, "KEY_PREFIX": "other"}})
+    def test_cache_aliases_and_clients_share_pool(self):
+        """Tests that every Redis cache alias and get_redis() draw from one pool."""
+        pool = caches["default"]._cache.get_client().connection_pool
+
+        self.assertIsInstance(pool, SharedConnectionPool)
+        self.assertIs(caches["other"]._cache.get_client().connection_pool, pool)
+        self.assertIs(get_redis().connection_pool, pool)
+
+    def test_health_reports_unreachable_pool(self):
+        """Tests that cache and pool round trips are reported with their latency."""
+        get_redis()
+
+        report = health()
+
+        self.assertTrue(report["caches"]["default"]["ok"])
+        self.assertGreaterEqual(report["caches"]["default"]["latency_ms"], 0)
+        self.assertEqual(len(report["pools"]), 1)
+        self.assertFalse(report["pools"][0]["ok"])
+        self.assertEqual(report["pools"][0]["host"], "127.0.0.1:1")
+
+    def test_metrics_view_includes_health(self):
+        """Tests that /metrics/ exposes the cache health report."""
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(set(response.json()["redis"]["caches"]), set(caches.settings))
+
+    @override_settings(INTERNAL_IPS=[])
+    def test_metrics_view_restricted(self):
+        """Tests that /metrics/ is refused to other clients and served to staff."""
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(User.objects.create_user("viewer"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(User.objects.create_user("admin", is_staff=True))
+        self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,127 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import CurriculumVitae, Project, Skill
+from core.services.search import search_cvs
+from core.tests.helpers import create_cv
+
+
+@override_settings(CV_PRETRANSLATE=False)
+class SearchVectorTestCase(TestCase):
+    def setUp(self):
+        self.python = Skill.objects.create(name="Python")
+        self.shop = Project.objects.create(name="Shop", description="An online shop for bicycles")
+
+    def search(self, q: str) -> list[str]:
+        return [cv.first_name for cv in search_cvs(CurriculumVitae.objects.all(), q)]
+
+    def test_matches_every_indexed_field(self):
+        """Tests that names, bio, skill names and project descriptions are all searchable."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_cv("John", bio="Backend engineer", skills=[self.python], projects=[self.shop])
+            create_cv("Jane")
+
+        for q in ("john", "engineers", "python", "bicycle"):
+            with self.subTest(q=q):
+                self.assertEqual(self.search(q), ["John"])
+
+    def test_ranked_by_field_weight(self):
+        """Tests that a match in the name ranks above one in the bio."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_cv("Mentions", bio="Worked with Python daily")
+            create_cv("Python")
+
+        self.assertEqual(self.search("python"), ["Python", "Mentions"])
+
+    def test_websearch_syntax(self):
+        """Tests that quoted phrases and negated terms are supported."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_cv("John", skills=[self.python])
+            create_cv("Jane", bio="Python tester")
+
+        self.assertEqual(self.search("python -tester"), ["John"])
+        self.assertEqual(self.search('"python tester"'), ["Jane"])
+
+    def test_updated_on_skill_rename(self):
+        """Tests that renaming a skill re-indexes the CVs linked to it."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_cv("John", skills=[self.python])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.name = "Haskell"
+            self.python.save()
+
+        self.assertEqual(self.search("python"), [])
+        self.assertEqual(self.search("haskell"), ["John"])
+
+    def test_updated_on_unlink(self):
+        """Tests that removing a project from a CV drops its description from the index."""
+        with self.captureOnCommitCallbacks(execute=True):
+            cv = create_cv("John", projects=[self.shop])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cv.projects.remove(self.shop)
+
+        self.assertEqual(self.search("bicycle"), [])
+
+    def test_updated_on_skill_delete(self):
+        """Tests that deleting a skill re-indexes the CVs that had it once the delete is committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            create_cv("John", skills=[self.python])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.delete()
+
+        self.assertEqual(self.search("python"), [])
+
+
+@override_settings(CV_PRETRANSLATE=False)
+class SearchViewsTestCase(APITestCase):
+    def setUp(self):
+        python = Skill.objects.create(name="Python")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.john = create_cv("John", skills=[python])
+            self.jane = create_cv("Jane", bio="Writes Python scripts now and then")
+            create_cv("Jack", bio="Designer")
+
+    def test_list_page_filtered(self):
+        """Tests that the HTML list shows the ranked matches of ?q."""
+        response = self.client.get(reverse("curriculum_vitae_list"), {"q": "python"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cv.pk for cv in response.context["cvs"]], [self.john.pk, self.jane.pk])
+        self.assertContains(response, 'value="python"')
+
+    def test_api_list_filtered(self):
+        """Tests that the API list returns the ranked matches of ?q."""
+        response = self.client.get(reverse("curriculumvitae-list"), {"q": "python"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cv["id"] for cv in response.data["results"]], [self.john.pk, self.jane.pk])
+
+    def test_api_search_paginated(self):
+        """Tests that the cursor pages through search results in rank order."""
+        url = reverse("curriculumvitae-list")
+        first = self.client.get(url, {"q": "python", "page_size": 1})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual([cv["id"] for cv in first.data["results"]], [self.john.pk])
+        self.assertEqual([cv["id"] for cv in second.data["results"]], [self.jane.pk])
+        self.assertIsNone(second.data["next"])
+
+    def test_bulk_created_cvs_indexed(self):
+        """Tests that CVs created through the bulk endpoint are searchable."""
+        item = {
+            "first_name": "Bulk",
+            "last_name": "Import",
+            "bio": "Imported",
+            "contacts_data": {"type": "email", "contact_link": "bulk@example.com"},
+            "skills_data": [{"name": "Rust"}],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("curriculumvitae-bulk"), [item], format="json")
+
+        response = self.client.get(reverse("curriculumvitae-list"), {"q": "rust"})
+        self.assertEqual([cv["first_name"] for cv in response.data["results"]], ["Bulk"])
@@ -0,0 +1,109 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from base import metrics
+from core.models import Contact, CurriculumVitae, Project, Skill
+from core.services import translation_cache
+from core.services.deepl_translate import translate_text
+from core.tests.fake_deepl import FakeDeepLMixin
+
+
+class TranslationCacheTestCase(FakeDeepLMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["translations"].clear()
+        metrics.reset(translation_cache.HITS_METRIC, translation_cache.MISSES_METRIC)
+
+    def test_repeated_translation_served_from_cache(self):
+        """Tests that the same text and language only call DeepL once."""
+        self.assertEqual(translate_text("Hello", "FR"), ({"translated_text": "FR:Hello"}, 200))
+        self.assertEqual(translate_text("  Hello\r\n", "FR"), ({"translated_text": "FR:Hello"}, 200))
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(translation_cache.stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_languages_cached_separately(self):
+        """Tests that the target language is part of the cache key."""
+        translate_text("Hello", "FR")
+        translate_text("Hello", "DE")
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_failed_translation_not_cached(self):
+        """Tests that errors are not stored in the cache."""
+        self.server.enqueue(456)
+        self.assertEqual(translate_text("Hello", "FR"), ({"error": "DeepL API quota exceeded"}, 429))
+        translate_text("Hello", "FR")
+
+        self.assertEqual(len(self.server.requests), 2)
+
+
+class SegmentTranslationTestCase(FakeDeepLMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["translations"].clear()
+        metrics.reset(translation_cache.HITS_METRIC, translation_cache.MISSES_METRIC)
+
+        self.skill = Skill.objects.create(name="Python")
+        self.project = Project.objects.create(name="Website", description="Portfolio site")
+        self.cv = CurriculumVitae.objects.create(
+            first_name="John",
+            last_name="Doe",
+            bio="Python developer",
+            contacts=Contact.objects.create(type="email", contact_link="test@example.com"),
+        )
+        self.cv.skills.add(self.skill)
+        self.cv.projects.add(self.project)
+        self.url = reverse("translate_curriculum_vita", kwargs={"curriculum_id": self.cv.pk})
+
+    def translate(self, **data):
+        return self.client.post(self.url, {"target_language_code": "br", **data}, content_type="application/json")
+
+    def test_segments_translated_in_one_batch(self):
+        """Tests that bio, skill names and project descriptions are sent as separate texts of one request."""
+        response = self.translate()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "target_language": "FR",
+            "bio": "FR:Python developer",
+            "skills": [{"id": self.skill.pk, "name": "FR:Python"}],
+            "projects": [{"id": self.project.pk, "description": "FR:Portfolio site"}],
+        })
+        request, = self.server.requests
+        self.assertEqual(request["form"]["text"], ["Python developer", "Python", "Portfolio site"])
+
+    def test_only_changed_segments_sent(self):
+        """Tests that cached segments are reused and only new ones reach DeepL."""
+        self.translate()
+        self.cv.bio = "Django developer"
+        self.cv.save()
+
+        response = self.translate()
+
+        self.assertEqual(response.json()["bio"], "FR:Django developer")
+        self.assertEqual(self.server.requests[-1]["form"]["text"], ["Django developer"])
+        self.assertEqual(translation_cache.stats()["hits"], 2)
+
+    def test_fully_cached_cv_skips_deepl(self):
+        """Tests that a repeated translation does not call DeepL at all."""
+        self.translate()
+        self.translate()
+
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_legacy_text_payload(self):
+        """Tests that clients sending a single text still get translated_text back."""
+        response = self.translate(text="Hello")
+
+        self.assertEqual(response.json(), {"translated_text": "FR:Hello"})
+
+    def test_deepl_error_reported(self):
+        """Tests that DeepL failures are returned with their status."""
+        self.server.enqueue(456)
+
+        response = self.translate()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json(), {"error": "DeepL API quota exceeded"})
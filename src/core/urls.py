@@ -8,6 +8,11 @@ urlpatterns = [
         views.CurriculumVitaView.as_view(),
         name="curriculum_vitae_list"
     ),
+    path(
+        "cv/export/",
+        views.CurriculumVitaeExportView.as_view(),
+        name="curriculum_vitae_export"
+    ),
     path(
         "cv/<int:curriculum_id>",
         views.CurriculumVitaDetailedView.as_view(),
@@ -18,6 +23,16 @@ urlpatterns = [
         views.CurriculumVitaPDFView.as_view(),
         name="curriculum_vita_pdf"
     ),
+    path(
+        "cv/pdf-jobs/<int:job_id>/",
+        views.PDFRenderJobStatusView.as_view(),
+        name="pdf_render_job_status"
+    ),
+    path(
+        "cv/pdf-jobs/<int:job_id>/download/",
+        views.PDFRenderJobDownloadView.as_view(),
+        name="pdf_render_job_download"
+    ),
     path(
         "cv/<int:curriculum_id>/",
         views.CurriculumVitaeEmailPdf.as_view(),
@@ -32,5 +47,10 @@ urlpatterns = [
         "settings/",
         views.settings_view,
         name="settings"
+    ),
+    path(
+        "metrics/",
+        views.metrics_view,
+        name="metrics"
     )
 ]
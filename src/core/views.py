@@ -1,76 +1,243 @@
 import json
+from datetime import timedelta
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import render, get_object_or_404, redirect
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, render, get_object_or_404, redirect
+from django.urls import reverse
+from django.utils import timezone
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
-from core.constants import LANG_CODES
-from core.models import CurriculumVitae
-from core.services.deepl_translate import translate_text
-from core.utils import PDFRenderer
-from core.tasks import send_cv_pdf_email
+from base import redis_pool
+from core.constants import CV_PDF_TEMPLATE, LANG_CODES, SEARCH_QUERY_PARAM
+from core.models import CurriculumVitae, PDFRenderJob
+from core.services import fragment_cache, translation_cache
+from core.services.cv_translation import (
+    apply_translation,
+    atranslate_cv,
+    get_stored_translation,
+    resolve_language,
+)
+from core.services.deepl_translate import atranslate_text
+from core.services.export import EXPORT_FORMATS, iter_export
+from core.services.http_cache import (
+    add_cache_headers,
+    cv_validators,
+    list_validators,
+    not_modified,
+    viewer_validators,
+)
+from core.services.pdf_cache import get_pdf_cache
+from core.services.search import search_cvs
+from core.tasks import send_cv_pdf_email, render_cv_pdf
 
 
 class CurriculumVitaView(View):
     def get(self, request):
-        cvs = CurriculumVitae.objects.select_related(
-            "contacts"
-        ).prefetch_related(
-            "skills",
-            "projects"
-        )
+        validators = viewer_validators(request, list_validators())
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+
+        cvs = CurriculumVitae.objects.cards()
+        q = request.GET.get(SEARCH_QUERY_PARAM, "").strip()
+        if q:
+            cvs = search_cvs(cvs, q)
+        cvs = list(cvs)
         context = {
             "cvs": cvs,
+            "cards": fragment_cache.card_fragments(cvs),
+            "q": q,
         }
-        return render(request, "core/curriculum-vitae-list.html", context=context)
+        response = render(request, "core/curriculum-vitae-list.html", context=context)
+        return add_cache_headers(request, response, validators)
 
 
 class CurriculumVitaDetailedView(View):
     def get(self, request, curriculum_id):
-        cv = get_object_or_404(
-            CurriculumVitae.objects.select_related(
-                "contacts"
-            ).prefetch_related(
-                "skills",
-                "projects"
-            ),
-            pk=curriculum_id
-        )
+        validators = viewer_validators(request, cv_validators(curriculum_id, requested_language(request)))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+
+        # Skills, projects and the translation are only loaded if a cached section is missing.
+        cv = get_object_or_404(CurriculumVitae.objects.select_related("contacts"), pk=curriculum_id)
+        sections, language = fragment_cache.detail_fragments(cv, requested_language(request))
 
         context = {
             "cv": cv,
+            "sections": sections,
+            "language": language,
         }
-        return render(request, "core/curriculum-vitae-detail.html", context=context)
+        response = render(request, "core/curriculum-vitae-detail.html", context=context)
+        return add_cache_headers(request, response, validators)
+
+
+def requested_language(request) -> str:
+    lang_code = request.GET.get("lang")
+    return resolve_language(lang_code) if lang_code else ""
+
+
+def apply_requested_translation(cv: CurriculumVitae, request) -> str:
+    """
+    Swaps in the stored translation for ?lang=xx and returns its language.
+
+    Returns "" and leaves the CV untouched when no language is requested or
+    no up-to-date translation is stored yet; DeepL is never called here.
+    """
+    language = requested_language(request)
+    if not language:
+        return ""
+    translation = get_stored_translation(cv, language)
+    if translation is None:
+        return ""
+    apply_translation(cv, translation)
+    return language
+
+
+def pdf_response(pdf_content: bytes, cv: CurriculumVitae) -> HttpResponse:
+    response = HttpResponse(pdf_content, content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="CV_{cv.first_name}_{cv.last_name}.pdf"'
+    return response
 
 
 class CurriculumVitaPDFView(View):
     """Generate and return a PDF version of the CV."""
 
-    def get(self, request, curriculum_id):
-        cv = CurriculumVitae.objects.select_related(
-            "contacts"
-        ).prefetch_related(
-            "skills",
-            "projects"
-        ).get(pk=curriculum_id)
+    template_name = CV_PDF_TEMPLATE
+
+    async def get(self, request, curriculum_id):
+        validators, response = await sync_to_async(self.check_version)(request, curriculum_id)
+        if response is not None:
+            return response
+
+        cv, language = await sync_to_async(self.load_cv)(request, curriculum_id)
 
-        pdf_renderer = PDFRenderer("core/curriculum-vitae-detail.html", {"cv": cv})
-        pdf_content = pdf_renderer.render()
+        if settings.PDF_RENDER_MODE == "async":
+            response = await sync_to_async(self.get_or_enqueue)(cv, language)
+        else:
+            pdf_content = await get_pdf_cache().aget_or_render(cv, self.template_name, language)
+            if not pdf_content:
+                return HttpResponse("PDF generation failed", status=500)
+            response = pdf_response(pdf_content, cv)
 
+        if response.status_code == 200:
+            await sync_to_async(add_cache_headers)(request, response, validators)
+        return response
+
+    @staticmethod
+    def check_version(request, curriculum_id):
+        """
+        Looks up the CV version and answers 304 if the client's PDF is still current.
+        """
+        validators = viewer_validators(request, cv_validators(curriculum_id, requested_language(request)))
+        return validators, not_modified(request, validators)
+
+    def load_cv(self, request, curriculum_id):
+        """
+        Loads everything the template needs, so the render itself runs no queries.
+        """
+        cv = get_object_or_404(CurriculumVitae.objects.full(), pk=curriculum_id)
+        return cv, apply_requested_translation(cv, request)
+
+    def get_or_enqueue(self, cv, language=""):
+        """
+        Serves a cached PDF, otherwise queues a single render job for this CV version.
+        """
+        pdf_cache = get_pdf_cache()
+        cache_key = pdf_cache.key_for(cv, self.template_name, language)
+        pdf_content = pdf_cache.get(cache_key)
         if pdf_content:
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = f'attachment; filename="CV_{cv.first_name}_{cv.last_name}.pdf"'
-            return response
+            return pdf_response(pdf_content, cv)
 
-        return HttpResponse("PDF generation failed", status=500)
+        job, created = PDFRenderJob.objects.get_or_create(
+            cache_key=cache_key,
+            defaults={"curriculum_vitae": cv, "template_path": self.template_name, "language": language}
+        )
+        # A finished job whose PDF was evicted since is requeued by exactly one request. A failed job
+        # is retried only after PDF_RENDER_RETRY_AFTER seconds, so a CV that cannot be rendered is not
+        # rendered again on every request.
+        retry_failed_before = timezone.now() - timedelta(seconds=settings.PDF_RENDER_RETRY_AFTER)
+        requeued = not created and PDFRenderJob.objects.filter(
+            Q(status=PDFRenderJob.Status.READY)
+            | Q(status=PDFRenderJob.Status.FAILED, updated_at__lte=retry_failed_before),
+            pk=job.pk,
+        ).update(status=PDFRenderJob.Status.PENDING, error="", updated_at=timezone.now())
+
+        if created or requeued:
+            render_cv_pdf.delay(job.pk)
+        elif job.status == PDFRenderJob.Status.FAILED:
+            return JsonResponse({"job_id": job.pk, "status": job.status, "error": job.error}, status=500)
+
+        status_url = reverse("pdf_render_job_status", kwargs={"job_id": job.pk})
+        response = JsonResponse(
+            {"job_id": job.pk, "status": PDFRenderJob.Status.PENDING, "status_url": status_url},
+            status=202
+        )
+        response["Location"] = status_url
+        return response
+
+
+class PDFRenderJobStatusView(View):
+    """Report the state of a PDF render job, redirecting to the file once it is ready."""
+
+    def get(self, request, job_id):
+        job = get_object_or_404(PDFRenderJob, pk=job_id)
+
+        if job.status == PDFRenderJob.Status.READY:
+            return redirect("pdf_render_job_download", job_id=job.pk)
+
+        return JsonResponse({"job_id": job.pk, "status": job.status, "error": job.error})
+
+
+class PDFRenderJobDownloadView(View):
+    def get(self, request, job_id):
+        job = get_object_or_404(
+            PDFRenderJob.objects.select_related("curriculum_vitae"),
+            pk=job_id,
+            status=PDFRenderJob.Status.READY
+        )
+        pdf_content = get_pdf_cache().get(job.cache_key)
+
+        if pdf_content is None:
+            return HttpResponse("PDF is no longer available, request it again.", status=404)
+
+        return pdf_response(pdf_content, job.curriculum_vitae)
+
+
+class CurriculumVitaeExportView(View):
+    """Stream every CV as NDJSON (default) or CSV."""
+
+    def get(self, request):
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({"error": f"Unsupported format: {export_format}"}, status=400)
+
+        response = StreamingHttpResponse(iter_export(export_format), content_type=EXPORT_FORMATS[export_format])
+        response["Content-Disposition"] = f'attachment; filename="curriculum_vitae.{export_format}"'
+        return response
 
 
 def settings_view(request):
     return render(request, 'core/settings_page.html')
 
 
+def metrics_view(request):
+    # Cache and Redis internals are only shown to staff and to scrapers on INTERNAL_IPS.
+    if not (request.user.is_staff or request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    return JsonResponse({
+        "pdf_cache": get_pdf_cache().stats(),
+        "translation_cache": translation_cache.stats(),
+        "fragment_cache": fragment_cache.stats(),
+        "redis": redis_pool.health(),
+    })
+
+
 class CurriculumVitaeEmailPdf(View):
     def get(self, request, curriculum_id):
         email = request.GET.get('email')
@@ -86,7 +253,7 @@ class CurriculumVitaeEmailPdf(View):
 
 
 @csrf_exempt
-def translate_curriculum_vita_view(request, curriculum_id):
+async def translate_curriculum_vita_view(request, curriculum_id):
     if request.method != "POST":
         return JsonResponse({"error": "Only POST method allowed"}, status=405)
 
@@ -95,10 +262,15 @@ def translate_curriculum_vita_view(request, curriculum_id):
     except json.JSONDecodeError as e:
         return JsonResponse({"error": f"Invalid JSON: {str(e)}"}, status=400)
 
-    text = data.get("text", "")
     lang_code = data.get("target_language_code", "co")
     target_lang = LANG_CODES.get(lang_code, "EN").upper()
 
-    result, status_code = translate_text(text, target_lang)
+    if "text" in data:
+        # Legacy clients send the whole CV as one pre-assembled text.
+        result, status_code = await atranslate_text(data["text"], target_lang)
+        return JsonResponse(result, status=status_code)
+
+    cv = await aget_object_or_404(CurriculumVitae.objects.full(), pk=curriculum_id)
+    result, status_code = await atranslate_cv(cv, target_lang)
 
     return JsonResponse(result, status=status_code)